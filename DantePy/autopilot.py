@@ -0,0 +1,265 @@
+"""Piloto automático: joga sozinho usando o estado do SnakeEngine.
+
+A cada passo escolhe a direção assim:
+
+1. Se ainda existe um caminho planejado até a comida e a próxima célula
+   dele continua livre, segue o caminho (nada é recalculado).
+2. Senão roda um A* da cabeça até a comida. A heurística é a distância até
+   a comida contando só os obstáculos (um BFS que só é refeito quando a
+   comida ou os obstáculos mudam), e o corpo da cobra entra no A* como
+   parede que some com o tempo: o segmento i deixa a célula livre depois de
+   len - i passos. O caminho só é aceito se, depois de comer, a cabeça ainda
+   alcança a cauda.
+3. Sem caminho seguro (ou com o tabuleiro quase cheio) segue o ciclo
+   hamiltoniano do tabuleiro enquanto o próximo passo dele for seguro; onde
+   os obstáculos cortam o ciclo, vai para o vizinho seguro mais longe da
+   comida (anda atrás da cauda até abrir espaço).
+
+O tempo de cada decisão (ms) fica em `latency`. Rodar sem janela:
+python autopilot.py [RODADAS] [DIFICULDADE]
+"""
+import heapq
+import sys
+import time
+from collections import deque
+
+from engine import SnakeEngine, DIFFICULTIES, DEFAULT_DIFFICULTY, FREE, OBSTACLE
+from obstacles import neighbours
+from timestep import LatencyStats
+
+_INF = 1 << 30
+
+
+def hamiltonian_cycle(grid_w, grid_h):
+    """Ciclo pelas células (índices lineares) em zigue-zague, ou None se os dois lados forem ímpares."""
+    if grid_h % 2 == 0:
+        cycle = []
+        for y in range(grid_h):
+            xs = range(1, grid_w) if y % 2 == 0 else range(grid_w - 1, 0, -1)
+            cycle.extend(y * grid_w + x for x in xs)
+        cycle.extend(y * grid_w for y in range(grid_h - 1, -1, -1))
+        return cycle
+    if grid_w % 2 == 0:
+        # mesmo zigue-zague com os eixos trocados
+        return [(c % grid_h) * grid_w + c // grid_h for c in hamiltonian_cycle(grid_h, grid_w)]
+    return None
+
+
+class Autopilot:
+    def __init__(self, grid_w, grid_h, hamilton_fill=0.6, latency=None):
+        self.grid_w = grid_w
+        self.grid_h = grid_h
+        self.hamilton_fill = hamilton_fill
+        size = grid_w * grid_h
+        self._nbrs = [neighbours(c, grid_w, grid_h) for c in range(size)]
+        cycle = hamiltonian_cycle(grid_w, grid_h)
+        self._cycle_next = None
+        if cycle is not None:
+            self._cycle_next = [0] * size
+            for a, b in zip(cycle, cycle[1:] + cycle[:1]):
+                self._cycle_next[a] = b
+        self._dist = None
+        self._dist_key = None
+        self._path = deque()
+        self._path_food = None
+        self.latency = LatencyStats() if latency is None else latency
+        self.plans = 0
+        self.reuses = 0
+        self.fallbacks = 0
+
+    def reset(self):
+        self._path.clear()
+        self._path_food = None
+
+    def stats(self):
+        return {"decision_ms": self.latency.summary(), "plans": self.plans,
+                "reuses": self.reuses, "fallbacks": self.fallbacks}
+
+    def decide(self, engine):
+        """Direção para o próximo engine.step() (None = manter a atual)."""
+        t = time.perf_counter()
+        cell = self._decide(engine)
+        self.latency.add((time.perf_counter() - t) * 1000)
+        if cell is None:
+            return None
+        w = self.grid_w
+        return self._direction(engine.cobra[0], (cell % w, cell // w))
+
+    def _direction(self, a, b):
+        # vizinhos com wrap: diferença w-1 (ou h-1) é um passo para trás
+        dx = (b[0] - a[0]) % self.grid_w
+        dy = (b[1] - a[1]) % self.grid_h
+        return (dx - self.grid_w if dx > 1 else dx, dy - self.grid_h if dy > 1 else dy)
+
+    # --- decisão ---
+
+    def _decide(self, engine):
+        w = self.grid_w
+        grid = engine.grid
+        comida = engine.comida
+        food = None if comida is None else comida[1] * w + comida[0]
+        # 1. caminho anterior ainda vale: mesma comida e próxima célula livre
+        path = self._path
+        if path and self._path_food == food and grid[path[0]] == FREE:
+            self.reuses += 1
+            return path.popleft()
+        path.clear()
+        if food is None:
+            return None
+
+        cobra = engine.cobra
+        body = [y * w + x for x, y in cobra]
+        near_full = len(body) >= self.hamilton_fill * (len(grid) - len(engine.obstacles))
+        if not near_full:
+            # 2. A* até a comida, aceito só se a cauda continuar alcançável
+            self.plans += 1
+            found = self._astar(engine, body, food)
+            # caminho vazio: a cabeça já está na comida (estado carregado), nada a planejar
+            if found and self._tail_reachable(grid, self._after_path(body, found)):
+                self._path.extend(found[1:])
+                self._path_food = food
+                return found[0]
+        # 3. ciclo hamiltoniano / vizinho seguro mais longe da comida
+        self.fallbacks += 1
+        return self._fallback(engine, body, food)
+
+    def _distances(self, engine, food):
+        """Distância de cada célula até a comida contando só os obstáculos (cacheada)."""
+        # chave pelo conteúdo: id() de uma lista já descartada pode ser reaproveitado
+        key = (food, tuple(engine.obstacles))
+        if key == self._dist_key:
+            return self._dist
+        w = self.grid_w
+        dist = [_INF] * (w * self.grid_h)
+        for x, y in engine.obstacles:
+            dist[y * w + x] = -1
+        dist[food] = 0
+        fila = deque([food])
+        nbrs = self._nbrs
+        while fila:
+            c = fila.popleft()
+            d = dist[c] + 1
+            for n in nbrs[c]:
+                if dist[n] == _INF:
+                    dist[n] = d
+                    fila.append(n)
+        self._dist = dist
+        self._dist_key = key
+        return dist
+
+    def _astar(self, engine, body, food):
+        grid = engine.grid
+        dist = self._distances(engine, food)
+        head = body[0]
+        if dist[head] >= _INF or dist[head] < 0:
+            return None
+        # segmento i da cobra libera a célula depois de len - i passos
+        length = len(body)
+        free_at = {c: length - i for i, c in enumerate(body)}
+        nbrs = self._nbrs
+        came = {head: None}
+        g_of = {head: 0}
+        heap = [(dist[head], 0, head)]
+        while heap:
+            _, g, c = heapq.heappop(heap)
+            if c == food:
+                path = []
+                while c != head:
+                    path.append(c)
+                    c = came[c]
+                path.reverse()
+                return path
+            if g > g_of[c]:
+                continue
+            g2 = g + 1
+            for n in nbrs[c]:
+                if grid[n] != FREE and (dist[n] < 0 or g2 <= free_at.get(n, _INF)):
+                    continue
+                if g2 < g_of.get(n, _INF):
+                    g_of[n] = g2
+                    came[n] = c
+                    heapq.heappush(heap, (g2 + dist[n], g2, n))
+        return None
+
+    @staticmethod
+    def _after_path(body, path):
+        """Corpo depois de seguir path (que termina comendo: cresce 1)."""
+        return (path[::-1] + body)[:len(body) + 1]
+
+    def _tail_reachable(self, grid, body):
+        """A cabeça alcança a cauda com o corpo parado (checagem conservadora)?
+
+        `body` é o corpo previsto; o que era cobra em grid e não está nele já
+        foi liberado.
+        """
+        head, tail = body[0], body[-1]
+        seen = set(body)
+        nbrs = self._nbrs
+        fila = deque([head])
+        while fila:
+            for n in nbrs[fila.popleft()]:
+                if n == tail:
+                    return True
+                if n in seen or grid[n] == OBSTACLE:
+                    continue
+                seen.add(n)
+                fila.append(n)
+        return False
+
+    def _fallback(self, engine, body, food):
+        grid = engine.grid
+        length = len(body)
+        # vizinhos livres no próximo passo cuja cauda continua alcançável depois do passo
+        safe = []
+        for n in self._nbrs[body[0]]:
+            if grid[n] != FREE:
+                continue
+            moved = [n] + body[:length - 1]
+            if self._tail_reachable(grid, moved):
+                safe.append(n)
+        if self._cycle_next is not None:
+            nxt = self._cycle_next[body[0]]
+            if nxt in safe:
+                return nxt
+        if safe:
+            dist = self._distances(engine, food)
+            return max(safe, key=lambda n: dist[n])
+        # nenhum passo seguro: o que sobrar de livre (ou mantém a direção)
+        livres = [n for n in self._nbrs[body[0]] if grid[n] == FREE]
+        return livres[0] if livres else None
+
+
+def run(rounds=1, difficulty=DEFAULT_DIFFICULTY, seed=None, max_ticks=None):
+    """Partidas sem janela na velocidade máxima; retorna [(score, ticks, evento)] e o piloto."""
+    nome, gw, gh, start_delay = difficulty
+    pilot = Autopilot(gw, gh)
+    results = []
+    for r in range(rounds):
+        engine = SnakeEngine(gw, gh, start_delay, seed=None if seed is None else seed + r)
+        pilot.reset()
+        evento = None
+        while engine.alive and (max_ticks is None or engine.ticks < max_ticks):
+            evento = engine.step(pilot.decide(engine))
+        results.append((engine.score, engine.ticks, evento))
+    return results, pilot
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    rounds = int(argv[0]) if argv else 3
+    difficulty = next((d for d in DIFFICULTIES if len(argv) > 1 and d[0] == argv[1]), DIFFICULTIES[-1])
+    t = time.perf_counter()
+    results, pilot = run(rounds, difficulty)
+    elapsed = time.perf_counter() - t
+    for score, ticks, evento in results:
+        print(f"score {score:5d}  ticks {ticks:7d}  fim: {evento}")
+    s = pilot.stats()
+    lat = s["decision_ms"]
+    print(f"{difficulty[0]} {difficulty[1]}x{difficulty[2]}: {elapsed:.1f} s, "
+          f"decisão p50 {lat['p50']:.3f} ms, p99 {lat['p99']:.3f} ms, max {lat['max']:.3f} ms")
+    print(f"planos {s['plans']}  reaproveitados {s['reuses']}  fallback {s['fallbacks']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
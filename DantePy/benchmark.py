@@ -0,0 +1,387 @@
+"""Benchmarks do jogo (rodar: python benchmark.py).
+
+Roda sem janela nem som (drivers dummy do SDL). Cada medida vira uma
+entrada {"value", "unit", "better"} no resultado; com --json os resultados
+vão para um arquivo e com --baseline são comparados com um resultado salvo
+antes (regressão = piorou mais que --threshold, e o processo sai com 1).
+
+    python benchmark.py --json base.json
+    python benchmark.py --baseline base.json --threshold 0.15
+    python benchmark.py --only engine,food --quick
+"""
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from engine import SnakeEngine, DIFFICULTIES, RIGHT
+
+
+def boustrophedon_cycle(grid_w, grid_h):
+    """Ciclo hamiltoniano simples (grid_h par): zigue-zague nas colunas 1.. e volta pela coluna 0."""
+    cycle = []
+    for y in range(grid_h):
+        xs = range(1, grid_w) if y % 2 == 0 else range(grid_w - 1, 0, -1)
+        cycle.extend((x, y) for x in xs)
+    cycle.extend((0, y) for y in range(grid_h - 1, -1, -1))
+    return cycle
+
+
+def cycle_directions(cycle):
+    return [(b[0] - a[0], b[1] - a[1]) for a, b in zip(cycle, cycle[1:] + cycle[:1])]
+
+
+def _per_call(fn, n, repeat=3):
+    """Melhor de `repeat` rodadas de n chamadas; segundos por chamada."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(n):
+            fn()
+        best = min(best, time.perf_counter() - t0)
+    return best / n
+
+
+def bench_tick_by_length(grid_w=50, grid_h=36, lengths=None, ticks=20000):
+    """Custo por passo do SnakeEngine para cobras de vários tamanhos.
+
+    A cobra anda sobre um ciclo hamiltoniano sem comida, então o tamanho fica
+    fixo durante a medição. Retorna lista de (tamanho, ns por passo).
+    """
+    cycle = boustrophedon_cycle(grid_w, grid_h)
+    dirs = cycle_directions(cycle)
+    n = len(cycle)
+    if lengths is None:
+        # n - 1 é o tabuleiro cheio: com n a cabeça bateria na própria cauda
+        lengths = [3, 10, 100, 500, 1000, n - 1]
+    engine = SnakeEngine(grid_w, grid_h)
+    results = []
+    for length in lengths:
+        cobra = [cycle[i] for i in range(length - 1, -1, -1)]
+        engine.load(cobra, dirs[length - 1], None)
+        actions = [dirs[(length - 1 + i) % n] for i in range(ticks)]
+        step = engine.step
+        t0 = time.perf_counter()
+        for action in actions:
+            step(action)
+        elapsed = time.perf_counter() - t0
+        if not engine.alive:
+            raise RuntimeError(f"cobra morreu no benchmark (tamanho {length})")
+        results.append((length, elapsed / ticks * 1e9))
+    return results
+
+
+# --- grupos do suite: cada um devolve {nome: (valor, unidade, melhor)} ---
+
+def bench_engine(gw, gh, scale):
+    out = {}
+    for length, ns in bench_tick_by_length(gw, gh, ticks=int(20000 * scale)):
+        out[f"engine.steps_per_s.len{length}"] = (1e9 / ns, "steps/s", "higher")
+    return out
+
+
+def bench_food(gw, gh, scale):
+    """Sorteio da comida (FreeCells.sample) com o tabuleiro em vários níveis de ocupação."""
+    cycle = boustrophedon_cycle(gw, gh)
+    n = len(cycle)
+    engine = SnakeEngine(gw, gh)
+    rng = random.Random(1)
+    out = {}
+    for pct in (10, 50, 90, 99):
+        length = max(3, n * pct // 100)
+        engine.load([cycle[i] for i in range(length - 1, -1, -1)], RIGHT, None)
+        sample = engine.free.sample
+        s = _per_call(lambda: sample(rng), int(20000 * scale))
+        out[f"food.spawn.occ{pct}"] = (s * 1e9, "ns", "lower")
+    return out
+
+
+def bench_obstacles(gw, gh, scale):
+    """generate_obstacles() do zero e LayoutCache.get() (o que o level-up usa) por level."""
+    from obstacles import generate_obstacles, LayoutCache
+    cache = LayoutCache()
+    cache.prewarm(gw, gh)
+    engine = SnakeEngine(gw, gh)
+    avoid = list(engine.cobra)
+    out = {}
+    reps = max(3, int(20 * scale))
+    for level in (1, 3, 5, 10, 15):
+        rng = random.Random(level)
+        s = _per_call(lambda: generate_obstacles(rng, gw, gh, level, avoid), reps)
+        out[f"obstacles.generate.level{level}"] = (s * 1e6, "us", "lower")
+        s = _per_call(lambda: cache.get(rng, gw, gh, level, avoid, engine.grid), reps * 10)
+        out[f"obstacles.cached.level{level}"] = (s * 1e6, "us", "lower")
+    return out
+
+
+def _runtime(gw, gh):
+    import snake
+    snake.init_runtime(headless=True)
+    snake.apply_difficulty(("bench", gw, gh, 140))
+    return snake
+
+
+def bench_scenes(gw, gh, scale):
+    snake = _runtime(gw, gh)
+    out = {}
+    frames = int(300 * scale) or 1
+    for i, scene in enumerate(snake.SCENES):
+        t = [0.0]
+
+        def frame():
+            t[0] += 1 / 60
+            snake.draw_scene(scene, t[0])
+        out[f"render.scene{i}.{scene.name}"] = (_per_call(frame, frames) * 1e6, "us", "lower")
+        out[f"render.deco{i}.{scene.name}"] = (
+            _per_call(lambda: snake.draw_scene_deco(scene, t[0]), frames) * 1e6, "us", "lower")
+    # decoração densa: 500 estrelas numa camada só
+    from scenes import DecoLayer, Scene
+    dense = Scene("dense", (0, 0, 0), [DecoLayer(500, "circle", 1, ((200, 220, 255), (150, 180, 220)),
+                                                 color_every=7, x_step=47, speed=30, y_step=71, amp=20,
+                                                 freq=0.3, phase_step=0.3, trunc=True)])
+    t = [0.0]
+
+    def dense_frame():
+        t[0] += 1 / 60
+        snake.draw_scene_deco(dense, t[0])
+    out["render.deco.dense500"] = (_per_call(dense_frame, frames) * 1e6, "us", "lower")
+    return out
+
+
+def bench_particles(gw, gh, scale):
+    """emit() de uma explosão e frame (update + draw) com várias explosões vivas."""
+    snake = _runtime(gw, gh)
+    particles = snake.make_particles()
+    tela = snake.tela
+    out = {}
+    frames = int(60 * scale) or 1
+    # o atlas de cada cor é montado no primeiro emit; fica fora da medida
+    particles.emit((0, 0), snake.AMARELO, 18)
+    particles.draw(tela)
+    for bursts in (1, 10, 50):
+        def frame():
+            particles.update(16)
+            particles.draw(tela)
+        total = 0.0
+        emit_total = 0.0
+        for _ in range(3):
+            particles.clear()
+            t0 = time.perf_counter()
+            for b in range(bursts):
+                particles.emit((b * 13 % snake.LARGURA, b * 7 % snake.ALTURA), snake.AMARELO, 18)
+            emit_total += time.perf_counter() - t0
+            # só os primeiros frames: todas as partículas ainda estão vivas
+            total += _per_call(frame, min(frames, 10), repeat=1)
+        out[f"particles.emit.bursts{bursts}"] = (emit_total / 3 / bursts * 1e6, "us", "lower")
+        out[f"particles.frame.bursts{bursts}"] = (total / 3 * 1e6, "us", "lower")
+    particles.clear()
+    return out
+
+
+def bench_menu(gw, gh, scale):
+    snake = _runtime(gw, gh)
+    options = ["Iniciar", "Autopilot", "Recorde", "Dificuldade", "Sair"]
+    t = [0.0]
+
+    def frame():
+        t[0] += 1 / 60
+        snake.draw_menu_principal(options, 0, t[0])
+    return {"render.menu_principal": (_per_call(frame, int(300 * scale) or 1) * 1e6, "us", "lower")}
+
+
+def bench_snake_render(gw, gh, scale):
+    snake = _runtime(gw, gh)
+    cycle = boustrophedon_cycle(gw, gh)
+    n = len(cycle)
+    out = {}
+    for length in (3, 100, 500, n - 1):
+        cobra = [cycle[i] for i in range(length - 1, -1, -1)]
+        hx, hy = cobra[0][0] * snake.PIXEL, cobra[0][1] * snake.PIXEL
+        s = _per_call(lambda: snake.draw_snake(cobra, hx, hy, RIGHT), int(200 * scale) or 1)
+        out[f"render.snake.len{length}"] = (s * 1e6, "us", "lower")
+    # incremental (o que o jogo usa): um passo da cobra pelo ciclo por chamada
+    comp = snake.Compositor(snake.tela)
+    comp.begin_frame()
+    for length in (3, 100, 500, n - 1):
+        pos = [0]
+
+        def step():
+            pos[0] += 1
+            k = pos[0]
+            cobra = [cycle[(k + i) % n] for i in range(length - 1, -1, -1)]
+            snake.draw_snake_body(cobra, k, comp)
+        step()
+        s = _per_call(step, int(100 * scale) or 1)
+        out[f"render.snake_step.len{length}"] = (s * 1e6, "us", "lower")
+    return out
+
+
+def bench_world(gw, gh, scale):
+    """Mundo gigante: passo e render da câmera com cobras enormes (não depende da dificuldade)."""
+    from world import WorldEngine, WORLD_PRESET, Camera
+    _, ww, wh, _ = WORLD_PRESET
+    engine = WorldEngine(ww, wh, density=0, seed=1)
+    row = 800
+    out = {}
+    for length in (3, 10000, 50000):
+        # zigue-zague de linhas com `row` células, cabeça na linha de cima indo para cima
+        rows = -(-length // row)
+        path = []
+        for r in range(rows):
+            y = 100 + rows - 1 - r
+            xs = range(100, 100 + row) if r % 2 == 0 else range(100 + row - 1, 99, -1)
+            path.extend((x, y) for x in xs)
+        cobra = path[::-1][:length]
+        steps = max(1, min(800, int(800 * scale)))
+        best = None
+        for _ in range(3):
+            engine.load(cobra, (0, -1), None, ticks=length)
+            t = time.perf_counter()
+            for _ in range(steps):
+                engine.step()
+            dt = (time.perf_counter() - t) / steps
+            best = dt if best is None else min(best, dt)
+        out[f"world.step.len{length}"] = (best * 1e9, "ns", "lower")
+        out[f"world.memory.len{length}"] = (engine.grid.memory() / 1024, "KB", "lower")
+    # câmera no meio do corpo (tela toda de cobra) com a maior cobra
+    snake = _runtime(gw, gh)
+    from worldview import WorldView
+    view = WorldView(snake.PIXEL, snake.VERMELHO, snake.VERDE, snake.VERDE_ESC, (12, 18, 30))
+    engine.load(cobra, (0, -1), None, ticks=length)
+    camera = Camera(ww, wh, 40, 28)
+    camera.x, camera.y = 300, 110
+    n = int(100 * scale) or 1
+    out["render.world.view"] = (_per_call(lambda: view.view(engine, camera), n) * 1e6, "us", "lower")
+
+    def rebuild():
+        view._frame_key = None
+        view.frame(engine, camera, (800, 560))
+    out["render.world.frame"] = (_per_call(rebuild, n) * 1e6, "us", "lower")
+    return out
+
+
+def bench_lowres(gw, gh, scale):
+    """Playfield inteiro (fundo, meio tabuleiro de cobra, fade) nativo e na superfície lógica, e o upscale."""
+    snake = _runtime(gw, gh)
+    from lowres import LowResScreen
+    from snakerender import SnakeRenderer
+    cycle = boustrophedon_cycle(gw, gh)
+    cobra = cycle[:len(cycle) // 2][::-1]
+    screen = LowResScreen(gw, gh, snake.LOWRES_CELL)
+    screen.layout()
+    n = int(100 * scale) or 1
+    out = {}
+    for name, surf, cell in (("native", snake.tela, snake.PIXEL), ("lowres", screen.surface, screen.cell)):
+        renderer = SnakeRenderer(cell, snake.VERMELHO, snake.VERDE, snake.VERDE_ESC)
+        fade = snake.pygame.Surface(surf.get_size())
+        fade.set_alpha(128)
+
+        def frame():
+            surf.fill((12, 18, 30))
+            renderer.draw_body(surf, cobra, 0)
+            surf.blit(fade, (0, 0))
+        out[f"render.playfield.{name}"] = (_per_call(frame, n) * 1e6, "us", "lower")
+    out["render.lowres.upscale"] = (_per_call(screen.upscale, n) * 1e6, "us", "lower")
+    return out
+
+
+GROUPS = {
+    "engine": bench_engine,
+    "food": bench_food,
+    "obstacles": bench_obstacles,
+    "scenes": bench_scenes,
+    "particles": bench_particles,
+    "menu": bench_menu,
+    "snake": bench_snake_render,
+    "world": bench_world,
+    "lowres": bench_lowres,
+}
+
+
+def run_suite(groups=None, difficulty=None, scale=1.0):
+    nome, gw, gh, _ = difficulty or DIFFICULTIES[-1]
+    results = {}
+    for name in groups or GROUPS:
+        for key, (value, unit, better) in GROUPS[name](gw, gh, scale).items():
+            results[key] = {"value": value, "unit": unit, "better": better}
+    meta = {
+        "difficulty": nome, "grid": [gw, gh], "scale": scale,
+        "python": platform.python_version(), "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    if "pygame" in sys.modules:
+        meta["pygame"] = sys.modules["pygame"].version.ver
+    return {"meta": meta, "results": results}
+
+
+def compare(current, baseline, threshold=0.10):
+    """Lista (nome, base, atual, variação) e quais pioraram mais que threshold."""
+    rows = []
+    regressions = []
+    base = baseline["results"]
+    for key, cur in current["results"].items():
+        old = base.get(key)
+        if old is None or not old["value"]:
+            continue
+        change = cur["value"] / old["value"] - 1.0
+        # variação positiva = melhorou, nos dois sentidos
+        gain = change if cur["better"] == "higher" else -change
+        rows.append((key, old["value"], cur["value"], gain))
+        if gain < -threshold:
+            regressions.append(key)
+    return rows, regressions
+
+
+def _fmt(value, unit):
+    return f"{value:,.0f} {unit}" if value >= 100 else f"{value:.2f} {unit}"
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmarks do Snake's Eat (sem janela)")
+    parser.add_argument("--json", help="salva os resultados neste arquivo")
+    parser.add_argument("--baseline", help="compara com resultados salvos antes")
+    parser.add_argument("--threshold", type=float, default=0.10, help="piora tolerada (0.10 = 10%%)")
+    parser.add_argument("--only", help="grupos separados por vírgula: " + ",".join(GROUPS))
+    parser.add_argument("--difficulty", choices=[d[0] for d in DIFFICULTIES],
+                        help="nome da dificuldade (padrão: a maior)")
+    parser.add_argument("--quick", action="store_true", help="menos repetições (mais ruído)")
+    args = parser.parse_args(argv)
+
+    groups = args.only.split(",") if args.only else None
+    for g in groups or ():
+        if g not in GROUPS:
+            parser.error(f"grupo desconhecido: {g}")
+    difficulty = next((d for d in DIFFICULTIES if d[0] == args.difficulty), None)
+    data = run_suite(groups, difficulty, 0.2 if args.quick else 1.0)
+    meta = data["meta"]
+    print(f"{meta['difficulty']} {meta['grid'][0]}x{meta['grid'][1]}, python {meta['python']}")
+    for key, r in data["results"].items():
+        print(f"  {key:34s} {_fmt(r['value'], r['unit']):>18s}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        print(f"resultados em {args.json}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows, regressions = compare(data, baseline, args.threshold)
+        print(f"comparado com {args.baseline} (limite {args.threshold:.0%}):")
+        for key, old, new, gain in rows:
+            mark = "  REGRESSÃO" if key in regressions else ""
+            print(f"  {key:34s} {gain:+7.1%}{mark}")
+        if regressions:
+            print(f"{len(regressions)} regressão(ões)")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
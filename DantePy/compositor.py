@@ -0,0 +1,141 @@
+"""Compositor em camadas com atualização de tela por retângulos sujos.
+
+As camadas estáticas (fundo da cena, obstáculos) são desenhadas uma vez em
+superfícies próprias e juntadas na `base`. A cada frame só as áreas sujas do
+frame anterior são restauradas a partir da base; entidades, partículas e HUD
+desenhados por cima marcam seus retângulos com mark(), e end_frame() manda
+para o display apenas esses retângulos.
+
+Coisas que quase não mudam de um frame para o outro (o corpo da cobra) podem
+ser desenhadas direto na base com draw_on_base()/erase_on_base(): ficam na
+tela sem redesenhar a cada frame. Quando a base é remontada `base_version`
+muda e quem desenhou nela precisa desenhar tudo de novo.
+
+Com display=False o compositor trabalha numa superfície qualquer (ex.: o
+playfield lógico do LowResScreen) e end_frame() não mexe no display: quem
+apresenta o frame é o dono da superfície.
+"""
+import pygame
+
+from profiler import count_surface
+
+
+class Compositor:
+    def __init__(self, screen, layers=("background", "obstacles"), display=True):
+        self.screen = screen
+        self.display = display
+        self.size = screen.get_size()
+        self.order = list(layers)
+        self._layers = {}
+        self._keys = {}
+        self.base = pygame.Surface(self.size).convert()
+        count_surface()
+        self._base_dirty = True
+        self.base_version = 0
+        self._prev = []
+        self._cur = []
+        self._full = True
+        self._overlay = False
+        self.frames = 0
+        self.full_frames = 0
+        self.pixels_updated = 0
+
+    def set_layer(self, name, key, builder):
+        """Reconstrói a camada `name` com builder(surface) só quando `key` muda."""
+        if self._keys.get(name, object()) == key and name in self._layers:
+            return
+        surf = self._layers.get(name)
+        if surf is None:
+            if name == self.order[0]:
+                surf = pygame.Surface(self.size).convert()
+            else:
+                surf = pygame.Surface(self.size, pygame.SRCALPHA).convert_alpha()
+            count_surface()
+            self._layers[name] = surf
+        if name != self.order[0]:
+            surf.fill((0, 0, 0, 0))
+        builder(surf)
+        self._keys[name] = key
+        self._base_dirty = True
+
+    def begin_frame(self):
+        if self._base_dirty:
+            for name in self.order:
+                if name in self._layers:
+                    self.base.blit(self._layers[name], (0, 0))
+            self._base_dirty = False
+            self.base_version += 1
+            self._full = True
+        if self._full:
+            self.screen.blit(self.base, (0, 0))
+        else:
+            for r in self._prev:
+                self.screen.blit(self.base, r, r)
+
+    def draw_on_base(self, surf, pos):
+        """Desenha na base e na tela (depois de begin_frame); fica até ser apagado."""
+        self.base.blit(surf, pos)
+        return self.mark(self.screen.blit(surf, pos))
+
+    def erase_on_base(self, rect):
+        """Volta a área da base para as camadas (tira o que draw_on_base pôs ali)."""
+        rect = pygame.Rect(rect)
+        for name in self.order:
+            if name in self._layers:
+                self.base.blit(self._layers[name], rect, rect)
+        return self.mark(self.screen.blit(self.base, rect, rect))
+
+    def restore_over(self, rects, background):
+        """Põe de volta por cima de `rects` o que a base tem fora da cor de fundo.
+
+        Para o que é desenhado depois da base mas deve ficar por baixo dela
+        (decoração da cena): cobra e obstáculos voltam para cima.
+        """
+        base = self.base
+        base.set_colorkey(background)
+        screen = self.screen
+        for r in rects:
+            screen.blit(base, r, r)
+        base.set_colorkey(None)
+
+    def mark(self, rect):
+        if rect:
+            self._cur.append(pygame.Rect(rect))
+        return rect
+
+    def mark_all(self, rects):
+        for r in rects:
+            self.mark(r)
+
+    def mark_full(self):
+        """Algo cobriu a tela toda (ex.: fade): atualiza tudo e restaura tudo no próximo frame."""
+        self._overlay = True
+
+    def invalidate(self):
+        """Força o próximo frame a redesenhar a tela inteira (ex.: após set_mode)."""
+        self._full = True
+
+    def end_frame(self):
+        self.frames += 1
+        if self._full or self._overlay:
+            if self.display:
+                pygame.display.update()
+            self.full_frames += 1
+            self.pixels_updated += self.size[0] * self.size[1]
+        else:
+            rects = self._prev + self._cur
+            if self.display:
+                pygame.display.update(rects)
+            self.pixels_updated += sum(r.w * r.h for r in rects)
+        self._prev = self._cur
+        self._cur = []
+        self._full = self._overlay
+        self._overlay = False
+
+    def stats(self):
+        frames = max(1, self.frames)
+        return {
+            "frames": self.frames,
+            "full_frames": self.full_frames,
+            "avg_pixels_per_frame": self.pixels_updated / frames,
+        }
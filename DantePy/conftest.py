@@ -0,0 +1,16 @@
+"""Fixtures comuns dos testes (rodar: python -m pytest)."""
+import os
+
+import pytest
+
+
+@pytest.fixture
+def display():
+    """pygame com o driver de vídeo dummy e uma janela pequena; pula o teste sem pygame."""
+    pygame = pytest.importorskip("pygame")
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((64, 64))
+    yield screen
+    pygame.display.quit()
@@ -0,0 +1,415 @@
+"""Motor do jogo sem pygame: as regras de jogo() isoladas do loop de render.
+
+Tudo aqui trabalha em células do grid (não em pixels). O render em snake.py
+multiplica por PIXEL na hora de desenhar.
+"""
+import random
+from collections import deque
+
+# numpy só é importado quando um BatchEngine é criado: o BatchEngine é
+# opcional e importar numpy custa ~100 ms no import do jogo
+np = None
+
+from obstacles import LAYOUTS
+
+# Direções em células (mesma ordem das teclas em jogo(): w, s, a, d)
+UP = (0, -1)
+DOWN = (0, 1)
+LEFT = (-1, 0)
+RIGHT = (1, 0)
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+
+# Presets de dificuldade: (nome, grid_w, grid_h, move_delay_start)
+DIFFICULTIES = [
+    ("Bebe Chorao", 30, 20, 180),
+    ("Normal", 40, 28, 140),
+    ("Tomei no Butico", 50, 36, 90)
+]
+DEFAULT_DIFFICULTY = DIFFICULTIES[1]
+
+# valores do grid de ocupação
+FREE = 0
+SNAKE = 1
+OBSTACLE = 2
+
+MIN_MOVE_DELAY = 60
+POINTS_PER_LEVEL = 5
+
+
+def clamp_dir(new, old):
+    # impede reversão instantânea
+    if (new[0] == -old[0] and new[1] == -old[1]):
+        return old
+    return new
+
+
+def next_move_delay(move_delay):
+    return max(MIN_MOVE_DELAY, move_delay - 10)
+
+
+class FreeCells:
+    """Índice das células livres com sorteio uniforme e add/remove em O(1).
+
+    `cells` guarda as células livres em qualquer ordem e `pos[c]` diz onde a
+    célula c está nele (-1 se ocupada); remover troca com a última posição.
+    """
+
+    def __init__(self, size, occupied=()):
+        self.cells = list(range(size))
+        self.pos = list(range(size))
+        for c in occupied:
+            if self.pos[c] >= 0:
+                self.remove(c)
+
+    @classmethod
+    def from_cells(cls, size, cells):
+        """FreeCells com exatamente estas células livres, nesta ordem (estado salvo)."""
+        free = cls.__new__(cls)
+        free.cells = list(cells)
+        free.pos = [-1] * size
+        for i, c in enumerate(free.cells):
+            free.pos[c] = i
+        return free
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, c):
+        return self.pos[c] >= 0
+
+    def add(self, c):
+        self.pos[c] = len(self.cells)
+        self.cells.append(c)
+
+    def remove(self, c):
+        cells = self.cells
+        i = self.pos[c]
+        last = cells.pop()
+        if last != c:
+            cells[i] = last
+            self.pos[last] = i
+        self.pos[c] = -1
+
+    def sample(self, rng):
+        """Célula livre uniforme, ou None se o tabuleiro está cheio."""
+        if not self.cells:
+            return None
+        return self.cells[rng.randrange(len(self.cells))]
+
+
+class SnakeEngine:
+    """Uma partida, passo a passo: reset(seed) e step(action).
+
+    step() devolve o evento do passo: "move", "eat", "level" (comeu e subiu
+    de nível), "dead" ou "full" (comeu e não sobrou célula livre para a
+    próxima comida; a partida acaba).
+
+    O corpo é um deque (cabeça em cobra[0]) e `grid` é um bytearray
+    grid_w*grid_h com FREE/SNAKE/OBSTACLE, então mover, tirar a cauda e
+    testar colisão custam O(1) qualquer que seja o tamanho da cobra.
+    `free` (FreeCells) acompanha as células livres para sortear a comida em
+    O(1) mesmo com o tabuleiro quase cheio. Os obstáculos de cada nível vêm
+    de um LayoutCache (pré-validado, nunca isola parte do tabuleiro).
+    """
+
+    def __init__(self, grid_w=40, grid_h=28, start_delay=140, seed=None, layouts=None):
+        self.grid_w = grid_w
+        self.grid_h = grid_h
+        self.start_delay = start_delay
+        self.rng = random.Random()
+        self.layouts = LAYOUTS if layouts is None else layouts
+        self.layouts.prewarm(grid_w, grid_h)
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        # a semente sempre fica conhecida (replays precisam dela)
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(63)
+        self.seed = seed
+        self.rng.seed(seed)
+        comida = (self.rng.randrange(0, self.grid_w), self.rng.randrange(0, self.grid_h))
+        self.load([(5, 5), (4, 5), (3, 5)], RIGHT, comida)
+        if self.cell(*comida) != FREE:
+            # sorteio caiu em cima da cobra: a comida inicial vai para uma célula livre
+            c = self.free.sample(self.rng)
+            self.comida = (c % self.grid_w, c // self.grid_w)
+        self._regenerate_obstacles()
+        return self
+
+    def load(self, cobra, direcao, comida, obstacles=(), score=0, level=1, move_delay=None, ticks=0,
+             free=None):
+        """Coloca o motor num estado arbitrário (cabeça em cobra[0]); comida pode ser None.
+
+        free: ordem da lista de células livres. O sorteio da comida depende
+        dela, então quem restaura uma partida em andamento (keyframe de
+        replay) precisa passar a ordem salva; sem ela a lista sai em ordem de
+        índice.
+        """
+        self.cobra = deque(cobra)
+        self.direcao = direcao
+        self.comida = comida
+        self.obstacles = list(obstacles)
+        self.score = score
+        self.level = level
+        self.move_delay = self.start_delay if move_delay is None else move_delay
+        self.ticks = ticks
+        self.alive = True
+        w = self.grid_w
+        self.grid = bytearray(w * self.grid_h)
+        for x, y in self.obstacles:
+            self.grid[y * w + x] = OBSTACLE
+        for x, y in self.cobra:
+            self.grid[y * w + x] = SNAKE
+        if free is not None:
+            self.free = FreeCells.from_cells(len(self.grid), free)
+        else:
+            self.free = FreeCells(len(self.grid), (i for i, v in enumerate(self.grid) if v != FREE))
+        return self
+
+    def cell(self, x, y):
+        """FREE/SNAKE/OBSTACLE na célula (x, y)."""
+        return self.grid[y * self.grid_w + x]
+
+    def _regenerate_obstacles(self):
+        grid = self.grid
+        free = self.free
+        w, h = self.grid_w, self.grid_h
+        for x, y in self.obstacles:
+            grid[y * w + x] = FREE
+            free.add(y * w + x)
+        # nada em cima da comida nem colado na cabeça; a cobra fica de fora via grid
+        hx, hy = self.cobra[0]
+        avoid = [((hx + dx) % w, (hy + dy) % h) for dx, dy in DIRECTIONS]
+        if self.comida is not None:
+            avoid.append(self.comida)
+        obstacles = self.layouts.get(self.rng, w, h, self.level, avoid, occupied=grid)
+        self.obstacles = obstacles
+        for x, y in obstacles:
+            grid[y * w + x] = OBSTACLE
+            free.remove(y * w + x)
+
+    def step(self, action=None):
+        if not self.alive:
+            return "dead"
+        if action is not None:
+            self.direcao = clamp_dir(action, self.direcao)
+        self.ticks += 1
+
+        cobra = self.cobra
+        grid = self.grid
+        w = self.grid_w
+        # Wrapping nas bordas (não dá game over ao bater na lateral)
+        hx, hy = cobra[0]
+        nova_cabeca = ((hx + self.direcao[0]) % w, (hy + self.direcao[1]) % self.grid_h)
+
+        # Colisão com o próprio corpo (cauda inclusa) ou com obstáculos -> fim de jogo
+        if grid[nova_cabeca[1] * w + nova_cabeca[0]] != FREE:
+            self.alive = False
+            return "dead"
+
+        cobra.appendleft(nova_cabeca)
+        grid[nova_cabeca[1] * w + nova_cabeca[0]] = SNAKE
+        self.free.remove(nova_cabeca[1] * w + nova_cabeca[0])
+        if nova_cabeca != self.comida:
+            tx, ty = cobra.pop()
+            grid[ty * w + tx] = FREE
+            self.free.add(ty * w + tx)
+            return "move"
+
+        self.score += 1
+        c = self.free.sample(self.rng)
+        if c is None:
+            # tabuleiro cheio: sem lugar para comida, a partida termina
+            self.comida = None
+            self.alive = False
+            return "full"
+        comida = (c % w, c // w)
+        self.comida = comida
+
+        # ajustar dificuldade a cada 5 pontos e gerar novos obstáculos
+        if self.score % POINTS_PER_LEVEL == 0:
+            self.move_delay = next_move_delay(self.move_delay)
+            self.level += 1
+            self._regenerate_obstacles()
+            return "level"
+        return "eat"
+
+
+class BatchEngine:
+    """Milhares de partidas independentes avançando juntas em arrays numpy.
+
+    Células são índices lineares y*grid_w + x. O corpo de cada tabuleiro é um
+    ring buffer em `body` (cabeça em head_ptr) e `occ` marca 0 livre,
+    1 cobra, 2 obstáculo. `free_list`/`free_pos`/`n_free` são a versão em
+    arrays do FreeCells, um por tabuleiro. Ações são índices em DIRECTIONS
+    (-1 mantém a direção). Tabuleiros mortos recomeçam sozinhos se
+    autoreset=True.
+    """
+
+    def __init__(self, n, grid_w=40, grid_h=28, start_delay=140, seed=None, autoreset=True, layouts=None):
+        global np
+        if np is None:
+            try:
+                import numpy as np
+            except ImportError:
+                raise ImportError("BatchEngine precisa do numpy (pip install numpy)")
+        self.n = n
+        self.grid_w = grid_w
+        self.grid_h = grid_h
+        self.cells = grid_w * grid_h
+        self.start_delay = start_delay
+        self.autoreset = autoreset
+        self.layouts = LAYOUTS if layouts is None else layouts
+        self.layouts.prewarm(grid_w, grid_h)
+        self._dx = np.array([d[0] for d in DIRECTIONS], dtype=np.int64)
+        self._dy = np.array([d[1] for d in DIRECTIONS], dtype=np.int64)
+        self._opposite = np.array([DIRECTIONS.index((-d[0], -d[1])) for d in DIRECTIONS], dtype=np.int8)
+        self._boards = np.arange(n)
+
+        self.occ = np.zeros((n, self.cells), dtype=np.uint8)
+        self.body = np.zeros((n, self.cells), dtype=np.int32)
+        self.head_ptr = np.zeros(n, dtype=np.int64)
+        self.length = np.zeros(n, dtype=np.int64)
+        self.n_obstacles = np.zeros(n, dtype=np.int64)
+        self.free_list = np.zeros((n, self.cells), dtype=np.int32)
+        self.free_pos = np.zeros((n, self.cells), dtype=np.int32)
+        self.n_free = np.zeros(n, dtype=np.int64)
+        self.food = np.zeros(n, dtype=np.int64)
+        self.dir = np.zeros(n, dtype=np.int8)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.level = np.zeros(n, dtype=np.int64)
+        self.move_delay = np.zeros(n, dtype=np.int64)
+        self.ticks = np.zeros(n, dtype=np.int64)
+        self.alive = np.zeros(n, dtype=bool)
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        self.rng = np.random.default_rng(seed)
+        # o LayoutCache sorteia com random.Random; derivado da mesma semente
+        self.py_rng = random.Random(int(self.rng.integers(2 ** 63)))
+        self._reset_boards(self._boards)
+        return self
+
+    def _reset_boards(self, idx):
+        if idx.size == 0:
+            return
+        w = self.grid_w
+        self.occ[idx] = FREE
+        start = np.array([3 + 5 * w, 4 + 5 * w, 5 + 5 * w])  # cauda ... cabeça
+        self.body[idx, :3] = start
+        self.occ[idx[:, None], start[None, :]] = SNAKE
+        self.head_ptr[idx] = 2
+        self.length[idx] = 3
+        self.dir[idx] = DIRECTIONS.index(RIGHT)
+        # comida inicial em qualquer célula fora da cobra: sorteia entre as
+        # cells - 3 restantes e pula as células do corpo
+        food = self.rng.integers(0, self.cells - len(start), size=idx.size)
+        for c in sorted(start):
+            food += food >= c
+        self.food[idx] = food
+        self.score[idx] = 0
+        self.level[idx] = 1
+        self.move_delay[idx] = self.start_delay
+        self.ticks[idx] = 0
+        self.alive[idx] = True
+        for b in idx:
+            self._place_obstacles(b)
+        self._rebuild_free(idx)
+
+    def _rebuild_free(self, idx):
+        # células livres primeiro; a ordem dentro da lista não importa
+        order = np.argsort(self.occ[idx] != FREE, axis=1, kind='stable').astype(np.int32)
+        self.free_list[idx] = order
+        self.free_pos[idx[:, None], order] = np.arange(self.cells, dtype=np.int32)
+        self.n_free[idx] = (self.occ[idx] == FREE).sum(axis=1)
+
+    def _occupy(self, idx, c):
+        # remove a célula c[k] da lista livre do tabuleiro idx[k] (troca com a última)
+        p = self.free_pos[idx, c]
+        last = self.free_list[idx, self.n_free[idx] - 1]
+        self.free_list[idx, p] = last
+        self.free_pos[idx, last] = p
+        self.n_free[idx] -= 1
+
+    def _release(self, idx, c):
+        self.free_list[idx, self.n_free[idx]] = c
+        self.free_pos[idx, c] = self.n_free[idx]
+        self.n_free[idx] += 1
+
+    def _place_obstacles(self, b):
+        w, h = self.grid_w, self.grid_h
+        occ = self.occ[b]
+        occ[occ == OBSTACLE] = FREE
+        head = int(self.body[b, self.head_ptr[b]])
+        hx, hy = head % w, head // w
+        food = int(self.food[b])
+        avoid = [((hx + dx) % w, (hy + dy) % h) for dx, dy in DIRECTIONS] + [(food % w, food // w)]
+        obstacles = self.layouts.get(self.py_rng, w, h, int(self.level[b]), avoid, occupied=occ.tobytes())
+        for x, y in obstacles:
+            occ[y * w + x] = OBSTACLE
+        self.n_obstacles[b] = len(obstacles)
+
+    def step(self, actions=None):
+        """Avança todos os tabuleiros vivos um passo; retorna (comeu, morreu)."""
+        boards = self._boards
+        if actions is not None:
+            act = np.broadcast_to(np.asarray(actions, dtype=np.int8), (self.n,))
+            turn = (act >= 0) & (act != self._opposite[self.dir])
+            self.dir = np.where(turn, act, self.dir).astype(np.int8)
+
+        live = self.alive.copy()
+        head = self.body[boards, self.head_ptr]
+        nx = (head % self.grid_w + self._dx[self.dir]) % self.grid_w
+        ny = (head // self.grid_w + self._dy[self.dir]) % self.grid_h
+        new = ny * self.grid_w + nx
+
+        # a cauda ainda ocupa a célula neste ponto, igual ao "nova_cabeca in cobra"
+        died = live & (self.occ[boards, new] != FREE)
+        moved = live & ~died
+        ate = moved & (new == self.food)
+        self.ticks[live] += 1
+
+        idx = boards[moved & ~ate]
+        tail = self.body[idx, (self.head_ptr[idx] - self.length[idx] + 1) % self.cells]
+        self.occ[idx, tail] = FREE
+        self._release(idx, tail)
+
+        idx = boards[moved]
+        self.head_ptr[idx] = (self.head_ptr[idx] + 1) % self.cells
+        self.body[idx, self.head_ptr[idx]] = new[idx]
+        self.occ[idx, new[idx]] = SNAKE
+        self._occupy(idx, new[idx])
+
+        self.length[ate] += 1
+        self.score[ate] += 1
+
+        idx = boards[ate]
+        # tabuleiro cheio: não há onde pôr comida, a partida acaba
+        full = self.n_free[idx] == 0
+        died[idx[full]] = True
+        idx = idx[~full]
+        k = (self.rng.random(idx.size) * self.n_free[idx]).astype(np.int64)
+        self.food[idx] = self.free_list[idx, k]
+
+        lvl = idx[self.score[idx] % POINTS_PER_LEVEL == 0]
+        if lvl.size:
+            self.move_delay[lvl] = np.maximum(MIN_MOVE_DELAY, self.move_delay[lvl] - 10)
+            self.level[lvl] += 1
+            for b in lvl:
+                self._place_obstacles(b)
+            self._rebuild_free(lvl)
+
+        self.alive &= ~died
+        if self.autoreset:
+            self._reset_boards(boards[died])
+        return ate, died
+
+    def snake_cells(self, b):
+        """Corpo do tabuleiro b como lista de células (x, y), cabeça primeiro."""
+        w = self.grid_w
+        ptr = int(self.head_ptr[b])
+        out = []
+        for i in range(int(self.length[b])):
+            c = int(self.body[b, (ptr - i) % self.cells])
+            out.append((c % w, c // w))
+        return out
@@ -0,0 +1,180 @@
+"""Placar por dificuldade: em memória, persistido num log só de acréscimo.
+
+Cada recorde vira uma linha JSON no fim do log, escrita por uma thread (o
+game over nunca espera o disco). A mesma thread começa lendo o log (ou
+migrando o highscore.txt antigo): o construtor não toca no disco, e só as
+consultas (top/best) esperam a leitura terminar. Na leitura o log é
+reaplicado e só os top-N de cada dificuldade ficam; linhas quebradas (queda
+no meio da escrita) são ignoradas, e um pedaço de linha sem "\n" no fim do
+arquivo é cortado para o próximo recorde não ser gravado colado nele.
+Quando o log cresce demais ele é compactado: reescrito num arquivo
+temporário e trocado com os.replace(), que é atômico.
+"""
+import json
+import os
+import queue
+import threading
+import time
+
+
+class Leaderboard:
+    def __init__(self, path, top_n=10, legacy_path=None, legacy_difficulty="Normal", compact_every=200):
+        self.path = path
+        self.top_n = top_n
+        self.compact_every = compact_every
+        self._scores = {}
+        self._lines = 0
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self.write_errors = 0
+        # o arquivo não termina em "\n" (não deu para cortar o pedaço quebrado)
+        self._open_line = False
+        self._loaded = threading.Event()
+        # a leitura é o primeiro item da fila: os recordes enviados antes dela
+        # terminar são gravados depois, na ordem
+        self._queue.put((legacy_path, legacy_difficulty))
+        self._thread = threading.Thread(target=self._run, name="leaderboard", daemon=True)
+        self._thread.start()
+
+    # --- leitura ---
+
+    def _open(self, legacy_path, legacy_difficulty):
+        try:
+            if os.path.exists(self.path):
+                self._load()
+            elif legacy_path and os.path.exists(legacy_path):
+                self._migrate(legacy_path, legacy_difficulty)
+        except OSError:
+            self.write_errors += 1
+        finally:
+            self._loaded.set()
+
+    def _load(self):
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        end = data.rfind(b"\n") + 1
+        rows = []
+        for line in data.splitlines():
+            self._lines += 1
+            try:
+                entry = json.loads(line)
+                rows.append((entry["d"], int(entry["s"]), float(entry.get("t", 0))))
+            except (ValueError, KeyError, TypeError):
+                continue
+        with self._lock:
+            for row in rows:
+                self._insert(*row)
+        if end < len(data):
+            self._repair_tail(data[end:], end)
+
+    def _repair_tail(self, tail, end):
+        # última linha sem "\n": se é um registro inteiro só falta o "\n";
+        # senão é escrita interrompida e o pedaço sai do arquivo
+        try:
+            entry = json.loads(tail)
+            complete = isinstance(entry, dict) and "d" in entry and "s" in entry
+        except ValueError:
+            complete = False
+        try:
+            if complete:
+                with open(self.path, 'ab') as f:
+                    f.write(b"\n")
+            else:
+                with open(self.path, 'r+b') as f:
+                    f.truncate(end)
+                self._lines -= 1
+        except OSError:
+            self.write_errors += 1
+            self._open_line = True
+
+    def _migrate(self, legacy_path, difficulty):
+        # highscore.txt guardava um único score global, sem dificuldade
+        try:
+            with open(legacy_path, 'r') as f:
+                score = int(f.read().strip())
+        except (OSError, ValueError):
+            return
+        with self._lock:
+            self._insert(difficulty, score, os.path.getmtime(legacy_path))
+        try:
+            self._compact()
+        except OSError:
+            self.write_errors += 1
+
+    def _insert(self, difficulty, score, ts):
+        entries = self._scores.setdefault(difficulty, [])
+        entries.append((score, ts))
+        entries.sort(key=lambda e: (-e[0], e[1]))
+        del entries[self.top_n:]
+
+    def top(self, difficulty, n=None):
+        self._loaded.wait()
+        with self._lock:
+            return list(self._scores.get(difficulty, ()))[:n or self.top_n]
+
+    def best(self, difficulty=None):
+        self._loaded.wait()
+        with self._lock:
+            if difficulty is not None:
+                entries = self._scores.get(difficulty)
+                return entries[0][0] if entries else 0
+            return max((e[0][0] for e in self._scores.values() if e), default=0)
+
+    def difficulties(self):
+        self._loaded.wait()
+        with self._lock:
+            return list(self._scores)
+
+    # --- escrita ---
+
+    def submit(self, difficulty, score):
+        """Registra o score na memória na hora; a escrita no disco fica com a thread."""
+        ts = time.time()
+        with self._lock:
+            entries = self._scores.get(difficulty, [])
+            if len(entries) >= self.top_n and score <= entries[-1][0]:
+                return False
+            self._insert(difficulty, score, ts)
+        self._queue.put({"d": difficulty, "s": score, "t": ts})
+        return True
+
+    def flush(self):
+        """Espera a thread ler o log e gravar tudo o que já foi enviado."""
+        self._queue.join()
+
+    def _run(self):
+        self._open(*self._queue.get())
+        self._queue.task_done()
+        while True:
+            entry = self._queue.get()
+            try:
+                self._append(entry)
+                if self._lines >= self.compact_every:
+                    self._compact()
+            except OSError:
+                self.write_errors += 1
+            finally:
+                self._queue.task_done()
+
+    def _append(self, entry):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            if self._open_line:
+                f.write("\n")
+                self._open_line = False
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._lines += 1
+
+    def _compact(self):
+        with self._lock:
+            rows = [{"d": d, "s": s, "t": ts} for d, entries in self._scores.items() for s, ts in entries]
+        tmp = self.path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            for row in rows:
+                f.write(json.dumps(row) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self._lines = len(rows)
+        self._open_line = False
@@ -0,0 +1,92 @@
+"""Playfield em baixa resolução com um único upscale por frame.
+
+Em vez de desenhar cada célula com PIXEL x PIXEL pixels da janela, o jogo
+desenha o playfield (fundo, obstáculos, cobra, comida, fade) numa superfície
+lógica com `cell` pixels por célula (grid_w*cell x grid_h*cell, ex.: 160x112
+com cell=4) e layout()/upscale()/flip() levam isso para a janela:
+
+    target = screen.layout()        # escala inteira que cabe na janela
+    screen.upscale()                # transform.scale (vizinho mais próximo) direto na janela
+    target.blit(hud, (8, 8))        # HUD e efeitos em resolução nativa, por cima
+    screen.flip()
+
+A escala é sempre inteira (todo pixel lógico vira um quadrado igual) e o
+playfield fica centralizado com faixas da cor `bg` em volta, então a janela
+pode ter qualquer tamanho sem mexer na lógica. `target` é a área do playfield
+na janela (uma subsurface): coordenadas nativas do HUD começam no canto dela.
+"""
+import pygame
+
+from profiler import count_surface
+
+
+class LowResScreen:
+    def __init__(self, grid_w, grid_h, cell=4, bg=(0, 0, 0)):
+        self.grid_w = grid_w
+        self.grid_h = grid_h
+        self.cell = cell
+        self.bg = bg
+        self.surface = pygame.Surface((grid_w * cell, grid_h * cell)).convert()
+        count_surface()
+        self.scale = 1
+        self.view = pygame.Rect(0, 0, 0, 0)
+        self.target = None
+        self._window = None
+        self._window_size = None
+        # janela menor que o playfield: upscale numa superfície à parte, blit recortado
+        self._clipped = None
+        self.frames = 0
+        self.pixels_scaled = 0
+
+    @property
+    def native_cell(self):
+        """Pixels da janela por célula do grid na escala atual."""
+        return self.cell * self.scale
+
+    def layout(self):
+        """Escala e posição do playfield para o tamanho atual da janela; devolve `target`."""
+        window = pygame.display.get_surface()
+        size = window.get_size()
+        if window is self._window and size == self._window_size:
+            return self.target
+        lw, lh = self.surface.get_size()
+        ww, wh = size
+        self.scale = max(1, min(ww // lw, wh // lh))
+        w, h = lw * self.scale, lh * self.scale
+        self.view = pygame.Rect((ww - w) // 2, (wh - h) // 2, w, h)
+        window.fill(self.bg)
+        if window.get_rect().contains(self.view):
+            self.target = window.subsurface(self.view)
+            self._clipped = None
+        else:
+            self.target = self._clipped = pygame.Surface((w, h)).convert()
+            count_surface()
+        self._window = window
+        self._window_size = size
+        # faixas em volta: a janela inteira vai para a tela uma vez
+        pygame.display.update()
+        return self.target
+
+    def upscale(self):
+        """Superfície lógica -> target, vizinho mais próximo na escala inteira."""
+        pygame.transform.scale(self.surface, self.view.size, self.target)
+        self.frames += 1
+        self.pixels_scaled += self.view.w * self.view.h
+
+    def flip(self):
+        if self._clipped is not None:
+            self._window.blit(self._clipped, self.view)
+        pygame.display.update(self.view.clip(self._window.get_rect()))
+
+    def invalidate(self):
+        """Força o próximo layout() a refazer tudo (ex.: depois de set_mode)."""
+        self._window = None
+
+    def stats(self):
+        frames = max(1, self.frames)
+        return {
+            "logical": self.surface.get_size(),
+            "scale": self.scale,
+            "frames": self.frames,
+            "avg_pixels_scaled": self.pixels_scaled / frames,
+        }
@@ -0,0 +1,136 @@
+"""Música de fundo tocada por uma thread própria.
+
+Na partida a thread confere e lê para a memória as faixas (menu, jogo, game
+over). Depois ela fica aplicando os pedidos de troca que o jogo enfileira com
+play()/stop(); o loop de render só coloca o pedido na fila e segue (nem
+confere se o arquivo existe: isso também é feito pela thread, que anota as
+faixas que faltam; o jogo as lê com stats() ou pop_missing() e avisa do seu
+lado). Se vários pedidos chegarem juntos, só o último é aplicado.
+"""
+import io
+import os
+import queue
+import threading
+import time
+
+import pygame
+
+from timestep import LatencyStats
+
+
+class MusicManager:
+    def __init__(self, paths=(), volume=0.45, crossfade_ms=0):
+        self.volume = volume
+        self.crossfade_ms = crossfade_ms
+        self.paths = list(paths)
+        self._data = {}
+        self._missing = set()
+        self._reported = set()
+        # protege _data/_missing: a thread escreve, stats()/pop_missing() leem
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._thread = None
+        self.current = None
+        # tempo do pedido até a faixa começar a tocar, e custo do pedido no loop (ms)
+        self.switch_latency = LatencyStats()
+        self.request_cost = LatencyStats()
+        self.warm_ms = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="music", daemon=True)
+            self._thread.start()
+        return self
+
+    def play(self, path, loops=-1):
+        """Enfileira a troca de faixa; True = pedido aceito (a faixa pode faltar, ver stats())."""
+        t = time.perf_counter()
+        self._queue.put(("play", path, loops, t))
+        self.request_cost.add((time.perf_counter() - t) * 1000)
+        return True
+
+    def stop(self):
+        self._queue.put(("stop", None, 0, time.perf_counter()))
+
+    def close(self, timeout=1.0):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def ready(self, path):
+        return path in self._data
+
+    def stats(self):
+        with self._lock:
+            tracks, missing = len(self._data), sorted(self._missing)
+        return {
+            "warm_ms": self.warm_ms,
+            "tracks": tracks,
+            "missing": missing,
+            "switch_ms": self.switch_latency.summary(),
+            "request_ms": self.request_cost.summary(),
+        }
+
+    def pop_missing(self):
+        """Faixas que faltam e ainda não foram avisadas (cada uma sai uma vez só)."""
+        with self._lock:
+            novas = sorted(self._missing - self._reported)
+            self._reported.update(novas)
+        return novas
+
+    # --- thread da música ---
+
+    def _load_bytes(self, path):
+        if path in self._data or path in self._missing:
+            return self._data.get(path)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            with self._lock:
+                self._missing.add(path)
+            return None
+        with self._lock:
+            self._data[path] = data
+        return data
+
+    def _run(self):
+        t = time.perf_counter()
+        for path in self.paths:
+            self._load_bytes(path)
+        self.warm_ms = (time.perf_counter() - t) * 1000
+        while True:
+            cmd = self._queue.get()
+            # junta pedidos acumulados: vale o último
+            while cmd is not None:
+                try:
+                    nxt = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                cmd = nxt
+            if cmd is None:
+                return
+            try:
+                self._apply(*cmd)
+            except Exception:
+                pass
+
+    def _apply(self, action, path, loops, requested_at):
+        fade = self.crossfade_ms
+        if fade and pygame.mixer.music.get_busy():
+            pygame.mixer.music.fadeout(fade)
+            time.sleep(fade / 1000.0)
+        else:
+            pygame.mixer.music.stop()
+        self.current = None
+        if action == "stop":
+            return
+        data = self._load_bytes(path)
+        if data is None:
+            return
+        pygame.mixer.music.load(io.BytesIO(data), os.path.splitext(path)[1].lstrip('.'))
+        pygame.mixer.music.set_volume(self.volume)
+        pygame.mixer.music.play(loops, fade_ms=fade)
+        self.current = path
+        self.switch_latency.add((time.perf_counter() - requested_at) * 1000)
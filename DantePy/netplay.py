@@ -0,0 +1,720 @@
+"""Versus pela rede: servidor asyncio autoritativo e cliente que espelha o estado.
+
+O servidor é dono do VersusEngine e do relógio: a cada tick aplica o último
+input de cada jogador, roda step() e manda para todos a lista de mudanças do
+passo (cabeças novas, caudas que saíram, mortes, comida, obstáculos) em vez
+dos corpos inteiros. O delta é codificado uma vez por tick e a mesma
+mensagem vai para todos os clientes, então o custo do tick cresce pouco com
+o número de conexões. Um cliente novo recebe o estado inteiro uma vez
+(WELCOME) e depois só deltas.
+
+Mensagens: varint com o tamanho + corpo; corpo[0] é o tipo. Números são
+varints (replay.write_varint) e células são índices y*grid_w + x. O
+tamanho é limitado (MAX_FRAME; do cliente para o servidor só existe INPUT,
+INPUT_SIZE bytes): o servidor derruba quem manda mensagem fora disso.
+
+    WELCOME  pid grid_w grid_h tick_ms | estado (tick level jogadores comida obstáculos)
+    DELTA    tick n_ops ops...
+    INPUT    direção (índice em DIRECTIONS)          cliente -> servidor
+
+Teste local (servidor + clientes simulados no mesmo processo, via localhost):
+
+    python netplay.py loadtest --clients 40 --seconds 10 --tick-ms 50
+    python netplay.py server --port 7777
+    python netplay.py bots 127.0.0.1 7777 --clients 20
+"""
+import asyncio
+import random
+import socket
+import sys
+import threading
+import time
+from collections import deque
+
+from engine import DIRECTIONS, FREE, SNAKE, OBSTACLE, clamp_dir
+from replay import write_varint, read_varint
+from timestep import LatencyStats
+from versus import VersusEngine
+
+MSG_WELCOME = 1
+MSG_DELTA = 2
+MSG_INPUT = 3
+
+OP_SPAWN = 1
+OP_HEAD = 2
+OP_TAIL = 3
+OP_DIE = 4
+OP_LEAVE = 5
+OP_SCORE = 6
+OP_FOOD_ADD = 7
+OP_FOOD_DEL = 8
+OP_OBSTACLES = 9
+
+_OPS = {"spawn": OP_SPAWN, "head": OP_HEAD, "tail": OP_TAIL, "die": OP_DIE, "leave": OP_LEAVE,
+        "score": OP_SCORE, "food+": OP_FOOD_ADD, "food-": OP_FOOD_DEL, "obstacles": OP_OBSTACLES}
+_DIR_INDEX = {d: i for i, d in enumerate(DIRECTIONS)}
+
+DEFAULT_PORT = 7777
+# cliente com mais que isso esperando para sair é lento demais: desconecta
+MAX_CLIENT_BUFFER = 256 * 1024
+# maior mensagem aceita (o WELCOME de um grid grande cheio de cobras cabe com folga)
+MAX_FRAME = 1 << 20
+# corpo do INPUT: tipo + direção
+INPUT_SIZE = 2
+
+
+class FrameError(ValueError):
+    """Mensagem malformada: tamanho fora do limite ou corpo inválido."""
+
+
+# --- codificação ---
+
+def frame(body):
+    out = bytearray()
+    write_varint(out, len(body))
+    out += body
+    return bytes(out)
+
+
+async def read_frame(reader, limit=MAX_FRAME):
+    """Corpo da próxima mensagem; FrameError se o tamanho for 0 ou passar de `limit`."""
+    n = shift = 0
+    while True:
+        b = (await reader.readexactly(1))[0]
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            break
+        shift += 7
+        if n > limit:
+            raise FrameError(f"mensagem grande demais (> {limit} bytes)")
+    if n == 0 or n > limit:
+        raise FrameError(f"tamanho de mensagem inválido: {n}")
+    return await reader.readexactly(n)
+
+
+def _write_cells(buf, cells):
+    write_varint(buf, len(cells))
+    for c in cells:
+        write_varint(buf, c)
+
+
+def encode_welcome(pid, engine, tick_ms):
+    snap = engine.snapshot()
+    buf = bytearray([MSG_WELCOME])
+    for n in (pid, engine.grid_w, engine.grid_h, tick_ms, snap["tick"], snap["level"], len(snap["players"])):
+        write_varint(buf, n)
+    for p, (cells, direcao, alive, score) in snap["players"].items():
+        for n in (p, int(alive), _DIR_INDEX[direcao], score):
+            write_varint(buf, n)
+        _write_cells(buf, cells)
+    _write_cells(buf, snap["foods"])
+    _write_cells(buf, snap["obstacles"])
+    return frame(buf)
+
+
+def encode_delta(tick, events):
+    buf = bytearray([MSG_DELTA])
+    write_varint(buf, tick)
+    write_varint(buf, len(events))
+    for ev in events:
+        op = _OPS[ev[0]]
+        buf.append(op)
+        if op == OP_SPAWN:
+            write_varint(buf, ev[1])
+            buf.append(_DIR_INDEX[ev[2]])
+            _write_cells(buf, ev[3])
+        elif op in (OP_HEAD, OP_SCORE):
+            write_varint(buf, ev[1])
+            write_varint(buf, ev[2])
+        elif op in (OP_TAIL, OP_DIE, OP_LEAVE, OP_FOOD_ADD, OP_FOOD_DEL):
+            write_varint(buf, ev[1])
+        else:
+            _write_cells(buf, ev[1])
+    return frame(buf)
+
+
+def encode_input(direcao):
+    return frame(bytes((MSG_INPUT, _DIR_INDEX[direcao])))
+
+
+# --- servidor ---
+
+class VersusServer:
+    """Dono da partida: aceita conexões, roda os ticks e espalha os deltas."""
+
+    def __init__(self, grid_w=40, grid_h=28, tick_ms=100, seed=None, host="127.0.0.1", port=DEFAULT_PORT):
+        self.engine = VersusEngine(grid_w, grid_h, seed=seed)
+        self.tick_ms = tick_ms
+        self.host = host
+        self.port = port
+        self.clients = {}
+        self._next_pid = 1
+        self._input_at = {}
+        self._server = None
+        self._task = None
+        self._handlers = set()
+        # métricas
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.ticks = 0
+        self.dropped = 0
+        self.rejected = 0
+        self.delta_bytes = 0
+        self.tick_time = LatencyStats(1024)      # step + codificar + escrever (ms)
+        self.tick_late = LatencyStats(1024)      # atraso do início do tick em relação ao horário (ms)
+        self.input_latency = LatencyStats(1024)  # input chegou -> delta com ele saiu (ms)
+        self.started = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self.started = time.perf_counter()
+        self._task = asyncio.create_task(self._tick_loop())
+        return self
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for writer in list(self.clients.values()):
+            writer.close()
+        # cada conexão termina sozinha ao ver o fim do stream
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        self.clients.clear()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        pid = self._next_pid
+        self._next_pid += 1
+        task = asyncio.current_task()
+        self._handlers.add(task)
+        self.engine.add_player(pid)
+        msg = encode_welcome(pid, self.engine, self.tick_ms)
+        writer.write(msg)
+        self.bytes_out += len(msg)
+        self.clients[pid] = writer
+        try:
+            while True:
+                body = await read_frame(reader, INPUT_SIZE)
+                self.bytes_in += len(body) + 1
+                if len(body) != INPUT_SIZE or body[0] != MSG_INPUT or body[1] >= len(DIRECTIONS):
+                    raise FrameError(f"mensagem inválida do jogador {pid}")
+                self.engine.set_input(pid, DIRECTIONS[body[1]])
+                self._input_at.setdefault(pid, time.perf_counter())
+        except FrameError:
+            # cliente quebrado ou malicioso: derruba só ele
+            self.rejected += 1
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.clients.pop(pid, None)
+            self._input_at.pop(pid, None)
+            self.engine.remove_player(pid)
+            self._handlers.discard(task)
+            writer.close()
+
+    async def _tick_loop(self):
+        loop = asyncio.get_running_loop()
+        interval = self.tick_ms / 1000
+        deadline = loop.time()
+        while True:
+            deadline += interval
+            await asyncio.sleep(max(0.0, deadline - loop.time()))
+            now = loop.time()
+            self.tick_late.add((now - deadline) * 1000)
+            if now - deadline > 5 * interval:
+                # muito atrasado (máquina parada): não tenta recuperar os ticks perdidos
+                deadline = now
+            t = time.perf_counter()
+            self.broadcast(encode_delta(self.engine.ticks + 1, self.engine.step()))
+            done = time.perf_counter()
+            for pid, at in self._input_at.items():
+                self.input_latency.add((done - at) * 1000)
+            self._input_at.clear()
+            self.tick_time.add((done - t) * 1000)
+            self.ticks += 1
+
+    def broadcast(self, msg):
+        self.delta_bytes += len(msg)
+        for pid, writer in list(self.clients.items()):
+            transport = writer.transport
+            if transport.is_closing():
+                continue
+            if transport.get_write_buffer_size() > MAX_CLIENT_BUFFER:
+                # não acompanha: melhor derrubar que acumular memória (ele pode reconectar)
+                self.dropped += 1
+                writer.close()
+                continue
+            writer.write(msg)
+            self.bytes_out += len(msg)
+
+    def metrics(self):
+        elapsed = time.perf_counter() - self.started if self.started else 0.0
+        n = max(1, len(self.clients))
+        return {
+            "clients": len(self.clients),
+            "ticks": self.ticks,
+            "tick_ms": self.tick_time.summary(),
+            "tick_late_ms": self.tick_late.summary(),
+            "input_latency_ms": self.input_latency.summary(),
+            "bytes_out_per_s": self.bytes_out / elapsed if elapsed else 0.0,
+            "bytes_in_per_s": self.bytes_in / elapsed if elapsed else 0.0,
+            "delta_bytes_per_tick": self.delta_bytes / self.ticks if self.ticks else 0.0,
+            # o que custaria mandar o estado inteiro a cada tick, para comparar
+            "full_bytes": len(encode_welcome(0, self.engine, self.tick_ms)),
+            "bytes_out_per_client_tick": self.bytes_out / self.ticks / n if self.ticks else 0.0,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+        }
+
+
+# --- cliente ---
+
+class PlayerView:
+    __slots__ = ("cobra", "direcao", "alive", "score", "prev_head")
+
+    def __init__(self):
+        self.cobra = deque()
+        self.direcao = DIRECTIONS[3]
+        self.alive = False
+        self.score = 0
+        self.prev_head = None
+
+
+class ClientState:
+    """Cópia local da partida montada a partir do WELCOME e dos deltas."""
+
+    def __init__(self):
+        self.pid = None
+        self.grid_w = self.grid_h = 0
+        self.tick_ms = 100
+        self.tick = 0
+        self.level = 1
+        self.players = {}
+        self.foods = set()
+        self.obstacles = []
+        self.grid = bytearray()
+        self.tick_time = 0.0
+        self.bytes_in = 0
+        self.deltas = 0
+        self.gaps = LatencyStats()  # intervalo entre deltas (ms): jitter visto pelo cliente
+
+    def apply(self, body, now=None):
+        """Aplica uma mensagem do servidor; retorna o tipo dela."""
+        now = time.perf_counter() if now is None else now
+        self.bytes_in += len(body) + 1
+        kind = body[0]
+        if kind == MSG_WELCOME:
+            self._welcome(body)
+        elif kind == MSG_DELTA:
+            self._delta(body)
+            if self.deltas:
+                self.gaps.add((now - self.tick_time) * 1000)
+            self.deltas += 1
+        self.tick_time = now
+        return kind
+
+    def _read_cells(self, body, pos):
+        n, pos = read_varint(body, pos)
+        cells = []
+        for _ in range(n):
+            c, pos = read_varint(body, pos)
+            cells.append(c)
+        return cells, pos
+
+    def _welcome(self, body):
+        pos = 1
+        vals = []
+        for _ in range(7):
+            v, pos = read_varint(body, pos)
+            vals.append(v)
+        self.pid, self.grid_w, self.grid_h, self.tick_ms, self.tick, self.level, n = vals
+        self.grid = bytearray(self.grid_w * self.grid_h)
+        self.players = {}
+        for _ in range(n):
+            pid, pos = read_varint(body, pos)
+            alive, pos = read_varint(body, pos)
+            d, pos = read_varint(body, pos)
+            score, pos = read_varint(body, pos)
+            cells, pos = self._read_cells(body, pos)
+            p = self.players[pid] = PlayerView()
+            p.alive, p.direcao, p.score = bool(alive), DIRECTIONS[d], score
+            p.cobra.extend(cells)
+            for c in cells:
+                self.grid[c] = SNAKE
+        foods, pos = self._read_cells(body, pos)
+        self.foods = set(foods)
+        self.obstacles, pos = self._read_cells(body, pos)
+        for c in self.obstacles:
+            self.grid[c] = OBSTACLE
+
+    def _player(self, pid):
+        p = self.players.get(pid)
+        if p is None:
+            p = self.players[pid] = PlayerView()
+        return p
+
+    def _delta(self, body):
+        tick, pos = read_varint(body, 1)
+        n, pos = read_varint(body, pos)
+        self.tick = tick
+        grid = self.grid
+        for p in self.players.values():
+            p.prev_head = p.cobra[0] if p.cobra else None
+        for _ in range(n):
+            op = body[pos]
+            pos += 1
+            if op == OP_HEAD:
+                pid, pos = read_varint(body, pos)
+                c, pos = read_varint(body, pos)
+                p = self._player(pid)
+                if p.cobra:
+                    p.direcao = self._dir(p.cobra[0], c)
+                p.cobra.appendleft(c)
+                grid[c] = SNAKE
+            elif op == OP_TAIL:
+                pid, pos = read_varint(body, pos)
+                grid[self.players[pid].cobra.pop()] = FREE
+            elif op in (OP_DIE, OP_LEAVE):
+                pid, pos = read_varint(body, pos)
+                p = self._player(pid)
+                for c in p.cobra:
+                    grid[c] = FREE
+                p.cobra.clear()
+                p.alive = False
+                p.prev_head = None
+                if op == OP_LEAVE:
+                    del self.players[pid]
+            elif op == OP_SPAWN:
+                pid, pos = read_varint(body, pos)
+                d = body[pos]
+                pos += 1
+                cells, pos = self._read_cells(body, pos)
+                p = self._player(pid)
+                p.cobra = deque(cells)
+                p.direcao = DIRECTIONS[d]
+                p.alive = True
+                p.prev_head = None
+                for c in cells:
+                    grid[c] = SNAKE
+            elif op == OP_SCORE:
+                pid, pos = read_varint(body, pos)
+                self._player(pid).score, pos = read_varint(body, pos)
+            elif op == OP_FOOD_ADD:
+                c, pos = read_varint(body, pos)
+                self.foods.add(c)
+            elif op == OP_FOOD_DEL:
+                c, pos = read_varint(body, pos)
+                self.foods.discard(c)
+            elif op == OP_OBSTACLES:
+                for c in self.obstacles:
+                    grid[c] = FREE
+                self.obstacles, pos = self._read_cells(body, pos)
+                for c in self.obstacles:
+                    grid[c] = OBSTACLE
+                self.level += 1
+            else:
+                raise ValueError(f"op desconhecida: {op}")
+
+    def _dir(self, a, b):
+        w, h = self.grid_w, self.grid_h
+        dx = (b % w - a % w) % w
+        dy = (b // w - a // w) % h
+        return (dx - w if dx > 1 else dx, dy - h if dy > 1 else dy)
+
+    def alpha(self, now=None):
+        """Fração do tick atual já passada (0..1), para interpolar as cabeças."""
+        now = time.perf_counter() if now is None else now
+        return min(1.0, (now - self.tick_time) * 1000 / self.tick_ms)
+
+    def head_position(self, pid, alpha):
+        """Cabeça de pid em células (float), entre a posição anterior e a atual."""
+        p = self.players[pid]
+        w = self.grid_w
+        c = p.cobra[0]
+        x, y = c % w, c // w
+        if p.prev_head is None:
+            return x, y
+        px, py = p.prev_head % w, p.prev_head // w
+        if abs(x - px) + abs(y - py) != 1:
+            # deu a volta na borda: sem interpolar
+            return x, y
+        return px + (x - px) * alpha, py + (y - py) * alpha
+
+    def digest(self):
+        players = tuple(sorted((pid, tuple(p.cobra), p.score) for pid, p in self.players.items()))
+        return (self.tick, players, tuple(sorted(self.foods)), tuple(sorted(self.obstacles)))
+
+
+class VersusClient:
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT):
+        self.host = host
+        self.port = port
+        self.state = ClientState()
+        self.reader = None
+        self.writer = None
+        self.bytes_out = 0
+        self._last_input = None
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        sock = self.writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        await self.recv()
+        return self
+
+    async def recv(self):
+        return self.state.apply(await read_frame(self.reader))
+
+    def send_input(self, direcao):
+        # só manda mudança de direção; repetir a mesma não muda nada no servidor
+        if direcao is None or direcao == self._last_input:
+            return
+        self._last_input = direcao
+        msg = encode_input(direcao)
+        self.writer.write(msg)
+        self.bytes_out += len(msg)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+# --- clientes simulados ---
+
+def bot_direction(state, rng):
+    """Vai para a comida mais perto (com wrap) por um vizinho livre; None se está morto."""
+    me = state.players.get(state.pid)
+    if me is None or not me.alive or not me.cobra:
+        return None
+    w, h = state.grid_w, state.grid_h
+    head = me.cobra[0]
+    hx, hy = head % w, head // w
+    alvo = min(state.foods, key=lambda c: dist_to(head, c, w, h), default=None)
+    best = None
+    best_d = None
+    dirs = list(DIRECTIONS)
+    rng.shuffle(dirs)
+    for d in dirs:
+        if clamp_dir(d, me.direcao) != d:
+            continue
+        c = (hy + d[1]) % h * w + (hx + d[0]) % w
+        if state.grid[c] != FREE:
+            continue
+        dd = dist_to(c, alvo, w, h) if alvo is not None else 0
+        if best is None or dd < best_d:
+            best, best_d = d, dd
+    return best
+
+
+def dist_to(a, b, w, h):
+    dx = abs(a % w - b % w)
+    dy = abs(a // w - b // w)
+    return min(dx, w - dx) + min(dy, h - dy)
+
+
+async def run_bot(host, port, stop, seed=None):
+    """Cliente simulado: conecta, joga com bot_direction até `stop` ser setado."""
+    rng = random.Random(seed)
+    client = await VersusClient(host, port).connect()
+    try:
+        while not stop.is_set():
+            kind = await client.recv()
+            if kind == MSG_DELTA:
+                client.send_input(bot_direction(client.state, rng))
+    except (asyncio.IncompleteReadError, ConnectionError, FrameError):
+        pass
+    return client
+
+
+class NetThread:
+    """Cliente num thread com o próprio loop asyncio (para a janela pygame).
+
+    `lock` protege `state`: o thread de rede aplica os deltas com ele e o
+    render lê com ele. Com local_bots não None sobe também um servidor e
+    bots no mesmo loop (versus local).
+    """
+
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, local_bots=None, tick_ms=100, grid=(40, 28)):
+        self.host = host
+        self.port = port
+        self.local_bots = local_bots
+        self.tick_ms = tick_ms
+        self.grid = grid
+        self.lock = threading.Lock()
+        self.client = None
+        self.server = None
+        self.error = None
+        self._ready = threading.Event()
+        self._loop = None
+        self._stop = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self, timeout=5.0):
+        self._thread.start()
+        self._ready.wait(timeout)
+        if self.error is not None:
+            raise self.error
+        if self.client is None:
+            raise ConnectionError("sem resposta do servidor")
+        return self
+
+    @property
+    def state(self):
+        return self.client.state
+
+    def send_input(self, direcao):
+        self._loop.call_soon_threadsafe(self.client.send_input, direcao)
+
+    def stop(self):
+        """Encerra o loop de rede e espera o thread (pode ser chamado mais de uma vez)."""
+        if not self._thread.is_alive():
+            return
+        if self._loop is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._stop.set)
+            except RuntimeError:
+                pass  # o loop acabou de terminar sozinho
+        self._thread.join(2.0)
+
+    def _run(self):
+        try:
+            asyncio.run(self._main())
+        except Exception as e:
+            self.error = e
+            self._ready.set()
+
+    async def _main(self):
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        bots = []
+        if self.local_bots is not None:
+            self.server = await VersusServer(self.grid[0], self.grid[1], self.tick_ms,
+                                             host="127.0.0.1", port=0).start()
+            self.port = self.server.port
+            bots = [asyncio.create_task(run_bot("127.0.0.1", self.port, self._stop, seed=i))
+                    for i in range(self.local_bots)]
+        # o render só lê o estado depois de _ready
+        self.client = await VersusClient(self.host if self.server is None else "127.0.0.1", self.port).connect()
+        self._ready.set()
+        recv = asyncio.create_task(self._recv_loop())
+        await self._stop.wait()
+        recv.cancel()
+        self.client.close()
+        for b in bots:
+            b.cancel()
+        if self.server is not None:
+            await self.server.stop()
+
+    async def _recv_loop(self):
+        reader = self.client.reader
+        state = self.client.state
+        try:
+            while True:
+                body = await read_frame(reader)
+                with self.lock:
+                    state.apply(body)
+        except (asyncio.IncompleteReadError, ConnectionError, FrameError) as e:
+            self.error = e
+
+
+# --- linha de comando ---
+
+async def loadtest(clients=20, seconds=10.0, tick_ms=50, grid=(40, 28)):
+    """Servidor e `clients` bots no mesmo processo via localhost; retorna (métricas, clientes em dia)."""
+    server = await VersusServer(grid[0], grid[1], tick_ms, host="127.0.0.1", port=0).start()
+    stop = asyncio.Event()
+    bots = [asyncio.create_task(run_bot("127.0.0.1", server.port, stop, seed=i)) for i in range(clients)]
+    await asyncio.sleep(seconds)
+    metrics = server.metrics()
+    # para os ticks e deixa os últimos deltas chegarem antes de comparar os estados
+    task, server._task = server._task, None
+    task.cancel()
+    await asyncio.sleep(0.3)
+    stop.set()
+    digest = server.engine.digest()
+    # fechar as conexões acorda os bots que esperam o próximo delta
+    await server.stop()
+    in_sync = 0
+    for client in await asyncio.gather(*bots):
+        in_sync += client.state.digest() == digest
+    return metrics, in_sync
+
+
+def _print_metrics(m):
+    print(f"clientes {m['clients']}  ticks {m['ticks']}  derrubados {m['dropped']}  "
+          f"recusados {m['rejected']}")
+    for key in ("tick_ms", "tick_late_ms", "input_latency_ms"):
+        s = m[key]
+        print(f"  {key:18s} p50 {s['p50']:7.3f}  p99 {s['p99']:7.3f}  max {s['max']:7.3f}")
+    print(f"  saída {m['bytes_out_per_s'] / 1024:8.1f} KB/s  entrada {m['bytes_in_per_s'] / 1024:6.1f} KB/s")
+    print(f"  delta {m['delta_bytes_per_tick']:.0f} B/tick (estado inteiro: {m['full_bytes']} B), "
+          f"{m['bytes_out_per_client_tick']:.0f} B por cliente por tick")
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Versus pela rede (servidor asyncio)")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("server")
+    p.add_argument("--host", default="0.0.0.0")
+    p.add_argument("--port", type=int, default=DEFAULT_PORT)
+    p.add_argument("--tick-ms", type=int, default=100)
+    p.add_argument("--grid", default="40x28")
+    p = sub.add_parser("bots")
+    p.add_argument("host")
+    p.add_argument("port", type=int)
+    p.add_argument("--clients", type=int, default=10)
+    p.add_argument("--seconds", type=float, default=30)
+    p = sub.add_parser("loadtest")
+    p.add_argument("--clients", type=int, default=20)
+    p.add_argument("--seconds", type=float, default=10)
+    p.add_argument("--tick-ms", type=int, default=50)
+    p.add_argument("--grid", default="40x28")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "loadtest":
+        grid = tuple(int(v) for v in args.grid.split("x"))
+        metrics, in_sync = asyncio.run(loadtest(args.clients, args.seconds, args.tick_ms, grid))
+        _print_metrics(metrics)
+        print(f"  clientes com o estado igual ao do servidor: {in_sync}/{args.clients}")
+        return 0 if in_sync == args.clients else 1
+
+    if args.cmd == "bots":
+        async def bots():
+            stop = asyncio.Event()
+            tasks = [asyncio.create_task(run_bot(args.host, args.port, stop, seed=i))
+                     for i in range(args.clients)]
+            await asyncio.sleep(args.seconds)
+            stop.set()
+            for t in tasks:
+                t.cancel()
+        asyncio.run(bots())
+        return 0
+
+    async def serve():
+        grid = tuple(int(v) for v in args.grid.split("x"))
+        server = await VersusServer(grid[0], grid[1], args.tick_ms, host=args.host, port=args.port).start()
+        print(f"servidor em {args.host}:{server.port}, tick {args.tick_ms} ms")
+        while True:
+            await asyncio.sleep(5)
+            _print_metrics(server.metrics())
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
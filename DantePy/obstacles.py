@@ -0,0 +1,149 @@
+"""Geração de obstáculos com garantia de conectividade e cache de layouts.
+
+Células aqui são índices lineares y*grid_w + x. Um layout é válido quando
+todas as células livres (nem obstáculo nem cobra, na hora em que o layout
+entra) continuam formando uma única região (com wrap nas bordas), então a
+cabeça sempre tem caminho até a comida.
+"""
+import random
+from collections import deque
+
+# layouts guardados por (grid_w, grid_h, quantidade): o level-up sorteia um
+# deles, então cada nível varia entre POOL_SIZE formas (mais as células
+# refeitas quando o layout cai em cima da cobra); mais variedade custa tempo
+# no prewarm
+POOL_SIZE = 8
+
+# vizinhos em volta de uma célula, em ordem circular (N, NE, L, SE, S, SO, O, NO)
+_RING = ((0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1))
+
+
+def obstacle_count(level):
+    # número de obstáculos cresce com o nível
+    return min(30, 1 + level * 2)
+
+
+def neighbours(c, grid_w, grid_h):
+    x, y = c % grid_w, c // grid_w
+    return (((y - 1) % grid_h) * grid_w + x, y * grid_w + (x + 1) % grid_w,
+            ((y + 1) % grid_h) * grid_w + x, y * grid_w + (x - 1) % grid_w)
+
+
+def reachable(walls, grid_w, grid_h, start, targets):
+    """Flood-fill a partir de start; True se todas as células de targets são alcançadas."""
+    pending = set(targets)
+    pending.discard(start)
+    seen = bytearray(len(walls))
+    seen[start] = 1
+    fila = deque([start])
+    while fila and pending:
+        for n in neighbours(fila.popleft(), grid_w, grid_h):
+            if not seen[n] and not walls[n]:
+                seen[n] = 1
+                pending.discard(n)
+                fila.append(n)
+    return not pending
+
+
+def keeps_connected(walls, grid_w, grid_h, c):
+    """True se virar obstáculo em c não divide a região livre.
+
+    Teste local primeiro: se os vizinhos livres de c se ligam pelo anel de 8
+    células em volta, nada muda. Só quando o anel se parte é que roda um
+    flood-fill (incremental: parte de um vizinho e para ao achar os outros).
+    """
+    x, y = c % grid_w, c // grid_w
+    ring = [not walls[((y + dy) % grid_h) * grid_w + (x + dx) % grid_w] for dx, dy in _RING]
+    # grupos de vizinhos ortogonais livres ligados por diagonais livres
+    grupos = 0
+    for i in range(0, 8, 2):
+        if ring[i] and not (ring[(i - 1) % 8] and ring[(i - 2) % 8]):
+            grupos += 1
+    if grupos <= 1:
+        return True
+    livres = [n for n in neighbours(c, grid_w, grid_h) if not walls[n]]
+    walls[c] = 1
+    try:
+        return reachable(walls, grid_w, grid_h, livres[0], livres[1:])
+    finally:
+        walls[c] = 0
+
+
+def generate_obstacles(rng, grid_w, grid_h, level, avoid_positions=None, occupied=None, start=(),
+                       count=None):
+    """Gera obstáculos com base no level; retorna lista de células (x, y).
+
+    avoid_positions: células (x, y) proibidas (comida, vizinhos da cabeça...).
+    occupied: grid de ocupação do motor (sem os obstáculos antigos); células
+    != 0 são evitadas e contam como parede no teste de conectividade, para
+    o layout não fechar a cabeça entre o corpo e os obstáculos.
+    start: índices lineares candidatos (ex.: vindos do cache); cada um é
+    mantido se não divide a região livre.
+    count: quantidade de obstáculos; sem ela, obstacle_count(level).
+    """
+    avoid = {y * grid_w + x for x, y in (avoid_positions or ())}
+    walls = bytearray(occupied) if occupied is not None else bytearray(grid_w * grid_h)
+    placed = []
+    for c in start:
+        if walls[c] or not keeps_connected(walls, grid_w, grid_h, c):
+            continue
+        walls[c] = 1
+        placed.append(c)
+    if count is None:
+        count = obstacle_count(level)
+    tries = 0
+    while len(placed) < count and tries < count * 10:
+        tries += 1
+        c = rng.randrange(0, grid_h) * grid_w + rng.randrange(0, grid_w)
+        if walls[c] or c in avoid:
+            continue
+        if not keeps_connected(walls, grid_w, grid_h, c):
+            continue
+        walls[c] = 1
+        placed.append(c)
+    return [(c % grid_w, c // grid_w) for c in placed]
+
+
+class LayoutCache:
+    """Layouts de obstáculos pré-validados por (grid_w, grid_h, quantidade).
+
+    Cada entrada guarda `pool` layouts gerados com a semente do cache, então o
+    conteúdo é sempre o mesmo. No level-up basta sortear um, descartar as
+    células que caem em cima da cobra/comida e completar as que faltarem.
+    """
+
+    def __init__(self, seed=0, pool=POOL_SIZE):
+        self.seed = seed
+        self.pool = pool
+        self._layouts = {}
+
+    def layouts(self, grid_w, grid_h, count):
+        key = (grid_w, grid_h, count)
+        found = self._layouts.get(key)
+        if found is None:
+            rng = random.Random(f"{self.seed}:{grid_w}x{grid_h}:{count}")
+            found = []
+            for _ in range(self.pool):
+                cells = generate_obstacles(rng, grid_w, grid_h, None, count=count)
+                found.append([y * grid_w + x for x, y in cells])
+            self._layouts[key] = found
+        return found
+
+    def prewarm(self, grid_w, grid_h, max_level=15):
+        for level in range(1, max_level + 1):
+            self.layouts(grid_w, grid_h, obstacle_count(level))
+
+    def get(self, rng, grid_w, grid_h, level, avoid_positions=None, occupied=None):
+        """Layout para o level, evitando cobra (occupied) e avoid_positions.
+
+        Os layouts do cache foram validados sem cobra: com ela no tabuleiro
+        cada célula passa de novo pelo keeps_connected (quase sempre só o
+        teste local) e as que sobrarem são completadas.
+        """
+        layout = rng.choice(self.layouts(grid_w, grid_h, obstacle_count(level)))
+        avoid = {y * grid_w + x for x, y in (avoid_positions or ())}
+        kept = [c for c in layout if c not in avoid]
+        return generate_obstacles(rng, grid_w, grid_h, level, avoid_positions, occupied, start=kept)
+
+
+LAYOUTS = LayoutCache()
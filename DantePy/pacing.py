@@ -0,0 +1,128 @@
+"""Ritmo dos frames nos menus e telas paradas.
+
+Os menus rodavam a RENDER_FPS o tempo todo, redesenhando tudo mesmo sem
+ninguém no teclado. Com o FramePacer o loop de um menu fica assim:
+
+    for evento in pacer.events(animated=True):   # dorme em pygame.event.wait
+        ...
+    if pacer.due((selected, pacer.frame_time(t))):
+        desenhar(); pygame.display.update()
+
+events() dorme até o próximo frame ou até chegar um evento (o que vier
+antes), então uma tecla acorda o loop na hora. due() só deixa desenhar quando
+a chave de animação muda: telas sem animação (animated=False) só desenham
+quando algo muda e acordam a cada static_timeout_ms; telas animadas usam
+active_fps logo depois de um input e caem para idle_fps depois de
+idle_after_ms sem input (frame_time() arredonda o tempo para o ritmo atual,
+então a animação continua, só que em menos passos).
+
+Para cada modo ("active", "idle", "static") o pacer soma o tempo de parede,
+o tempo de CPU do processo e os frames desenhados; report() devolve CPU
+(ms por segundo) e fps de cada um.
+"""
+import time
+
+import pygame
+
+ACTIVE = "active"
+IDLE = "idle"
+STATIC = "static"
+MODES = (ACTIVE, IDLE, STATIC)
+
+_INPUT_EVENTS = {pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION,
+                 pygame.MOUSEWHEEL, pygame.JOYBUTTONDOWN, pygame.JOYAXISMOTION}
+# a janela voltou a aparecer: o conteúdo precisa ser redesenhado
+_REDRAW_EVENTS = {pygame.VIDEOEXPOSE, getattr(pygame, "WINDOWEXPOSED", pygame.VIDEOEXPOSE)}
+
+
+class FramePacer:
+    def __init__(self, active_fps=60, idle_fps=8, idle_after_ms=5000, static_timeout_ms=1000):
+        self.active_fps = active_fps
+        self.idle_fps = idle_fps
+        self.idle_after_ms = idle_after_ms
+        self.static_timeout_ms = static_timeout_ms
+        self.mode = ACTIVE
+        self._last_input = time.perf_counter()
+        self._next_frame = 0.0
+        self._key = None
+        self._dirty = True
+        self._mark_wall = time.perf_counter()
+        self._mark_cpu = time.process_time()
+        self.wall = dict.fromkeys(MODES, 0.0)
+        self.cpu = dict.fromkeys(MODES, 0.0)
+        self.frames = dict.fromkeys(MODES, 0)
+
+    def fps(self):
+        return self.active_fps if self.mode == ACTIVE else self.idle_fps
+
+    def _account(self):
+        # o intervalo desde a última chamada conta para o modo que valia nele
+        wall, cpu = time.perf_counter(), time.process_time()
+        self.wall[self.mode] += wall - self._mark_wall
+        self.cpu[self.mode] += cpu - self._mark_cpu
+        self._mark_wall, self._mark_cpu = wall, cpu
+
+    def events(self, animated=True, timeout_ms=None):
+        """Espera o próximo frame (ou um evento) e devolve os eventos pendentes.
+
+        timeout_ms limita a espera (ex.: tela com prazo, como o auto-retry).
+        """
+        self._account()
+        now = time.perf_counter()
+        if not animated:
+            self.mode = STATIC
+            wait_ms = self.static_timeout_ms
+        else:
+            idle = (now - self._last_input) * 1000 >= self.idle_after_ms
+            self.mode = IDLE if idle else ACTIVE
+            wait_ms = max(0.0, (self._next_frame - now) * 1000)
+        if timeout_ms is not None:
+            wait_ms = min(wait_ms, timeout_ms)
+
+        eventos = pygame.event.get()
+        if not eventos and wait_ms >= 1:
+            ev = pygame.event.wait(int(wait_ms))
+            if ev.type != pygame.NOEVENT:
+                eventos = [ev] + pygame.event.get()
+        for ev in eventos:
+            if ev.type in _INPUT_EVENTS:
+                # volta para o ritmo cheio já neste frame
+                self._last_input = time.perf_counter()
+                if self.mode == IDLE:
+                    self.mode = ACTIVE
+                self._next_frame = 0.0
+            elif ev.type in _REDRAW_EVENTS:
+                self._dirty = True
+        return eventos
+
+    def frame_time(self, t):
+        """t (s) arredondado para o ritmo atual: a chave de animação só muda a cada frame."""
+        fps = self.fps()
+        return int(t * fps) / fps
+
+    def due(self, key):
+        """True se a tela precisa ser desenhada agora (chave mudou ou janela pediu redraw)."""
+        if key == self._key and not self._dirty:
+            return False
+        self._key = key
+        self._dirty = False
+        self.frames[self.mode] += 1
+        self._next_frame = time.perf_counter() + 1 / self.fps()
+        return True
+
+    def invalidate(self):
+        """Força o próximo due() (ex.: voltando de outra tela que desenhou por cima)."""
+        self._dirty = True
+
+    def report(self):
+        """{modo: {"wall_s", "cpu_ms_per_s", "fps"}} desde a criação."""
+        self._account()
+        out = {}
+        for mode in MODES:
+            wall = self.wall[mode]
+            out[mode] = {
+                "wall_s": wall,
+                "cpu_ms_per_s": self.cpu[mode] / wall * 1000 if wall else 0.0,
+                "fps": self.frames[mode] / wall if wall else 0.0,
+            }
+        return out
@@ -0,0 +1,175 @@
+"""Partículas: pool de capacidade fixa em arrays paralelos (struct-of-arrays).
+
+O ParticlePool atualiza posição e idade de todas as partículas numa passada
+numpy e desenha com um único Surface.blits() a partir de um atlas de círculos
+pré-renderizados (por cor, raio e nível de fade). Sem numpy, make_particles()
+devolve o ParticleList, que usa a classe Particle de antes.
+"""
+import math
+import random
+
+import pygame
+
+from profiler import count_surface
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MAX_RADIUS = 3
+FADE_LEVELS = 16
+
+
+# Partículas para efeito ao comer (uma Surface por partícula por frame)
+class Particle:
+    def __init__(self, pos, color):
+        self.x, self.y = pos
+        ang = random.uniform(0, math.tau)
+        speed = random.uniform(1, 4)
+        self.vx = math.cos(ang) * speed
+        self.vy = math.sin(ang) * speed
+        self.life = random.uniform(400, 900)
+        self.age = 0
+        self.color = color
+
+    def update(self, dt):
+        self.age += dt
+        self.x += self.vx * dt/16
+        self.y += self.vy * dt/16
+
+    def draw(self, surf):
+        t = max(0, 1 - self.age / self.life)
+        if t <= 0: return
+        alpha = int(255 * t)
+        r = max(1, int(3 * t))
+        s = pygame.Surface((r*2, r*2), pygame.SRCALPHA)
+        count_surface()
+        pygame.draw.circle(s, (*self.color, alpha), (r, r), r)
+        return surf.blit(s, (int(self.x - r), int(self.y - r)))
+
+
+class ParticleList:
+    """Mesma interface do ParticlePool, usando objetos Particle (sem numpy)."""
+
+    def __init__(self, capacity=4096):
+        self.capacity = capacity
+        self.items = []
+
+    def __len__(self):
+        return len(self.items)
+
+    def emit(self, pos, color, n=18):
+        n = min(n, self.capacity - len(self.items))
+        self.items.extend(Particle(pos, color) for _ in range(n))
+
+    def update(self, dt):
+        for p in self.items:
+            p.update(dt)
+        self.items = [p for p in self.items if p.age < p.life]
+
+    def draw(self, surf):
+        return [r for r in (p.draw(surf) for p in self.items) if r]
+
+    def clear(self):
+        self.items = []
+
+
+class ParticlePool:
+    def __init__(self, capacity=4096, seed=None):
+        self.capacity = capacity
+        self.count = 0
+        self.rng = np.random.default_rng(seed)
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.age = np.zeros(capacity, dtype=np.float32)
+        self.life = np.ones(capacity, dtype=np.float32)
+        self.color = np.zeros(capacity, dtype=np.int32)
+        self._t = np.zeros(capacity, dtype=np.float32)
+        self._palette = []
+        self._atlas = []
+
+    def __len__(self):
+        return self.count
+
+    def _color_index(self, color):
+        color = tuple(color)
+        if color not in self._palette:
+            self._palette.append(color)
+            self._atlas.append(self._bake(color))
+        return self._palette.index(color)
+
+    @staticmethod
+    def _bake(color):
+        # atlas[raio][fade] -> círculo pré-renderizado
+        atlas = [None]
+        for r in range(1, MAX_RADIUS + 1):
+            row = []
+            for level in range(FADE_LEVELS):
+                s = pygame.Surface((r*2, r*2), pygame.SRCALPHA)
+                count_surface()
+                alpha = int(255 * (level + 1) / FADE_LEVELS)
+                pygame.draw.circle(s, (*color, alpha), (r, r), r)
+                row.append(s)
+            atlas.append(row)
+        return atlas
+
+    def emit(self, pos, color, n=18):
+        n = min(n, self.capacity - self.count)
+        if n <= 0:
+            return
+        a, b = self.count, self.count + n
+        ang = self.rng.uniform(0, math.tau, n)
+        speed = self.rng.uniform(1, 4, n)
+        self.x[a:b] = pos[0]
+        self.y[a:b] = pos[1]
+        self.vx[a:b] = np.cos(ang) * speed
+        self.vy[a:b] = np.sin(ang) * speed
+        self.life[a:b] = self.rng.uniform(400, 900, n)
+        self.age[a:b] = 0
+        self.color[a:b] = self._color_index(color)
+        self.count = b
+
+    def update(self, dt):
+        n = self.count
+        if not n:
+            return
+        self.age[:n] += dt
+        self.x[:n] += self.vx[:n] * (dt / 16)
+        self.y[:n] += self.vy[:n] * (dt / 16)
+        vivas = self.age[:n] < self.life[:n]
+        if not vivas.all():
+            # compacta as vivas no início dos arrays
+            keep = np.flatnonzero(vivas)
+            m = keep.size
+            for arr in (self.x, self.y, self.vx, self.vy, self.age, self.life, self.color):
+                arr[:m] = arr[keep]
+            self.count = m
+
+    def draw(self, surf):
+        """Desenha tudo com um Surface.blits(); retorna os retângulos desenhados."""
+        n = self.count
+        if not n:
+            return []
+        t = self._t[:n]
+        np.divide(self.age[:n], self.life[:n], out=t)
+        np.subtract(1, t, out=t)
+        radius = np.maximum(1, (MAX_RADIUS * t).astype(np.int32))
+        level = np.minimum(FADE_LEVELS - 1, (t * FADE_LEVELS).astype(np.int32))
+        px = (self.x[:n] - radius).astype(np.int32)
+        py = (self.y[:n] - radius).astype(np.int32)
+        atlas = self._atlas
+        seq = [(atlas[c][r][f], (x, y)) for c, r, f, x, y in
+               zip(self.color[:n].tolist(), radius.tolist(), level.tolist(), px.tolist(), py.tolist())]
+        return surf.blits(seq)
+
+    def clear(self):
+        self.count = 0
+
+
+def make_particles(capacity=4096):
+    if np is None:
+        return ParticleList(capacity)
+    return ParticlePool(capacity)
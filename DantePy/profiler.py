@@ -0,0 +1,173 @@
+"""Perfil por fase do frame (eventos, lógica, cena, ..., display.update).
+
+O loop chama begin_frame(), mark(fase) ao terminar cada fase e end_frame().
+mark() só lê o relógio e guarda a diferença desde a marca anterior; a mesma
+fase pode ser marcada mais de uma vez no frame (os tempos somam). Tudo vai
+para buffers circulares de tamanho fixo (array), então medir não aloca nada.
+
+Desligado, o loop usa NULL_PROFILER, cujos métodos não fazem nada.
+
+O profiler também mostra quantas superfícies novas cada frame criou, para
+achar temporárias criadas por frame. Quem cria superfícies no jogo
+(compositor, textcache, snakerender, partículas, cenas, lowres, worldview,
+fade/comida/painéis do snake.py) chama count_surface() no ponto da criação;
+o profiler só lê o contador no começo e no fim do frame, sem mexer no
+pygame. Superfície criada fora desses pontos não entra na conta: código
+novo que aloca durante a partida deve contar também. Uma superfície pronta
+conta uma vez, mesmo que tenha passado por convert().
+"""
+import time
+from array import array
+
+PHASES = ("events", "logic", "scene", "obstacles", "food", "snake",
+          "particles", "hud", "fade", "update")
+
+
+class NullProfiler:
+    enabled = False
+
+    def begin_frame(self):
+        pass
+
+    def mark(self, phase):
+        pass
+
+    def skip(self):
+        pass
+
+    def end_frame(self):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
+
+_surface_count = 0
+
+
+def count_surface(n=1):
+    """Registra `n` superfícies novas (chamar onde o jogo cria uma)."""
+    global _surface_count
+    _surface_count += n
+
+
+class FrameProfiler:
+    def __init__(self, phases=PHASES, size=600):
+        self.phases = tuple(phases)
+        self.size = size
+        self._index = {name: i for i, name in enumerate(self.phases)}
+        n = len(self.phases)
+        # por frame: tempo de cada fase (ms), início e total do frame, surfaces criadas
+        self.times = [array('d', bytes(8 * size)) for _ in range(n)]
+        self.frame_start = array('d', bytes(8 * size))
+        self.frame_ms = array('d', bytes(8 * size))
+        self.surfaces = array('l', bytes(array('l').itemsize * size))
+        # trechos na ordem em que aconteceram (para o trace): fase, início, duração
+        seg_size = size * n * 2
+        self.seg_phase = array('b', bytes(seg_size))
+        self.seg_start = array('d', bytes(8 * seg_size))
+        self.seg_ms = array('d', bytes(8 * seg_size))
+        self.seg_size = seg_size
+        self.frames = 0
+        self.segments = 0
+        self.enabled = False
+        self._cur = 0
+        self._last = 0.0
+        self._start = 0.0
+        self._surf0 = 0
+        self.t0 = time.perf_counter()
+
+    # --- liga/desliga ---
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def toggle(self):
+        self.disable() if self.enabled else self.enable()
+        return self.enabled
+
+    def active(self):
+        """O profiler a usar neste frame: ele mesmo se ligado, senão NULL_PROFILER."""
+        return self if self.enabled else NULL_PROFILER
+
+    # --- medição ---
+
+    def begin_frame(self):
+        i = self._cur = self.frames % self.size
+        for col in self.times:
+            col[i] = 0.0
+        self._start = self._last = time.perf_counter()
+        self.frame_start[i] = (self._start - self.t0) * 1000
+        self._surf0 = _surface_count
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        ms = (now - self._last) * 1000
+        p = self._index[phase]
+        self.times[p][self._cur] += ms
+        s = self.segments % self.seg_size
+        self.seg_phase[s] = p
+        self.seg_start[s] = (self._last - self.t0) * 1000
+        self.seg_ms[s] = ms
+        self.segments += 1
+        self._last = now
+
+    def skip(self):
+        """Descarta o tempo desde a última marca (trecho que não é de nenhuma fase)."""
+        self._last = time.perf_counter()
+
+    def end_frame(self):
+        i = self._cur
+        self.frame_ms[i] = (time.perf_counter() - self._start) * 1000
+        self.surfaces[i] = _surface_count - self._surf0
+        self.frames += 1
+
+    # --- leitura ---
+
+    def _filled(self):
+        return min(self.frames, self.size)
+
+    def _order(self):
+        # índices do mais antigo para o mais novo
+        n = self._filled()
+        first = self.frames - n
+        return [(first + k) % self.size for k in range(n)]
+
+    @staticmethod
+    def _percentiles(values):
+        if not values:
+            return 0.0, 0.0
+        values = sorted(values)
+        n = len(values)
+        return values[n // 2], values[min(n - 1, int(n * 0.99))]
+
+    def summary(self):
+        """{fase: (p50, p99)} em ms nos últimos `size` frames, mais "frame" e "surfaces"."""
+        n = self._filled()
+        out = {name: self._percentiles(self.times[p][:n]) for name, p in self._index.items()}
+        out["frame"] = self._percentiles(self.frame_ms[:n])
+        out["surfaces"] = self._percentiles(self.surfaces[:n])
+        return out
+
+    def export_csv(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("frame,start_ms,frame_ms," + ",".join(self.phases) + ",surfaces\n")
+            first = self.frames - self._filled()
+            for k, i in enumerate(self._order()):
+                cols = ",".join(f"{col[i]:.4f}" for col in self.times)
+                f.write(f"{first + k},{self.frame_start[i]:.3f},{self.frame_ms[i]:.4f},{cols},{self.surfaces[i]}\n")
+
+    def export_trace(self, path):
+        """Trace no formato do chrome://tracing / Perfetto (eventos "X", tempos em µs)."""
+        import json
+        n = min(self.segments, self.seg_size)
+        first = self.segments - n
+        events = []
+        for k in range(n):
+            s = (first + k) % self.seg_size
+            events.append({"name": self.phases[self.seg_phase[s]], "ph": "X", "pid": 1, "tid": 1,
+                           "ts": round(self.seg_start[s] * 1000, 1), "dur": round(self.seg_ms[s] * 1000, 1)})
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
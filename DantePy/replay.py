@@ -0,0 +1,317 @@
+"""Replays binários compactos de uma partida do SnakeEngine.
+
+Formato (inteiros em varint LEB128):
+
+    b"SNKR" versão
+    semente, nome da dificuldade (tamanho + utf-8), grid_w, grid_h,
+    start_delay, semente e pool do LayoutCache, intervalo de keyframes
+    registros: varint(delta_ticks << 3 | tipo) [+ dados]
+        tipo 0-3  input: índice em DIRECTIONS aplicado no passo `tick`
+        tipo 4    keyframe: tamanho + estado completo do motor no `tick`
+        tipo 5    fim: score, evento final ("dead"/"full")
+
+Com a semente e os inputs a partida se repete exatamente; os keyframes
+deixam pular para qualquer tick sem simular desde o começo. O keyframe
+guarda também a ordem da lista de células livres (o sorteio da comida
+depende dela). Arquivos da versão 1 não tinham essa ordem: eles ainda são
+lidos, mas sem keyframes (seek simula desde o começo).
+"""
+import struct
+import sys
+from array import array
+
+from engine import SnakeEngine, DIRECTIONS
+from obstacles import LayoutCache, LAYOUTS
+
+MAGIC = b"SNKR"
+VERSION = 2
+# versões que ainda dá para ler; da 1 os keyframes são descartados
+READABLE_VERSIONS = (1, 2)
+KIND_KEYFRAME = 4
+KIND_END = 5
+END_EVENTS = ("dead", "full")
+
+
+def write_varint(buf, n):
+    while n >= 0x80:
+        buf.append((n & 0x7F) | 0x80)
+        n >>= 7
+    buf.append(n)
+
+
+def read_varint(data, pos):
+    n = shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, pos
+        shift += 7
+
+
+def _dir_between(a, b, grid_w, grid_h):
+    dx = (b[0] - a[0]) % grid_w
+    dy = (b[1] - a[1]) % grid_h
+    dx = -1 if dx == grid_w - 1 else dx
+    dy = -1 if dy == grid_h - 1 else dy
+    return DIRECTIONS.index((dx, dy))
+
+
+def encode_state(engine):
+    """Estado completo do motor (inclusive o RNG) em bytes."""
+    w, h = engine.grid_w, engine.grid_h
+    buf = bytearray()
+    for n in (engine.ticks, engine.score, engine.level, engine.move_delay,
+              DIRECTIONS.index(engine.direcao)):
+        write_varint(buf, n)
+    comida = engine.comida
+    write_varint(buf, 0 if comida is None else comida[1] * w + comida[0] + 1)
+    write_varint(buf, len(engine.obstacles))
+    for x, y in engine.obstacles:
+        write_varint(buf, y * w + x)
+    # corpo: célula da cabeça + 2 bits por segmento (direção até o próximo)
+    cobra = engine.cobra
+    write_varint(buf, len(cobra))
+    write_varint(buf, cobra[0][1] * w + cobra[0][0])
+    packed = bytearray((len(cobra) + 2) // 4)
+    prev = cobra[0]
+    for i, seg in enumerate(cobra):
+        if i:
+            packed[(i - 1) // 4] |= _dir_between(prev, seg, w, h) << (2 * ((i - 1) % 4))
+            prev = seg
+    buf += packed
+    version, internal, gauss = engine.rng.getstate()
+    write_varint(buf, version)
+    write_varint(buf, internal[-1])
+    buf += array('I', internal[:-1]).tobytes()
+    if gauss is None:
+        buf.append(0)
+    else:
+        buf.append(1)
+        buf += struct.pack('<d', gauss)
+    # células livres na ordem da lista do FreeCells
+    cells = engine.free.cells
+    write_varint(buf, len(cells))
+    for c in cells:
+        write_varint(buf, c)
+    return bytes(buf)
+
+
+def decode_state(engine, data):
+    w, h = engine.grid_w, engine.grid_h
+    pos = 0
+    vals = []
+    for _ in range(5):
+        n, pos = read_varint(data, pos)
+        vals.append(n)
+    ticks, score, level, move_delay, d = vals
+    c, pos = read_varint(data, pos)
+    comida = None if c == 0 else ((c - 1) % w, (c - 1) // w)
+    n, pos = read_varint(data, pos)
+    obstacles = []
+    for _ in range(n):
+        c, pos = read_varint(data, pos)
+        obstacles.append((c % w, c // w))
+    length, pos = read_varint(data, pos)
+    c, pos = read_varint(data, pos)
+    cobra = [(c % w, c // w)]
+    nbytes = (length + 2) // 4
+    packed = data[pos:pos + nbytes]
+    pos += nbytes
+    for i in range(length - 1):
+        dx, dy = DIRECTIONS[(packed[i // 4] >> (2 * (i % 4))) & 3]
+        x, y = cobra[-1]
+        cobra.append(((x + dx) % w, (y + dy) % h))
+    version, pos = read_varint(data, pos)
+    index, pos = read_varint(data, pos)
+    internal = array('I')
+    internal.frombytes(data[pos:pos + 624 * 4])
+    pos += 624 * 4
+    gauss = None
+    if data[pos]:
+        gauss = struct.unpack_from('<d', data, pos + 1)[0]
+        pos += 8
+    pos += 1
+    n, pos = read_varint(data, pos)
+    free = []
+    for _ in range(n):
+        c, pos = read_varint(data, pos)
+        free.append(c)
+    engine.load(cobra, DIRECTIONS[d], comida, obstacles, score, level, move_delay, ticks, free)
+    engine.rng.setstate((version, tuple(internal) + (index,), gauss))
+    return engine
+
+
+class ReplayWriter:
+    """Grava a partida enquanto ela acontece; os bytes vão para o disco em blocos."""
+
+    def __init__(self, path, engine, difficulty="", keyframe_every=600, buffer_size=4096):
+        layouts = engine.layouts
+        self.path = path
+        self.keyframe_every = keyframe_every
+        self.buffer_size = buffer_size
+        self._f = open(path, 'wb')
+        self._buf = bytearray(MAGIC)
+        self._buf.append(VERSION)
+        write_varint(self._buf, engine.seed)
+        name = difficulty.encode('utf-8')
+        write_varint(self._buf, len(name))
+        self._buf += name
+        for n in (engine.grid_w, engine.grid_h, engine.start_delay, layouts.seed, layouts.pool, keyframe_every):
+            write_varint(self._buf, n)
+        self._last_tick = 0
+        self.closed = False
+        # cabeçalho já no disco: partida interrompida ainda vira um replay legível
+        self.flush()
+
+    def _record(self, tick, kind):
+        write_varint(self._buf, (tick - self._last_tick) << 3 | kind)
+        self._last_tick = tick
+
+    def record_input(self, tick, direcao):
+        """Chamar antes de engine.step(direcao), com tick = engine.ticks."""
+        self._record(tick, DIRECTIONS.index(direcao))
+        if len(self._buf) >= self.buffer_size:
+            self.flush()
+
+    def after_step(self, engine, evento):
+        """Chamar depois de cada engine.step(); grava keyframes e o fim da partida."""
+        if evento in END_EVENTS:
+            self._record(engine.ticks, KIND_END)
+            write_varint(self._buf, engine.score)
+            self._buf.append(END_EVENTS.index(evento))
+            self.close()
+        elif engine.ticks % self.keyframe_every == 0:
+            state = encode_state(engine)
+            self._record(engine.ticks, KIND_KEYFRAME)
+            write_varint(self._buf, len(state))
+            self._buf += state
+            self.flush()
+
+    def flush(self):
+        if self._buf:
+            self._f.write(self._buf)
+            # até o sistema: uma queda do processo não perde o que já foi gravado
+            self._f.flush()
+            self._buf = bytearray()
+
+    def close(self):
+        if not self.closed:
+            self.flush()
+            self._f.close()
+            self.closed = True
+
+
+class ReplayReader:
+    def __init__(self, data):
+        if isinstance(data, str):
+            with open(data, 'rb') as f:
+                data = f.read()
+        if data[:4] != MAGIC:
+            raise ValueError("arquivo não é um replay (assinatura errada)")
+        if data[4] not in READABLE_VERSIONS:
+            raise ValueError(f"versão de replay não suportada: {data[4]}")
+        self.version = data[4]
+        pos = 5
+        self.seed, pos = read_varint(data, pos)
+        n, pos = read_varint(data, pos)
+        self.difficulty = data[pos:pos + n].decode('utf-8')
+        pos += n
+        vals = []
+        for _ in range(6):
+            v, pos = read_varint(data, pos)
+            vals.append(v)
+        self.grid_w, self.grid_h, self.start_delay, layout_seed, layout_pool, self.keyframe_every = vals
+        if (layout_seed, layout_pool) == (LAYOUTS.seed, LAYOUTS.pool):
+            self.layouts = LAYOUTS
+        else:
+            self.layouts = LayoutCache(layout_seed, layout_pool)
+
+        self.inputs = {}
+        self.keyframes = []  # (tick, bytes)
+        self.final_score = None
+        self.final_event = None
+        self.end_tick = None
+        tick = 0
+        while pos < len(data):
+            try:
+                v, pos = read_varint(data, pos)
+                tick += v >> 3
+                kind = v & 7
+                if kind < 4:
+                    self.inputs[tick] = DIRECTIONS[kind]
+                elif kind == KIND_KEYFRAME:
+                    n, pos = read_varint(data, pos)
+                    if pos + n > len(data):
+                        break
+                    if self.version == VERSION:
+                        self.keyframes.append((tick, data[pos:pos + n]))
+                    pos += n
+                elif kind == KIND_END:
+                    self.final_score, pos = read_varint(data, pos)
+                    self.final_event = END_EVENTS[data[pos]]
+                    pos += 1
+                    self.end_tick = tick
+                    break
+                else:
+                    raise ValueError(f"registro desconhecido: {kind}")
+            except IndexError:
+                break  # arquivo cortado (partida interrompida): usa o que deu para ler
+        # sem registro de fim, a partida só é conhecida até o último registro lido
+        self.last_tick = tick
+
+    def new_engine(self):
+        return SnakeEngine(self.grid_w, self.grid_h, self.start_delay, seed=self.seed, layouts=self.layouts)
+
+    def seek(self, tick, engine=None):
+        """Motor no estado do começo do passo `tick`, partindo do keyframe mais próximo."""
+        engine = engine or self.new_engine()
+        start = None
+        for kf_tick, state in self.keyframes:
+            if kf_tick > tick:
+                break
+            start = state
+        if start is not None:
+            decode_state(engine, start)
+        else:
+            engine.reset(self.seed)
+        return self.run(engine, tick)
+
+    def run(self, engine=None, until=None):
+        """Simula na velocidade máxima até `until` (ou até o fim gravado)."""
+        engine = engine or self.new_engine()
+        if until is None:
+            until = self.end_tick if self.end_tick is not None else self.last_tick
+        inputs = self.inputs
+        step = engine.step
+        while engine.alive and engine.ticks < until:
+            step(inputs.get(engine.ticks))
+        return engine
+
+    def verify(self):
+        """Refaz a partida do zero e confere score e tick do fim com o que foi gravado."""
+        if self.end_tick is None:
+            return False
+        engine = self.run(self.new_engine(), self.end_tick + 1)
+        return not engine.alive and engine.ticks == self.end_tick and engine.score == self.final_score
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 2 or argv[0] not in ("info", "verify"):
+        print("uso: python replay.py info|verify ARQUIVO")
+        return 2
+    rep = ReplayReader(argv[1])
+    if argv[0] == "info":
+        print(f"dificuldade: {rep.difficulty}  grid: {rep.grid_w}x{rep.grid_h}  semente: {rep.seed}")
+        print(f"inputs: {len(rep.inputs)}  keyframes: {len(rep.keyframes)}  "
+              f"fim: tick {rep.end_tick}, score {rep.final_score} ({rep.final_event})")
+        return 0
+    ok = rep.verify()
+    print("OK" if ok else "FALHOU")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
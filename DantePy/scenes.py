@@ -0,0 +1,171 @@
+"""Cenas (temas) como dados: cor de fundo + camadas de decoração animada.
+
+Cada DecoLayer descreve `count` elementos iguais (estrelas, folhas, brasas)
+que andam em x com velocidade constante e balançam em y com uma senoide.
+Na primeira vez que a camada é desenhada num tamanho de tela, prepare()
+calcula tudo o que não depende do tempo: posição inicial de cada elemento,
+uma tabela com um período da senoide (60 amostras por segundo) e o deslocamento
+de cada elemento nela, e um sprite pré-renderizado por cor. No frame só sobra
+somar o deslocamento em x, indexar a tabela e um Surface.blits() por camada,
+sem math.sin e sem desenhar formas. Com numpy (e camadas com muitos
+elementos) as posições saem vetorizadas.
+
+Adicionar decoração mais densa (centenas de estrelas, parallax) é só mais
+uma DecoLayer na lista da cena.
+"""
+import math
+
+import pygame
+
+from profiler import count_surface
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+TABLE_FPS = 60
+_KEY = (255, 0, 255)
+# abaixo disso o overhead do numpy passa do ganho
+NUMPY_MIN = 64
+
+
+class DecoLayer:
+    """Elemento i: x = i*x_step + t*speed, y = y_start + i*y_step + amp*sin(freq*t + i*phase_step).
+
+    shape "circle" (size = raio, posição = centro) ou "ellipse" (size = (w, h),
+    posição = canto). colors[0] vai nos elementos com i % color_every == 0.
+    abs_wobble usa |sin|; trunc arredonda o balanço para inteiro antes de somar
+    (o y pode passar da tela e dar a volta); from_bottom mede y a partir do pé
+    da tela.
+    """
+
+    def __init__(self, count, shape, size, colors, color_every=1, x_step=0, speed=0.0,
+                 y_start=0, y_step=0, amp=0.0, freq=1.0, phase_step=0.0,
+                 abs_wobble=False, trunc=False, from_bottom=False):
+        self.count = count
+        self.shape = shape
+        self.size = size
+        self.colors = colors
+        self.color_every = color_every
+        self.x_step = x_step
+        self.speed = speed
+        self.y_start = y_start
+        self.y_step = y_step
+        self.amp = amp
+        self.freq = freq
+        self.phase_step = phase_step
+        self.abs_wobble = abs_wobble
+        self.trunc = trunc
+        self.from_bottom = from_bottom
+        self._prepared = {}
+
+    def _sprite(self, color):
+        # colorkey em vez de alpha por pixel: o blit sai ~2x mais barato
+        if self.shape == "ellipse":
+            w, h = self.size
+        else:
+            w = h = 2 * self.size + 1
+        surf = pygame.Surface((w, h))
+        count_surface()
+        surf.fill(_KEY)
+        if self.shape == "ellipse":
+            pygame.draw.ellipse(surf, color, (0, 0, w, h))
+        else:
+            pygame.draw.circle(surf, color, (self.size, self.size), self.size)
+        surf.set_colorkey(_KEY)
+        return surf.convert()
+
+    def prepare(self, width, height):
+        """Tabelas para uma tela width x height (feito uma vez por tamanho)."""
+        key = (width, height)
+        found = self._prepared.get(key)
+        if found is not None:
+            return found
+        n = self.count
+        # um período da senoide, amostrado a TABLE_FPS
+        period = max(1, round(2 * math.pi / self.freq * TABLE_FPS)) if self.freq else 1
+        table = []
+        for k in range(period):
+            s = math.sin(2 * math.pi * k / period)
+            s = abs(s) if self.abs_wobble else s
+            table.append(int(s * self.amp) if self.trunc else s * self.amp)
+        # fase de cada elemento vira deslocamento na tabela
+        offsets = [round(i * self.phase_step / self.freq * TABLE_FPS) % period if self.freq else 0
+                   for i in range(n)]
+        x0 = [(i * self.x_step) % width for i in range(n)]
+        base = [self.y_start + i * self.y_step for i in range(n)]
+        sprites = [self._sprite(c) for c in self.colors]
+        sprite_of = [sprites[0] if i % self.color_every == 0 else sprites[-1] for i in range(n)]
+        # do centro do círculo para o canto do sprite
+        corner = 0 if self.shape == "ellipse" else self.size
+        found = {
+            "period": period, "table": table, "offsets": offsets, "x0": x0, "base": base,
+            "sprites": sprite_of, "corner": corner, "width": width, "height": height,
+        }
+        if np is not None and n >= NUMPY_MIN:
+            found["np"] = (np.array(table, dtype=np.float64), np.array(offsets), np.array(x0),
+                           np.array(base, dtype=np.float64))
+        self._prepared[key] = found
+        return found
+
+    def positions(self, t, width, height):
+        """Canto de cada sprite no tempo t (lista de (x, y))."""
+        p = self.prepare(width, height)
+        k = int(t * TABLE_FPS)
+        dx = int(t * self.speed)
+        corner = p["corner"]
+        if "np" in p:
+            table, offsets, x0, base = p["np"]
+            xs = (x0 + dx) % width - corner
+            ys = base + table[(offsets + k) % p["period"]]
+            ys = height - ys if self.from_bottom else ys % height
+            return list(zip(xs.tolist(), (ys.astype(np.int64) - corner).tolist()))
+        period = p["period"]
+        table = p["table"]
+        out = []
+        for x, y, off in zip(p["x0"], p["base"], p["offsets"]):
+            y += table[(off + k) % period]
+            y = height - y if self.from_bottom else y % height
+            out.append(((x + dx) % width - corner, int(y) - corner))
+        return out
+
+    def draw(self, surf, t):
+        w, h = surf.get_size()
+        p = self.prepare(w, h)
+        return surf.blits(list(zip(p["sprites"], self.positions(t, w, h))))
+
+
+class Scene:
+    def __init__(self, name, bg, layers=()):
+        self.name = name
+        self.bg = bg
+        self.layers = list(layers)
+
+    def draw_deco(self, surf, t):
+        """Desenha a decoração animada; retorna os retângulos desenhados."""
+        rects = []
+        for layer in self.layers:
+            rects.extend(layer.draw(surf, t))
+        return rects
+
+    def draw(self, surf, t):
+        surf.fill(self.bg)
+        return self.draw_deco(surf, t)
+
+
+SCENES = [
+    Scene("stars", (12, 18, 30), [
+        DecoLayer(25, "circle", 1, ((200, 220, 255), (150, 180, 220)), color_every=7,
+                  x_step=47, speed=30, y_step=71, amp=20, freq=0.3, phase_step=0.3, trunc=True),
+    ]),
+    Scene("leaves", (8, 40, 20), [
+        DecoLayer(12, "ellipse", (6, 3), ((30, 100, 40),),
+                  x_step=120, speed=10, y_start=50, y_step=23, amp=20, freq=0.5, phase_step=1.0),
+    ]),
+    Scene("embers", (30, 12, 18), [
+        DecoLayer(20, "circle", 2, ((255, 140, 60), (200, 80, 40)), color_every=3,
+                  x_step=83, speed=50, y_start=10, y_step=3, amp=1, freq=0.8, phase_step=1.0,
+                  abs_wobble=True, from_bottom=True),
+    ]),
+]
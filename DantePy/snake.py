@@ -1,17 +1,24 @@
-import pygame
-import random
 import sys
 import math
 import os
-import wave
-import struct
+import time
 
-# Inicialização
-try:
-    pygame.init()
-except Exception:
-    print("Erro: falha ao inicializar pygame.")
-    sys.exit(1)
+_IMPORT_T0 = time.perf_counter()
+
+from timestep import FixedTimestep, InputQueue, LatencyStats
+from profiler import FrameProfiler, count_surface
+from engine import SnakeEngine, DIFFICULTIES, DEFAULT_DIFFICULTY, UP, DOWN, LEFT, RIGHT, clamp_dir
+from world import WORLD_PRESET, VIEW_W, VIEW_H, is_world
+
+# pygame e os módulos que dependem dele só são importados em init_runtime():
+# só o "import pygame" já custa ~250 ms, e janela/mixer têm efeitos colaterais
+pygame = None
+synth = None
+TEXT_CACHE = None
+Compositor = None
+make_particles = None
+SCENES = None
+FramePacer = None
 
 # Configurações da tela (pixel art)
 PIXEL = 20
@@ -19,15 +26,12 @@ GRID_W = 40  # largura em blocos
 GRID_H = 28  # altura em blocos
 LARGURA = GRID_W * PIXEL
 ALTURA = GRID_H * PIXEL
+# LOWRES: a partida desenha o playfield com LOWRES_CELL pixels por célula e
+# amplia tudo de uma vez para a janela (ver lowres.py); a janela fica redimensionável
+LOWRES = False
+LOWRES_CELL = 4
 
 tela = None
-try:
-    tela = pygame.display.set_mode((LARGURA, ALTURA))
-    pygame.display.set_caption("Snake Pixel Art - Melhorado")
-except Exception:
-    print("Erro: falha ao criar a janela do jogo. Verifique o display ou execute em ambiente com GUI.")
-    pygame.quit()
-    sys.exit(1)
 
 # Cores
 PRETO = (10, 10, 12)
@@ -37,36 +41,119 @@ VERMELHO = (255, 80, 80)
 BRANCO = (255, 255, 255)
 AMARELO = (255, 200, 50)
 
-clock = pygame.time.Clock()
+clock = None
 RENDER_FPS = 60
+# menus e telas paradas (ver pacing.py): sem input há MENU_IDLE_AFTER_MS a
+# animação do menu cai para MENU_IDLE_FPS; qualquer tecla volta para RENDER_FPS
+MENU_IDLE_FPS = 8
+MENU_IDLE_AFTER_MS = 5000
+MENU_PACER = None
+
+AUDIO_READY = False
+MUSIC = None
+SOUND_EAT = None
+SOUND_GAMEOVER = None
+
+# Teclas -> direção (preenchido em init_runtime)
+KEY_DIRS = {}
+
+# Tempo de cada fase da inicialização (ms)
+STARTUP_TIMES = {}
+REPORT_TIMINGS = False
+
+def _phase(name, t0):
+    t = time.perf_counter()
+    STARTUP_TIMES[name] = (t - t0) * 1000
+    return t
 
-# Inicializar áudio (tenta usar mixer)
-try:
-    pygame.mixer.init()
-    AUDIO_READY = True
-except Exception:
-    AUDIO_READY = False
+def init_runtime(headless=False):
+    """Sobe pygame, janela, mixer e sons na primeira chamada; depois não faz nada.
+
+    headless=True usa os drivers dummy do SDL (sem janela nem placa de som).
+    """
+    global pygame, synth, TEXT_CACHE, Compositor, make_particles, SCENES, FramePacer
+    global tela, clock, AUDIO_READY, MUSIC, SOUND_EAT, SOUND_GAMEOVER, MENU_PACER
+    if tela is not None:
+        return
+    if headless:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+    t = time.perf_counter()
+    import pygame
+    import synth
+    from textcache import TEXT_CACHE
+    from compositor import Compositor
+    from particles import make_particles
+    from scenes import SCENES
+    from pacing import FramePacer
+    t = _phase("import_pygame", t)
+
+    # Inicialização
+    try:
+        pygame.init()
+    except Exception:
+        print("Erro: falha ao inicializar pygame.")
+        sys.exit(1)
+    t = _phase("pygame_init", t)
+
+    try:
+        tela = pygame.display.set_mode((LARGURA, ALTURA), pygame.RESIZABLE if LOWRES else 0)
+        pygame.display.set_caption("Snake Pixel Art - Melhorado")
+    except Exception:
+        print("Erro: falha ao criar a janela do jogo. Verifique o display ou execute em ambiente com GUI.")
+        pygame.quit()
+        sys.exit(1)
+    clock = pygame.time.Clock()
+    MENU_PACER = FramePacer(RENDER_FPS, MENU_IDLE_FPS, MENU_IDLE_AFTER_MS)
+    t = _phase("display", t)
+
+    # Inicializar áudio (tenta usar mixer)
+    try:
+        pygame.mixer.init()
+        AUDIO_READY = True
+    except Exception:
+        AUDIO_READY = False
+    if AUDIO_READY:
+        # a thread da música já começa lendo as três faixas para a memória
+        from music import MusicManager
+        MUSIC = MusicManager([MENU_MUSIC_PATH, PLAY_MUSIC_PATH, OVER_MUSIC_PATH]).start()
+    t = _phase("mixer", t)
+
+    get_leaderboard()
+    t = _phase("leaderboard", t)
+
+    SOUND_EAT = load_sound('eat.wav', freq=880, duration_ms=120, volume=0.5)
+    SOUND_GAMEOVER = load_sound('gameover.wav', freq=150, duration_ms=700, volume=0.6)
+    t = _phase("sounds", t)
+
+    KEY_DIRS.update({
+        pygame.K_w: UP, pygame.K_UP: UP,
+        pygame.K_s: DOWN, pygame.K_DOWN: DOWN,
+        pygame.K_a: LEFT, pygame.K_LEFT: LEFT,
+        pygame.K_d: RIGHT, pygame.K_RIGHT: RIGHT,
+    })
+
+def startup_report():
+    linhas = ["Inicialização (ms):"]
+    for name, ms in STARTUP_TIMES.items():
+        linhas.append(f"  {name:18s} {ms:8.1f}")
+    if MUSIC is not None:
+        linhas.append(f"Música: {MUSIC.stats()}")
+    return "\n".join(linhas)
+
+def pacing_report():
+    linhas = ["Menus (CPU por modo):"]
+    for mode, r in MENU_PACER.report().items():
+        linhas.append(f"  {mode:7s} {r['wall_s']:8.1f} s  {r['cpu_ms_per_s']:7.1f} ms CPU/s  {r['fps']:5.1f} fps")
+    return "\n".join(linhas)
 
 # Função para gerar tons simples em WAV (salva em arquivo)
 def generate_tone(path, freq=440, duration_ms=200, volume=0.5, samplerate=44100):
-    n_samples = int(samplerate * (duration_ms / 1000.0))
-    amplitude = int(32767 * volume)
-    with wave.open(path, 'wb') as wf:
-        wf.setnchannels(1)
-        wf.setsampwidth(2)
-        wf.setframerate(samplerate)
-        for i in range(n_samples):
-            t = float(i) / samplerate
-            sample = amplitude * math.sin(2.0 * math.pi * freq * t)
-            wf.writeframes(struct.pack('<h', int(sample)))
-
-# Garantir pasta de sons
+    synth.write_wav(path, freq, duration_ms, volume, samplerate)
+
+# Pasta de sons (só leitura: nada é escrito aqui)
 SOUNDS_DIR = os.path.join(os.path.dirname(__file__), 'sounds')
-if not os.path.exists(SOUNDS_DIR):
-    try:
-        os.makedirs(SOUNDS_DIR)
-    except Exception:
-        pass
 
 # Paths para músicas (adicione seus arquivos aqui):
 # Coloque a música do MENU em: sounds/menu.mp3  (ou menu.wav)
@@ -76,73 +163,72 @@ PLAY_MUSIC_PATH = os.path.join(SOUNDS_DIR, 'jogatina.mp3')
 # Coloque a música de GAME OVER em: sounds/over.mp3  (ou over.wav)
 OVER_MUSIC_PATH = os.path.join(SOUNDS_DIR, 'gameover.mp3')
 
-# Gerar sons básicos se possível
-SOUND_EAT = None
-SOUND_GAMEOVER = None
-if AUDIO_READY:
-    eat_path = os.path.join(SOUNDS_DIR, 'eat.wav')
-    over_path = os.path.join(SOUNDS_DIR, 'gameover.wav')
-    if not os.path.exists(eat_path):
-        generate_tone(eat_path, freq=880, duration_ms=120, volume=0.5)
-    if not os.path.exists(over_path):
-        generate_tone(over_path, freq=150, duration_ms=700, volume=0.6)
+# Sons básicos: usa o WAV da pasta sounds/ se existir, senão gera o tom em memória
+def load_sound(filename, freq, duration_ms, volume):
+    if not AUDIO_READY:
+        return None
     try:
-        SOUND_EAT = pygame.mixer.Sound(eat_path)
-        SOUND_GAMEOVER = pygame.mixer.Sound(over_path)
+        path = os.path.join(SOUNDS_DIR, filename)
+        if os.path.exists(path):
+            return pygame.mixer.Sound(path)
+        return synth.tone(freq, duration_ms, volume)
     except Exception:
-        SOUND_EAT = None
-        SOUND_GAMEOVER = None
-    # fallback: se não houver arquivos de música o gerador simples de tom será usado quando necessário
-    # (não o tocamos automaticamente aqui)
+        return None
 
 # Funções auxiliares globais para tocar/parar música (seguras se mixer não estiver pronto)
+# A troca de faixa é feita pela thread do MusicManager; aqui só enfileira o pedido.
 def play_music_file(path, loops=-1):
-    if not AUDIO_READY:
+    if not AUDIO_READY or MUSIC is None:
         return False
-    try:
-        if os.path.exists(path):
-            pygame.mixer.music.load(path)
-            pygame.mixer.music.set_volume(0.45)
-            pygame.mixer.music.play(loops)
-            return True
-    except Exception:
-        pass
-    return False
+    for falta in MUSIC.pop_missing():
+        print(f"Música não encontrada: {falta}")
+    return MUSIC.play(path, loops)
 
 def stop_music():
-    if not AUDIO_READY:
+    if not AUDIO_READY or MUSIC is None:
         return
-    try:
-        pygame.mixer.music.stop()
-    except Exception:
-        pass
-
-# Fonte
-fonte = pygame.font.SysFont("arial", 24)
+    MUSIC.stop()
 
+# Fontes e textos (fontes por (nome, tamanho) e superfícies ficam no TEXT_CACHE)
 # Helper para texto pixelado (render pequeno e escala)
 def render_pixel_text(text, small_size=14, scale=3, color=BRANCO):
-    small_font = pygame.font.SysFont("arial", small_size)
-    surf = small_font.render(text, True, color)
-    w, h = surf.get_size()
-    surf = pygame.transform.scale(surf, (w*scale, h*scale))
-    return surf
+    return TEXT_CACHE.render(text, "arial", small_size, scale, color)
 
-# Highscore utilities
+# Texto normal do jogo (arial 24)
+def render_text(text, color=BRANCO):
+    return TEXT_CACHE.render(text, "arial", 24, 1, color)
+
+# Highscore utilities: placar top-N por dificuldade (leaderboard.py).
+# O highscore.txt antigo é migrado para o log na primeira execução.
 HIGHSCORE_FILE = os.path.join(os.path.dirname(__file__), 'highscore.txt')
-def get_highscore():
+LEADERBOARD_FILE = os.path.join(os.path.dirname(__file__), 'leaderboard.log')
+LEADERBOARD = None
+
+def get_leaderboard():
+    """Cria o placar na primeira chamada (o init_runtime já chama, para a leitura do log
+    começar na partida, numa thread, e não no primeiro game over)."""
+    global LEADERBOARD
+    if LEADERBOARD is None:
+        import atexit
+        from leaderboard import Leaderboard
+        LEADERBOARD = Leaderboard(LEADERBOARD_FILE, top_n=10, legacy_path=HIGHSCORE_FILE,
+                                  legacy_difficulty=DEFAULT_DIFFICULTY[0])
+        # grava o que ainda estiver na fila antes de o processo sair
+        atexit.register(LEADERBOARD.flush)
+    return LEADERBOARD
+
+def current_difficulty_name():
+    return globals().get('CURRENT_DIFFICULTY', DEFAULT_DIFFICULTY)[0]
+
+def get_highscore(difficulty=None):
     try:
-        with open(HIGHSCORE_FILE, 'r') as f:
-            return int(f.read().strip())
+        return get_leaderboard().best(difficulty)
     except Exception:
         return 0
 
-def save_highscore(score):
+def save_highscore(score, difficulty=None):
     try:
-        cur = get_highscore()
-        if score > cur:
-            with open(HIGHSCORE_FILE, 'w') as f:
-                f.write(str(score))
+        get_leaderboard().submit(difficulty or current_difficulty_name(), score)
     except Exception:
         pass
 
@@ -154,90 +240,78 @@ def lerp_color(c1, c2, t):
     return (int(lerp(c1[0], c2[0], t)), int(lerp(c1[1], c2[1], t)), int(lerp(c1[2], c2[2], t)))
 
 def desenhar_bloco(cor, x, y, size=PIXEL):
-    pygame.draw.rect(tela, cor, (int(x), int(y), int(size), int(size)))
-
-# Partículas para efeito ao comer
-class Particle:
-    def __init__(self, pos, color):
-        self.x, self.y = pos
-        ang = random.uniform(0, math.tau)
-        speed = random.uniform(1, 4)
-        self.vx = math.cos(ang) * speed
-        self.vy = math.sin(ang) * speed
-        self.life = random.uniform(400, 900)
-        self.age = 0
-        self.color = color
-
-    def update(self, dt):
-        self.age += dt
-        self.x += self.vx * dt/16
-        self.y += self.vy * dt/16
-
-    def draw(self, surf):
-        t = max(0, 1 - self.age / self.life)
-        if t <= 0: return
-        alpha = int(255 * t)
-        r = max(1, int(3 * t))
-        s = pygame.Surface((r*2, r*2), pygame.SRCALPHA)
-        pygame.draw.circle(s, (*self.color, alpha), (r, r), r)
-        surf.blit(s, (int(self.x - r), int(self.y - r)))
-
-# Cenas (temas) e decoração animada simples
-SCENES = [
-    {"bg": (12, 18, 30), "deco": "stars"},
-    {"bg": (8, 40, 20), "deco": "leaves"},
-    {"bg": (30, 12, 18), "deco": "embers"}
-]
+    return pygame.draw.rect(tela, cor, (int(x), int(y), int(size), int(size)))
 
+# Cenas (temas) e decoração animada: dados e tabelas em scenes.py
 def draw_scene(scene, t):
-    bg = scene["bg"]
-    tela.fill(bg)
-    deco = scene["deco"]
-    if deco == "stars":
-        for i in range(25):
-            x = (i * 47 + int(t*30)) % LARGURA
-            y = (i * 71 + int(math.sin((i+t)*0.3)*20)) % ALTURA
-            c = (200, 220, 255) if (i%7==0) else (150, 180, 220)
-            pygame.draw.circle(tela, c, (x, y), 1)
-    elif deco == "leaves":
-        for i in range(12):
-            x = (i * 120 + int(t*10)) % LARGURA
-            y = (50 + (i*23) + (math.sin(t*0.5 + i)*20)) % ALTURA
-            pygame.draw.ellipse(tela, (30, 100, 40), (x, y, 6, 3))
-    elif deco == "embers":
-        for i in range(20):
-            x = (i * 83 + int(t*50)) % LARGURA
-            y = ALTURA - (10 + (i*3) + abs(math.sin(t*0.8 + i)))
-            c = (255, 140, 60) if i%3==0 else (200, 80, 40)
-            pygame.draw.circle(tela, c, (x, int(y)), 2)
-
-
-def generate_obstacles(level, avoid_positions=None):
-    """Gera obstáculos com base no level; retorna lista de posições (alinhadas ao grid)."""
-    avoid_positions = avoid_positions or []
-    obstacles = []
-    # número de obstáculos cresce com o nível
-    count = min(30, 1 + level * 2)
-    tries = 0
-    while len(obstacles) < count and tries < count * 10:
-        tries += 1
-        gx = random.randrange(0, GRID_W) * PIXEL
-        gy = random.randrange(0, GRID_H) * PIXEL
-        pos = (gx, gy)
-        if pos in obstacles or pos in avoid_positions:
-            continue
-        obstacles.append(pos)
-    return obstacles
-
-
-def draw_obstacles(obstacles):
-    for ox, oy in obstacles:
-        pygame.draw.rect(tela, (60, 60, 70), (ox, oy, PIXEL, PIXEL))
-        # pequeno destaque
-        pygame.draw.rect(tela, (100, 100, 110), (ox+2, oy+2, PIXEL-4, PIXEL-4), 1)
-
-# Tela de Game Over
-def game_over(score):
+    return scene.draw(tela, t)
+
+def draw_scene_deco(scene, t, surf=None):
+    # só a decoração animada; retorna os retângulos desenhados
+    return scene.draw_deco(surf or tela, t)
+
+SNAKE_RENDERER = None
+
+def get_snake_renderer(pixel=None):
+    global SNAKE_RENDERER
+    pixel = pixel or PIXEL
+    if SNAKE_RENDERER is None or SNAKE_RENDERER.pixel != pixel:
+        from snakerender import SnakeRenderer
+        SNAKE_RENDERER = SnakeRenderer(pixel, VERMELHO, VERDE, VERDE_ESC)
+    return SNAKE_RENDERER
+
+def draw_snake_body(cobra, tick=None, comp=None, pixel=None):
+    # corpo com gradiente (SnakeRenderer). Com comp, incremental na base do
+    # compositor (chamar logo depois de begin_frame); sem, tudo num blits()
+    renderer = get_snake_renderer(pixel)
+    if comp is not None:
+        renderer.update_base(comp, cobra, tick)
+        return []
+    return list(renderer.draw_body(tela, cobra, tick))
+
+def draw_snake_head(hx, hy, direcao, surf=None, pixel=None):
+    # cabeça e olhos em (hx, hy) pixels (pode estar interpolada): redesenhada todo frame
+    surf = surf or tela
+    pixel = pixel or PIXEL
+    rects = [surf.blit(get_snake_renderer(pixel).head_tile(), (int(hx), int(hy)))]
+    if pixel < 4:
+        # bloco pequeno demais para olho
+        return rects
+
+    # olhos na cabeça (medidas para PIXEL = 20, proporcionais em blocos menores)
+    eye_offset = pixel * 3 / 10
+    ex = hx + (pixel//2) + direcao[0]*eye_offset - pixel / 5
+    ey = hy + (pixel//2) + direcao[1]*eye_offset - pixel / 5
+    raio = max(1, round(pixel * 3 / 20))
+    rects.append(pygame.draw.circle(surf, BRANCO, (int(ex), int(ey)), raio))
+    if raio > 1:
+        pygame.draw.circle(surf, (30,30,30), (int(ex+1), int(ey)), 1)
+    return rects
+
+def draw_snake(cobra, hx, hy, direcao, tick=None, comp=None):
+    # cobra com gradiente e olhos
+    return draw_snake_body(cobra, tick, comp) + draw_snake_head(hx, hy, direcao)
+
+def draw_obstacles(obstacles, surf=None, pixel=None):
+    # obstacles em células do grid
+    surf = surf or tela
+    pixel = pixel or PIXEL
+    borda = pixel // 10
+    for gx, gy in obstacles:
+        ox, oy = gx * pixel, gy * pixel
+        pygame.draw.rect(surf, (60, 60, 70), (ox, oy, pixel, pixel))
+        # pequeno destaque (some em blocos pequenos demais para ele)
+        if borda:
+            pygame.draw.rect(surf, (100, 100, 110), (ox+borda, oy+borda, pixel-2*borda, pixel-2*borda), 1)
+
+# Tela de Game Over; retorna o próximo estado da sessão ("retry" ou "menu")
+def game_over(score, submit=True, auto_retry_ms=None):
+    """Tela de game over; retorna "retry" ou "menu".
+
+    Com auto_retry_ms a próxima partida começa sozinha depois desse tempo
+    (autopilot rodando sem ninguém no teclado).
+    """
+    init_runtime()
     # parar qualquer música de jogatina e tocar música de game over (adicione sounds/over.mp3)
     try:
         stop_music()
@@ -253,175 +327,310 @@ def game_over(score):
             SOUND_GAMEOVER.play()
         except Exception:
             pass
-    texto = fonte.render(f"GAME OVER  -  Score: {score}", True, VERMELHO)
-    tela.blit(texto, (LARGURA//2 - texto.get_width()//2, ALTURA//2 - 12))
-    pygame.display.update()
-    pygame.time.delay(2000)
-    save_highscore(score)
-    try:
-        if AUDIO_READY:
-            pygame.mixer.music.stop()
-    except Exception:
-        pass
-    pygame.quit()
-    sys.exit()
-
-def clamp_dir(new, old):
-    # impede reversão instantânea
-    if (new[0] == -old[0] and new[1] == -old[1]):
-        return old
-    return new
+    if submit:
+        save_highscore(score)
+
+    # cena não bloqueante: continua tratando eventos; Enter/Espaço jogam de novo, Esc volta ao menu
+    fundo = tela.copy()
+    count_surface()
+    texto = render_text(f"GAME OVER  -  Score: {score}", VERMELHO)
+    hint = render_text("Enter: jogar de novo  |  Esc: menu", (180,180,180))
+    # tela parada: dorme em event.wait até uma tecla (ou até o prazo do auto-retry)
+    pacer = MENU_PACER
+    pacer.invalidate()
+    inicio = time.perf_counter()
+    while True:
+        restante = None
+        if auto_retry_ms is not None:
+            restante = auto_retry_ms - (time.perf_counter() - inicio) * 1000
+            if restante <= 0:
+                return "retry"
+        for evento in pacer.events(animated=False, timeout_ms=restante):
+            if evento.type == pygame.QUIT:
+                pygame.quit(); sys.exit()
+            if evento.type == pygame.KEYDOWN:
+                if evento.key in (pygame.K_RETURN, pygame.K_SPACE):
+                    return "retry"
+                if evento.key == pygame.K_ESCAPE:
+                    return "menu"
 
-def jogo():
-    # estado inicial
-    cobra = [(5*PIXEL, 5*PIXEL), (4*PIXEL, 5*PIXEL), (3*PIXEL, 5*PIXEL)]
-    direcao = (PIXEL, 0)
-    pending_dir = direcao
+        if not pacer.due("game_over"):
+            continue
+        tela.blit(fundo, (0, 0))
+        tela.blit(texto, (LARGURA//2 - texto.get_width()//2, ALTURA//2 - 12))
+        tela.blit(hint, (LARGURA//2 - hint.get_width()//2, ALTURA//2 + 24))
+        pygame.display.update()
 
-    comida = (
-        random.randrange(0, LARGURA, PIXEL),
-        random.randrange(0, ALTURA, PIXEL)
-    )
+# Interpolar a cabeça entre dois passos lógicos (suaviza, mas atrasa 1 passo na tela)
+INTERPOLATE = False
+# Latência tecla -> passo que aplicou a tecla (ms), acumulada entre partidas
+INPUT_LATENCY = LatencyStats()
 
-    # nível inicial e obstáculos (gera alguns obstáculos iniciais)
-    level = 1
-    obstacles = generate_obstacles(level, avoid_positions=cobra + [comida])
+# Cada partida é gravada como replay (semente + inputs, ver replay.py)
+RECORD_REPLAYS = True
+REPLAYS_DIR = os.path.join(os.path.dirname(__file__), 'replays')
+REPLAYS_KEEP = 20
 
-    particles = []
+def open_replay_writer(engine):
+    """Começa a gravar a partida em replays/; None se não der para escrever."""
+    if not RECORD_REPLAYS:
+        return None
+    try:
+        from replay import ReplayWriter
+        os.makedirs(REPLAYS_DIR, exist_ok=True)
+        # guarda só os REPLAYS_KEEP mais recentes
+        old = sorted(f for f in os.listdir(REPLAYS_DIR) if f.endswith('.snkr'))
+        for f in old[:max(0, len(old) - REPLAYS_KEEP + 1)]:
+            os.remove(os.path.join(REPLAYS_DIR, f))
+        path = os.path.join(REPLAYS_DIR, time.strftime('%Y%m%d-%H%M%S') + f'-{engine.seed % 10000:04d}.snkr')
+        return ReplayWriter(path, engine, current_difficulty_name())
+    except OSError:
+        return None
+
+# Tempo de decisão do autopilot por passo (ms), acumulado entre partidas
+AUTOPILOT_LATENCY = LatencyStats()
+
+# Perfil por fase do frame: F3 liga/desliga (com overlay), F4 exporta CSV e trace
+PROFILER = FrameProfiler()
+PROFILE_CSV = os.path.join(os.path.dirname(__file__), 'profile.csv')
+PROFILE_TRACE = os.path.join(os.path.dirname(__file__), 'profile_trace.json')
+PROFILE_OVERLAY_EVERY = 30  # frames entre atualizações do overlay
+
+def export_profile():
+    PROFILER.export_csv(PROFILE_CSV)
+    PROFILER.export_trace(PROFILE_TRACE)
+    print(f"Perfil salvo em {PROFILE_CSV} e {PROFILE_TRACE}")
+
+def build_profiler_overlay(summary):
+    # caixa com p50/p99 por fase, montada numa superfície só (o frame só faz um blit)
+    from textcache import get_font
+    font = get_font("consolas", 13)
+    linhas = [f"{'fase':10s} {'p50':>6s} {'p99':>6s}"]
+    for name, (p50, p99) in summary.items():
+        if name == "surfaces":
+            linhas.append(f"{'surfaces':10s} {p50:6.0f} {p99:6.0f}")
+        else:
+            linhas.append(f"{name:10s} {p50:6.2f} {p99:6.2f}")
+    surfs = [font.render(l, True, (220, 255, 220)) for l in linhas]
+    w = max(s.get_width() for s in surfs) + 12
+    h = sum(s.get_height() for s in surfs) + 12
+    box = pygame.Surface((w, h), pygame.SRCALPHA)
+    count_surface(len(surfs) + 1)
+    box.fill((0, 0, 0, 170))
+    y = 6
+    for s in surfs:
+        box.blit(s, (6, y))
+        y += s.get_height()
+    return box
+
+def draw_hud(surf, hud):
+    # linhas do HUD no canto de cima; retorna os retângulos
+    return [surf.blit(s, (8, 8 + i*28)) for i, s in enumerate(hud)]
+
+def jogo(replay=None, autopilot=False):
+    """Uma partida; retorna o score quando a cobra morre.
+
+    Com replay (um ReplayReader) a partida gravada é reproduzida em tempo real;
+    com autopilot quem joga é o Autopilot. Nos dois casos o teclado só serve
+    para sair (Esc).
+    """
+    global _round_requested_at
+    init_runtime()
+    # estado inicial (regras no SnakeEngine, aqui só input e render em pixels)
+    move_delay = START_MOVE_DELAY if 'START_MOVE_DELAY' in globals() else 140  # ms por passo (reduz com score)
+    if replay is not None:
+        engine = replay.new_engine()
+        writer = None
+    else:
+        engine = SnakeEngine(GRID_W, GRID_H, start_delay=move_delay)
+        writer = open_replay_writer(engine)
+    pilot = None
+    if autopilot:
+        from autopilot import Autopilot
+        pilot = Autopilot(engine.grid_w, engine.grid_h, latency=AUTOPILOT_LATENCY)
+    direcao = engine.direcao
+    prev_head = None
+    inputs = InputQueue(clamp_dir, maxlen=3, latency=INPUT_LATENCY)
+    timestep = FixedTimestep(max_steps=5)
+
+    particles = make_particles()
+
+    # LOWRES: grid, cobra, comida e fade vão para a superfície lógica (`field`,
+    # `cell` pixels por célula); decoração, partículas e HUD são desenhados em
+    # resolução nativa por cima do upscale
+    lowres = None
+    field, cell = tela, PIXEL
+    if LOWRES:
+        from lowres import LowResScreen
+        lowres = LowResScreen(GRID_W, GRID_H, LOWRES_CELL)
+        field, cell = lowres.surface, lowres.cell
+    food_tiles = {}
 
-    score = 0
     scene_index = 0
-    scene = SCENES[scene_index]
     transitioning = False
     trans_alpha = 0
+    fade = None
 
-    move_delay = START_MOVE_DELAY if 'START_MOVE_DELAY' in globals() else 140  # ms por passo (reduz com score)
-    move_timer = 0
+    hud_key = None
+    hud = ()
+    comp = Compositor(field, display=lowres is None)
+    overlay = None
 
+    # os menus não chamam clock.tick: zera o relógio para o tempo parado no
+    # menu não virar vários passos no primeiro frame
+    clock.tick()
     running = True
     while running:
         dt = clock.tick(RENDER_FPS)
-        move_timer += dt
-        t = pygame.time.get_ticks() / 1000.0
+        # desligado é o NULL_PROFILER: begin/mark/end não fazem nada
+        prof = PROFILER.active()
+        prof.begin_frame()
+        timestep.add(dt)
+        now = pygame.time.get_ticks()
+        t = now / 1000.0
 
         for evento in pygame.event.get():
             if evento.type == pygame.QUIT:
+                if writer is not None:
+                    try:
+                        writer.close()
+                    except OSError:
+                        pass
                 pygame.quit()
                 sys.exit()
-            if evento.type == pygame.KEYDOWN:
-                if evento.key in (pygame.K_w, pygame.K_UP):
-                    pending_dir = clamp_dir((0, -PIXEL), direcao)
-                if evento.key in (pygame.K_s, pygame.K_DOWN):
-                    pending_dir = clamp_dir((0, PIXEL), direcao)
-                if evento.key in (pygame.K_a, pygame.K_LEFT):
-                    pending_dir = clamp_dir((-PIXEL, 0), direcao)
-                if evento.key in (pygame.K_d, pygame.K_RIGHT):
-                    pending_dir = clamp_dir((PIXEL, 0), direcao)
-
-        # passo lógico da cobra (quando timer atingir delay)
-        if move_timer >= move_delay:
-            move_timer = 0
-            direcao = pending_dir
-            nova_cabeca = (
-                cobra[0][0] + direcao[0],
-                cobra[0][1] + direcao[1]
-            )
-
-            # Wrapping nas bordas (não dá game over ao bater na lateral)
-            nx = nova_cabeca[0] % LARGURA
-            ny = nova_cabeca[1] % ALTURA
-            nova_cabeca = (nx, ny)
-
-            # Colisão com o próprio corpo
-            if nova_cabeca in cobra:
-                game_over(score)
-
-            # Colisão com obstáculos -> fim de jogo
-            if nova_cabeca in obstacles:
-                game_over(score)
-
-            cobra.insert(0, nova_cabeca)
+            if evento.type == pygame.KEYDOWN and evento.key == pygame.K_F3:
+                PROFILER.toggle()
+                overlay = None
+                comp.mark_full()
+            if evento.type == pygame.KEYDOWN and evento.key == pygame.K_F4 and PROFILER.frames:
+                export_profile()
+            if replay is not None or pilot is not None:
+                if evento.type == pygame.KEYDOWN and evento.key == pygame.K_ESCAPE:
+                    if writer is not None:
+                        try:
+                            writer.close()
+                        except OSError:
+                            pass
+                    return engine.score
+            elif evento.type == pygame.KEYDOWN and evento.key in KEY_DIRS:
+                inputs.push(KEY_DIRS[evento.key], engine.direcao)
+        prof.mark("events")
+        # a janela pode ter mudado de tamanho no event.get (a superfície da
+        # janela é realocada): escala do upscale e pixels nativos por célula
+        native = lowres.layout() if lowres is not None else tela
+        native_cell = lowres.native_cell if lowres is not None else PIXEL
+
+        # passos lógicos da cobra (passo fixo; a sobra de tempo vai para o próximo)
+        while timestep.consume(engine.move_delay):
+            comida = engine.comida
+            prev_head = engine.cobra[0]
+            if replay is not None:
+                # replay sem registro de fim (partida interrompida) acaba no último tick lido
+                if replay.end_tick is None and engine.ticks >= replay.last_tick:
+                    return engine.score
+                nova = replay.inputs.get(engine.ticks)
+            else:
+                nova = pilot.decide(engine) if pilot is not None else inputs.pop()
+            tick = engine.ticks
+            evento_passo = engine.step(nova)
+            direcao = engine.direcao
+            if writer is not None:
+                # disco cheio/removido no meio da partida: para de gravar, o jogo segue
+                try:
+                    if nova is not None:
+                        writer.record_input(tick, nova)
+                    writer.after_step(engine, evento_passo)
+                except OSError:
+                    writer = None
+
+            # Colisão com o próprio corpo ou obstáculos (ou tabuleiro cheio)
+            if evento_passo in ("dead", "full"):
+                return engine.score
 
             # Comer comida
-            if nova_cabeca == comida:
-                score += 1
+            if evento_passo in ("eat", "level"):
                 # partículas
-                for _ in range(18):
-                    particles.append(Particle((comida[0]+PIXEL/2, comida[1]+PIXEL/2), AMARELO))
+                particles.emit((comida[0]*native_cell+native_cell/2, comida[1]*native_cell+native_cell/2), AMARELO, 18)
                 # som de comer
                 if SOUND_EAT:
                     try:
                         SOUND_EAT.play()
                     except Exception:
                         pass
-                # nova comida
-                while True:
-                    comida = (
-                        random.randrange(0, LARGURA, PIXEL),
-                        random.randrange(0, ALTURA, PIXEL)
-                    )
-                    if comida not in cobra and comida not in obstacles:
-                        break
-
-                # ajustar dificuldade e mudança de cena a cada 5 pontos
-                if score % 5 == 0:
-                    move_delay = max(60, move_delay - 10)
-                    scene_index = (scene_index + 1) % len(SCENES)
-                    transitioning = True
-                    trans_alpha = 0
-                    # aumentar nível e gerar novos obstáculos
-                    level += 1
-                    obstacles = generate_obstacles(level, avoid_positions=cobra + [comida])
-            else:
-                cobra.pop()
 
-        # atualizar partículas
-        for p in particles[:]:
-            p.update(dt)
-            if p.age >= p.life:
-                particles.remove(p)
-
-        # desenhar cena com possível transição
-        draw_scene(SCENES[scene_index], t)
+            # mudança de cena a cada nível
+            if evento_passo == "level":
+                scene_index = (scene_index + 1) % len(SCENES)
+                transitioning = True
+                trans_alpha = 0
+        prof.mark("logic")
 
-        # Desenhar comida com pulso
+        # atualizar partículas
+        particles.update(dt)
+        prof.mark("particles")
+
+        # camadas estáticas: fundo da cena e obstáculos só mudam no level-up
+        scene = SCENES[scene_index]
+        comp.set_layer("background", scene.bg, lambda surf: surf.fill(scene.bg))
+        comp.set_layer("obstacles", tuple(engine.obstacles),
+                       lambda surf: draw_obstacles(engine.obstacles, surf, cell))
+        prof.mark("obstacles")
+        comp.begin_frame()
+
+        # corpo da cobra: fica na base do compositor, só muda o que andou desde o último passo
+        draw_snake_body(engine.cobra, (id(engine), engine.ticks), comp, cell)
+        prof.mark("snake")
+
+        # decoração animada da cena: por baixo da cobra e dos obstáculos, que já
+        # estão na base e voltam por cima dela
+        if lowres is None:
+            deco = draw_scene_deco(scene, t)
+            comp.restore_over(deco, scene.bg)
+            comp.mark_all(deco)
+        prof.mark("scene")
+
+        # Desenhar comida com pulso (um bloco pronto por tamanho)
         pulse = 1 + 0.15 * math.sin(t * 8)
-        comida_rect_size = PIXEL * pulse
-        comida_x = comida[0] + (PIXEL - comida_rect_size) / 2
-        comida_y = comida[1] + (PIXEL - comida_rect_size) / 2
-        s = pygame.Surface((int(comida_rect_size), int(comida_rect_size)), pygame.SRCALPHA)
-        pygame.draw.rect(s, VERMELHO, (0, 0, int(comida_rect_size), int(comida_rect_size)), border_radius=4)
-        tela.blit(s, (int(comida_x), int(comida_y)))
-
-        # desenhar obstáculos
-        draw_obstacles(obstacles)
-
-        # desenhar cobra com gradiente
-        for i, parte in enumerate(cobra):
-            tseg = i / max(1, len(cobra)-1)
-            cor = lerp_color(VERDE, VERMELHO if i==0 else VERDE_ESC, 1 - tseg*0.6)
-            desenhar_bloco(cor, parte[0], parte[1])
-
-        # olhos na cabeça
+        comida_rect_size = cell * pulse
+        comida = engine.comida
+        comida_x = comida[0]*cell + (cell - comida_rect_size) / 2
+        comida_y = comida[1]*cell + (cell - comida_rect_size) / 2
+        size = max(1, int(comida_rect_size))
+        s = food_tiles.get(size)
+        if s is None:
+            s = food_tiles[size] = pygame.Surface((size, size), pygame.SRCALPHA)
+            count_surface()
+            pygame.draw.rect(s, VERMELHO, (0, 0, size, size), border_radius=max(1, cell // 5))
+        comp.mark(field.blit(s, (int(comida_x), int(comida_y))))
+        prof.mark("food")
+
+        # cabeça da cobra (o corpo já está na base)
+        cobra = engine.cobra
         head = cobra[0]
-        hx, hy = head[0], head[1]
-        eye_offset = 6
-        ex = hx + (PIXEL//2) + (direcao[0]//PIXEL)*eye_offset - 4
-        ey = hy + (PIXEL//2) + (direcao[1]//PIXEL)*eye_offset - 4
-        pygame.draw.circle(tela, BRANCO, (int(ex), int(ey)), 3)
-        pygame.draw.circle(tela, (30,30,30), (int(ex+1), int(ey)), 1)
+        hx, hy = head[0]*cell, head[1]*cell
+        if INTERPOLATE and prev_head and abs(head[0]-prev_head[0]) + abs(head[1]-prev_head[1]) == 1:
+            a = timestep.alpha(engine.move_delay)
+            hx = lerp(prev_head[0]*cell, hx, a)
+            hy = lerp(prev_head[1]*cell, hy, a)
+        comp.mark_all(draw_snake_head(hx, hy, direcao, field, cell))
+        prof.mark("snake")
 
         # desenhar partículas
-        for p in particles:
-            p.draw(tela)
-
-        # HUD: score e dicas
-        txt = fonte.render(f"Score: {score}", True, BRANCO)
-        tela.blit(txt, (8, 8))
-        lvl = fonte.render(f"Speed: {round(1000/move_delay)}", True, BRANCO)
-        tela.blit(lvl, (8, 36))
-        level_txt = fonte.render(f"Level: {level}", True, BRANCO)
-        tela.blit(level_txt, (8, 64))
+        if lowres is None:
+            comp.mark_all(particles.draw(tela))
+        prof.mark("particles")
+
+        # HUD: score e dicas (só renderiza de novo quando algum valor muda)
+        if hud_key != (engine.score, engine.move_delay, engine.level):
+            hud_key = (engine.score, engine.move_delay, engine.level)
+            hud = (
+                render_text(f"Score: {engine.score}"),
+                render_text(f"Speed: {round(1000/engine.move_delay)}"),
+                render_text(f"Level: {engine.level}"),
+            )
+        if lowres is None:
+            comp.mark_all(draw_hud(tela, hud))
+        prof.mark("hud")
 
         # transição de cena (fade)
         if transitioning:
@@ -429,24 +638,271 @@ def jogo():
             if trans_alpha >= 255:
                 trans_alpha = 255
                 transitioning = False
-            fade = pygame.Surface((LARGURA, ALTURA))
+            if fade is None:
+                # uma superfície preta por partida; a cada frame só muda o alpha
+                fade = pygame.Surface(field.get_size())
+                count_surface()
+                fade.fill((0,0,0))
             fade.set_alpha(int(trans_alpha))
-            fade.fill((0,0,0))
-            tela.blit(fade, (0,0))
+            field.blit(fade, (0,0))
+            comp.mark_full()
+        prof.mark("fade")
+
+        if lowres is not None:
+            # playfield pronto: upscale para a janela e o resto em resolução nativa
+            comp.end_frame()
+            lowres.upscale()
+            prof.mark("update")
+            # em resolução nativa por cima do playfield já ampliado (pô-la por
+            # baixo exigiria um upscale por retângulo); são pontos pequenos
+            draw_scene_deco(scene, t, native)
+            prof.mark("scene")
+            particles.draw(native)
+            prof.mark("particles")
+            draw_hud(native, hud)
+            prof.mark("hud")
+
+        # overlay do profiler (fora das fases medidas)
+        if PROFILER.enabled:
+            if overlay is None or PROFILER.frames % PROFILE_OVERLAY_EVERY == 0:
+                overlay = build_profiler_overlay(PROFILER.summary())
+            r = native.blit(overlay, (native.get_width() - overlay.get_width() - 8, 8))
+            if lowres is None:
+                comp.mark(r)
+            prof.skip()
+
+        if lowres is not None:
+            lowres.flip()
+        else:
+            comp.end_frame()
+        prof.mark("update")
+        prof.end_frame()
+        if _round_requested_at is not None:
+            ROUND_START.add((time.perf_counter() - _round_requested_at) * 1000)
+            _round_requested_at = None
+
+WORLD_VIEW = None
+
+def draw_food_pointer(camera, head, comida):
+    # comida fora da câmera: seta na borda da tela apontando para ela (lado mais curto com wrap)
+    ww, wh = camera.world_w, camera.world_h
+    dx = (comida[0] - head[0] + ww // 2) % ww - ww // 2
+    dy = (comida[1] - head[1] + wh // 2) % wh - wh // 2
+    cx, cy = LARGURA / 2, ALTURA / 2
+    # escala para o ponto cair na borda (com margem)
+    k = min((cx - 14) / abs(dx) if dx else float('inf'), (cy - 14) / abs(dy) if dy else float('inf'))
+    px, py = cx + dx * k, cy + dy * k
+    dist = math.hypot(dx, dy)
+    ux, uy = dx / dist, dy / dist
+    ponta = (px + ux * 10, py + uy * 10)
+    base1 = (px - uy * 6, py + ux * 6)
+    base2 = (px + uy * 6, py - ux * 6)
+    return pygame.draw.polygon(tela, VERMELHO, (ponta, base1, base2))
+
+def jogo_mundo(difficulty=WORLD_PRESET, autopilot=False):
+    """Partida no mundo gigante (WorldEngine); retorna o score final.
+
+    A câmera segue a cabeça e só o que está dentro dela é desenhado
+    (WorldView). Não grava replay: o formato guarda o tabuleiro do
+    SnakeEngine. Com autopilot joga o greedy_direction do world.
+    """
+    global _round_requested_at, WORLD_VIEW
+    init_runtime()
+    from world import WorldEngine, Camera, greedy_direction
+    nome, gw, gh, start_delay = difficulty
+    engine = WorldEngine(gw, gh, start_delay)
+    camera = Camera(gw, gh, GRID_W, GRID_H)
+    if WORLD_VIEW is None or WORLD_VIEW.pixel != PIXEL:
+        from worldview import WorldView
+        WORLD_VIEW = WorldView(PIXEL, VERMELHO, VERDE, VERDE_ESC, SCENES[0].bg)
+    view = WORLD_VIEW
+    inputs = InputQueue(clamp_dir, maxlen=3, latency=INPUT_LATENCY)
+    timestep = FixedTimestep(max_steps=5)
+    hud_key = None
+    hud = ()
+    overlay = None
+
+    clock.tick()
+    while True:
+        dt = clock.tick(RENDER_FPS)
+        prof = PROFILER.active()
+        prof.begin_frame()
+        timestep.add(dt)
+        now = pygame.time.get_ticks()
+        t = now / 1000.0
+
+        for evento in pygame.event.get():
+            if evento.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+            if evento.type == pygame.KEYDOWN and evento.key == pygame.K_F3:
+                PROFILER.toggle()
+                overlay = None
+            if evento.type == pygame.KEYDOWN and evento.key == pygame.K_F4 and PROFILER.frames:
+                export_profile()
+            if autopilot:
+                if evento.type == pygame.KEYDOWN and evento.key == pygame.K_ESCAPE:
+                    return engine.score
+            elif evento.type == pygame.KEYDOWN and evento.key in KEY_DIRS:
+                inputs.push(KEY_DIRS[evento.key], engine.direcao)
+        prof.mark("events")
+
+        while timestep.consume(engine.move_delay):
+            nova = greedy_direction(engine) if autopilot else inputs.pop()
+            evento_passo = engine.step(nova)
+            if evento_passo in ("dead", "full"):
+                return engine.score
+            if evento_passo in ("eat", "level") and SOUND_EAT:
+                try:
+                    SOUND_EAT.play()
+                except Exception:
+                    pass
+        prof.mark("logic")
+
+        # fundo, obstáculos e corpo visíveis: refeito só quando a cobra anda
+        head = engine.cobra[0]
+        camera.follow(head)
+        tela.blit(view.frame(engine, camera, (LARGURA, ALTURA)), (0, 0))
+        prof.mark("snake")
+
+        # comida com pulso, ou seta na borda se estiver fora da câmera
+        comida = engine.comida
+        pos = camera.to_view(comida)
+        if pos is not None:
+            size = int(PIXEL * (1 + 0.15 * math.sin(t * 8)))
+            off = (PIXEL - size) // 2
+            pygame.draw.rect(tela, VERMELHO, (pos[0]*PIXEL + off, pos[1]*PIXEL + off, size, size), border_radius=4)
+        else:
+            draw_food_pointer(camera, head, comida)
+        prof.mark("food")
+
+        hv = camera.to_view(head)
+        draw_snake_head(hv[0]*PIXEL, hv[1]*PIXEL, engine.direcao)
+        prof.mark("snake")
+
+        if hud_key != (engine.score, engine.level, len(engine.cobra)):
+            hud_key = (engine.score, engine.level, len(engine.cobra))
+            hud = (
+                render_text(f"Score: {engine.score}"),
+                render_text(f"Level: {engine.level}"),
+                render_text(f"Tamanho: {len(engine.cobra)}"),
+            )
+        for i, surf in enumerate(hud):
+            tela.blit(surf, (8, 8 + i*28))
+        prof.mark("hud")
+
+        if PROFILER.enabled:
+            if overlay is None or PROFILER.frames % PROFILE_OVERLAY_EVERY == 0:
+                overlay = build_profiler_overlay(PROFILER.summary())
+            tela.blit(overlay, (LARGURA - overlay.get_width() - 8, 8))
+            prof.skip()
 
+        # a câmera anda junto com a cobra: a tela inteira muda a cada passo
         pygame.display.update()
+        prof.mark("update")
+        prof.end_frame()
+        if _round_requested_at is not None:
+            ROUND_START.add((time.perf_counter() - _round_requested_at) * 1000)
+            _round_requested_at = None
+
+# cores dos outros jogadores no versus (por pid)
+VERSUS_CORES = [(80, 160, 255), (240, 140, 40), (200, 90, 220), (240, 220, 60), (60, 220, 200), (230, 90, 130)]
+
+def jogo_versus(net):
+    """Partida versus pela rede (netplay.NetThread já conectado); retorna o score do jogador.
+
+    O servidor é quem decide tudo: aqui só vão as teclas e o desenho do último
+    estado recebido, com as cabeças interpoladas entre dois ticks.
+    """
+    init_runtime()
+    renderer = get_snake_renderer()
+    bg = SCENES[0].bg
+    hud_key = None
+    hud = ()
+    try:
+        while True:
+            clock.tick(RENDER_FPS)
+            for evento in pygame.event.get():
+                if evento.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
+                if evento.type == pygame.KEYDOWN and evento.key == pygame.K_ESCAPE:
+                    with net.lock:
+                        me = net.state.players.get(net.state.pid)
+                        score = me.score if me is not None else 0
+                    return score
+                if evento.type == pygame.KEYDOWN and evento.key in KEY_DIRS:
+                    net.send_input(KEY_DIRS[evento.key])
+            if net.error is not None:
+                # servidor caiu ou fechou a conexão
+                return 0
+
+            t = pygame.time.get_ticks() / 1000.0
+            with net.lock:
+                state = net.state
+                w = state.grid_w
+                alpha = state.alpha()
+                tela.fill(bg)
+                draw_obstacles([(c % w, c // w) for c in state.obstacles])
+                size = int(PIXEL * (1 + 0.15 * math.sin(t * 8)))
+                off = (PIXEL - size) // 2
+                for c in state.foods:
+                    pygame.draw.rect(tela, VERMELHO, ((c % w)*PIXEL + off, (c // w)*PIXEL + off, size, size), border_radius=4)
+                heads = []
+                for pid, p in state.players.items():
+                    if not p.alive or not p.cobra:
+                        continue
+                    cor = VERDE if pid == state.pid else VERSUS_CORES[pid % len(VERSUS_CORES)]
+                    tile = renderer.tile(cor)
+                    it = iter(p.cobra)
+                    next(it)
+                    tela.blits([(tile, ((c % w)*PIXEL, (c // w)*PIXEL)) for c in it], doreturn=0)
+                    hx, hy = state.head_position(pid, alpha)
+                    heads.append((pid, hx, hy, p.direcao))
+                for pid, hx, hy, direcao in heads:
+                    if pid == state.pid:
+                        draw_snake_head(hx*PIXEL, hy*PIXEL, direcao)
+                    else:
+                        cor = VERSUS_CORES[pid % len(VERSUS_CORES)]
+                        tela.blit(renderer.tile(tuple(min(255, v + 60) for v in cor)), (int(hx*PIXEL), int(hy*PIXEL)))
+                placar = tuple(sorted(((p.score, pid) for pid, p in state.players.items()), reverse=True)[:5])
+                me = state.pid
+            if hud_key != placar:
+                hud_key = placar
+                hud = [render_text(f"{'Você' if pid == me else f'P{pid}'}: {score}",
+                                   AMARELO if pid == me else BRANCO) for score, pid in placar]
+            for i, surf in enumerate(hud):
+                tela.blit(surf, (8, 8 + i*28))
+            pygame.display.update()
+    finally:
+        # qualquer saída (ESC, QUIT, erro no desenho) para e espera o thread de rede
+        net.stop()
+
+def play_versus(host="127.0.0.1", port=None, bots=None, headless=False):
+    """Conecta num servidor versus (ou sobe um local com `bots` bots) e joga; retorna o score."""
+    from netplay import NetThread, DEFAULT_PORT
+    init_runtime(headless)
+    net = NetThread(host, port or DEFAULT_PORT, local_bots=bots)
+    try:
+        net.start()
+    except (OSError, ConnectionError) as e:
+        net.stop()
+        print(f"Erro: não conectou no servidor versus ({e}).")
+        return 0
+    with net.lock:
+        gw, gh, tick_ms = net.state.grid_w, net.state.grid_h, net.state.tick_ms
+    apply_difficulty(("Versus", gw, gh, tick_ms))
+    return jogo_versus(net)
 
 def menu_dificuldade():
-    # opções: (nome, grid_w, grid_h, move_delay_start)
-    options = [
-        ("Bebe Chorao", 30, 20, 180),
-        ("Normal", 40, 28, 140),
-        ("Tomei no Butico", 50, 36, 90)
-    ]
+    init_runtime()
+    # opções: (nome, grid_w, grid_h, move_delay_start); o mundo gigante joga com câmera
+    options = DIFFICULTIES + [WORLD_PRESET]
     selected = 1
+    pacer = MENU_PACER
+    pacer.invalidate()
     while True:
-        dt = clock.tick(RENDER_FPS)
-        for evento in pygame.event.get():
+        for evento in pacer.events(animated=False):
             if evento.type == pygame.QUIT:
                 pygame.quit(); sys.exit()
             if evento.type == pygame.KEYDOWN:
@@ -457,47 +913,122 @@ def menu_dificuldade():
                 if evento.key in (pygame.K_RETURN, pygame.K_SPACE):
                     return options[selected]
 
+        # nada anima aqui: só redesenha quando a seleção muda
+        if not pacer.due(("dificuldade", selected)):
+            continue
         # desenhar menu simples
         tela.fill((8,8,12))
-        titulo = fonte.render("SNAKE - Escolha a dificuldade", True, BRANCO)
+        titulo = render_text("SNAKE - Escolha a dificuldade", BRANCO)
         tela.blit(titulo, (LARGURA//2 - titulo.get_width()//2, 40))
         for i, opt in enumerate(options):
             name = opt[0]
             color = AMARELO if i == selected else BRANCO
-            txt = fonte.render(name, True, color)
+            txt = render_text(name, color)
             tela.blit(txt, (LARGURA//2 - txt.get_width()//2, 120 + i*48))
 
-        hint = fonte.render("Use ↑/↓ e Enter para escolher", True, (180,180,180))
+        hint = render_text("Use ↑/↓ e Enter para escolher", (180,180,180))
         tela.blit(hint, (LARGURA//2 - hint.get_width()//2, ALTURA - 60))
         pygame.display.update()
 
 def menu_recorde():
-    hs = get_highscore()
+    init_runtime()
+    nome = current_difficulty_name()
+    top = get_leaderboard().top(nome, 5)
     showing = True
+    pacer = MENU_PACER
+    pacer.invalidate()
     while showing:
-        dt = clock.tick(RENDER_FPS)
-        for evento in pygame.event.get():
+        for evento in pacer.events(animated=False):
             if evento.type == pygame.QUIT:
                 pygame.quit(); sys.exit()
             if evento.type == pygame.KEYDOWN:
                 showing = False
 
+        if not showing or not pacer.due("recorde"):
+            continue
         tela.fill((4,4,8))
         title = render_pixel_text("RECORDES", small_size=12, scale=4, color=AMARELO)
         tela.blit(title, (LARGURA//2 - title.get_width()//2, 40))
-        txt = fonte.render(f"Melhor score: {hs}", True, BRANCO)
-        tela.blit(txt, (LARGURA//2 - txt.get_width()//2, 160))
-        hint = fonte.render("Pressione qualquer tecla para voltar", True, (180,180,180))
+        txt = render_text(f"Dificuldade: {nome}", (180,180,180))
+        tela.blit(txt, (LARGURA//2 - txt.get_width()//2, 120))
+        if not top:
+            txt = render_text("Sem recordes ainda", BRANCO)
+            tela.blit(txt, (LARGURA//2 - txt.get_width()//2, 170))
+        for i, (score, _) in enumerate(top):
+            txt = render_text(f"{i+1}. {score}", AMARELO if i == 0 else BRANCO)
+            tela.blit(txt, (LARGURA//2 - txt.get_width()//2, 170 + i*34))
+        hint = render_text("Pressione qualquer tecla para voltar", (180,180,180))
         tela.blit(hint, (LARGURA//2 - hint.get_width()//2, ALTURA - 60))
         pygame.display.update()
 
+# painel translúcido e opção destacada em cada escala (rotozoom é caro por frame)
+_MENU_PANEL = None
+_MENU_ZOOM = {}
+
+def draw_menu_principal(options, selected, t):
+    global _MENU_PANEL
+    # fundo retro com barras e scanlines
+    tela.fill((6,6,12))
+    for i in range(0, LARGURA, 8):
+        col_val = 20 + int(30 * math.sin((t + i*0.01)))
+        # garantir 0-255
+        c1 = max(0, min(255, int(col_val)))
+        c2 = max(0, min(255, c1 // 2))
+        c3 = max(0, min(255, c1 // 3))
+        pygame.draw.line(tela, (c1, c2, c3), (i, ALTURA//3), (i, ALTURA), 1)
+
+    # title Atari style
+    title_text = "Snake's Eat"
+    title_surf = render_pixel_text(title_text, small_size=18, scale=6, color=(255,200,60))
+    bob = int(math.sin(t*2) * 6)
+    tela.blit(title_surf, (LARGURA//2 - title_surf.get_width()//2, 20 + bob))
+
+    # subtitle pac-man style (pixel feel)
+    sub = render_pixel_text("estilo retro", small_size=10, scale=3, color=(200,200,255))
+    tela.blit(sub, (LARGURA//2 - sub.get_width()//2, 20 + title_surf.get_height() + bob + 6))
+
+    # painel central para opções
+    panel_w, panel_h = 520, 260
+    panel_x = LARGURA//2 - panel_w//2
+    panel_y = 120
+    if _MENU_PANEL is None:
+        _MENU_PANEL = pygame.Surface((panel_w, panel_h), pygame.SRCALPHA)
+        count_surface()
+        _MENU_PANEL.fill((12, 12, 18, 200))
+    tela.blit(_MENU_PANEL, (panel_x, panel_y))
+    # opções com animação de destaque
+    for i, opt in enumerate(options):
+        y = 150 + i*46
+        is_sel = (i == selected)
+        color = AMARELO if is_sel else BRANCO
+        txt_s = render_text(opt, color)
+        if is_sel:
+            # escala em passos de 1%: no máximo ~17 superfícies por opção
+            scale = round(1.0 + 0.08 * math.sin(t*6 + i), 2)
+            key = (opt, color, scale)
+            zoom = _MENU_ZOOM.get(key)
+            if zoom is None:
+                zoom = _MENU_ZOOM[key] = pygame.transform.rotozoom(txt_s, 0, scale)
+                count_surface()
+            txt_s = zoom
+        tela.blit(txt_s, (LARGURA//2 - txt_s.get_width()//2, y))
+
+    # show current difficulty
+    diff_txt = render_text(f"Dificuldade: {current_difficulty_name()}", (180,180,180))
+    tela.blit(diff_txt, (LARGURA - diff_txt.get_width() - 12, ALTURA - 40))
+
+    # footer
+    footer = render_text("Fazido por Dante | Made by Dante", (150,150,150))
+    tela.blit(footer, (LARGURA//2 - footer.get_width()//2, ALTURA - 32))
+
 def menu_principal():
-    options = ["Iniciar", "Recorde", "Dificuldade", "Sair"]
+    init_runtime()
+    options = ["Iniciar", "Autopilot", "Recorde", "Dificuldade", "Sair"]
     selected = 0
     # difficulty state
     global CURRENT_DIFFICULTY
     if 'CURRENT_DIFFICULTY' not in globals():
-        CURRENT_DIFFICULTY = ("Normal", 40, 28, 140)
+        CURRENT_DIFFICULTY = DEFAULT_DIFFICULTY
 
     # toca música do menu ao entrar no menu (adicione sounds/menu.mp3)
     try:
@@ -505,11 +1036,10 @@ def menu_principal():
     except Exception:
         pass
 
-    t0 = 0
+    pacer = MENU_PACER
+    pacer.invalidate()
     while True:
-        dt = clock.tick(RENDER_FPS)
-        t = pygame.time.get_ticks() / 1000.0
-        for evento in pygame.event.get():
+        for evento in pacer.events(animated=True):
             if evento.type == pygame.QUIT:
                 pygame.quit(); sys.exit()
             if evento.type == pygame.KEYDOWN:
@@ -521,6 +1051,8 @@ def menu_principal():
                     choice = options[selected]
                     if choice == "Iniciar":
                         return "start"
+                    if choice == "Autopilot":
+                        return "autopilot"
                     if choice == "Recorde":
                         menu_recorde()
                     if choice == "Dificuldade":
@@ -528,80 +1060,131 @@ def menu_principal():
                         CURRENT_DIFFICULTY = (nome, gw, gh, sd)
                     if choice == "Sair":
                         pygame.quit(); sys.exit()
+                    pacer.invalidate()
 
-        # fundo retro com barras e scanlines
-        tela.fill((6,6,12))
-        for i in range(0, LARGURA, 8):
-            col_val = 20 + int(30 * math.sin((t + i*0.01)))
-            # garantir 0-255
-            c1 = max(0, min(255, int(col_val)))
-            c2 = max(0, min(255, c1 // 2))
-            c3 = max(0, min(255, c1 // 3))
-            pygame.draw.line(tela, (c1, c2, c3), (i, ALTURA//3), (i, ALTURA), 1)
-
-        # title Atari style
-        title_text = "Snake's Eat"
-        title_surf = render_pixel_text(title_text, small_size=18, scale=6, color=(255,200,60))
-        bob = int(math.sin(t*2) * 6)
-        tela.blit(title_surf, (LARGURA//2 - title_surf.get_width()//2, 20 + bob))
-
-        # subtitle pac-man style (pixel feel)
-        sub = render_pixel_text("estilo retro", small_size=10, scale=3, color=(200,200,255))
-        tela.blit(sub, (LARGURA//2 - sub.get_width()//2, 20 + title_surf.get_height() + bob + 6))
-
-        # painel central para opções
-        panel_w, panel_h = 520, 260
-        panel_x = LARGURA//2 - panel_w//2
-        panel_y = 120
-        panel_s = pygame.Surface((panel_w, panel_h), pygame.SRCALPHA)
-        panel_s.fill((12, 12, 18, 200))
-        tela.blit(panel_s, (panel_x, panel_y))
-        # opções com animação de destaque
-        for i, opt in enumerate(options):
-            y = 160 + i*56
-            is_sel = (i == selected)
-            color = AMARELO if is_sel else BRANCO
-            scale = 1.0 + (0.08 * math.sin(t*6 + i)) if is_sel else 1.0
-            txt = fonte.render(opt, True, color)
-            Tw, Th = txt.get_size()
-            txt_s = pygame.transform.rotozoom(txt, 0, scale)
-            tela.blit(txt_s, (LARGURA//2 - txt_s.get_width()//2, y))
-
-        # show current difficulty
-        diff_txt = fonte.render(f"Dificuldade: {CURRENT_DIFFICULTY[0]}", True, (180,180,180))
-        tela.blit(diff_txt, (LARGURA - diff_txt.get_width() - 12, ALTURA - 40))
-
-        # footer
-        footer = fonte.render("Fazido por Dante | Made by Dante", True, (150,150,150))
-        tela.blit(footer, (LARGURA//2 - footer.get_width()//2, ALTURA - 32))
-
+        # a animação anda no ritmo do pacer (RENDER_FPS ou MENU_IDLE_FPS parado)
+        t = pacer.frame_time(pygame.time.get_ticks() / 1000.0)
+        if not pacer.due((selected, t)):
+            continue
+        draw_menu_principal(options, selected, t)
         pygame.display.update()
-
-def main():
-    # menu principal
+        if "first_menu_frame" not in STARTUP_TIMES:
+            # do início do import até o primeiro frame do menu na tela
+            STARTUP_TIMES["first_menu_frame"] = (time.perf_counter() - _IMPORT_T0) * 1000
+            if REPORT_TIMINGS:
+                print(startup_report())
+
+def apply_difficulty(difficulty):
+    # pegar seleção atual; só recria a janela se o tamanho mudou
+    nome, gw, gh, start_delay = difficulty
+    global PIXEL, GRID_W, GRID_H, LARGURA, ALTURA, tela, START_MOVE_DELAY
+    if is_world(difficulty):
+        # mundo gigante: a janela mostra só a área da câmera
+        gw, gh = VIEW_W, VIEW_H
+    PIXEL = 20
+    GRID_W = gw
+    GRID_H = gh
+    tamanho = (GRID_W * PIXEL, GRID_H * PIXEL)
+    # com LOWRES quem escolhe o tamanho da janela é o jogador: só muda quando o grid muda
+    mudou = tamanho != (LARGURA, ALTURA) if LOWRES else tela.get_size() != tamanho
+    LARGURA, ALTURA = tamanho
+    if mudou:
+        tela = pygame.display.set_mode((LARGURA, ALTURA), pygame.RESIZABLE if LOWRES else 0)
+    START_MOVE_DELAY = start_delay
+
+# Tempo entre pedir uma partida (Iniciar / jogar de novo) e o primeiro frame dela (ms)
+ROUND_START = LatencyStats()
+_round_requested_at = None
+
+def main(headless=False, timings=False, autopilot=False, profile=False):
+    """Sessão: menu -> playing -> game_over -> menu ou playing de novo, sem reiniciar o processo.
+
+    Com autopilot=True começa direto jogando no autopilot e emenda as partidas
+    sozinho (teste longo sem ninguém no teclado). Com profile=True o profiler
+    já começa ligado e o perfil é exportado na saída.
+    """
+    global REPORT_TIMINGS, _round_requested_at
+    REPORT_TIMINGS = timings
+    if profile:
+        import atexit
+        PROFILER.enable()
+        atexit.register(export_profile)
+    init_runtime(headless)
+    if timings:
+        import atexit
+        atexit.register(lambda: print(pacing_report()))
+    soak = autopilot
+    state = "playing" if soak else "menu"
+    score = 0
     while True:
-        action = menu_principal()
-        if action == 'start':
-            # pegar seleção atual
-            nome, gw, gh, start_delay = CURRENT_DIFFICULTY
-            global PIXEL, GRID_W, GRID_H, LARGURA, ALTURA, tela, START_MOVE_DELAY
-            PIXEL = 20
-            GRID_W = gw
-            GRID_H = gh
-            LARGURA = GRID_W * PIXEL
-            ALTURA = GRID_H * PIXEL
-            tela = pygame.display.set_mode((LARGURA, ALTURA))
-            START_MOVE_DELAY = start_delay
+        if state == "menu":
+            # menu principal
+            escolha = menu_principal()
+            if escolha in ('start', 'autopilot'):
+                autopilot = escolha == 'autopilot'
+                _round_requested_at = time.perf_counter()
+                state = "playing"
+        elif state == "playing":
+            difficulty = globals().get('CURRENT_DIFFICULTY', DEFAULT_DIFFICULTY)
+            apply_difficulty(difficulty)
             # trocar para música de jogatina (adicione sounds/play.mp3)
             try:
                 play_music_file(PLAY_MUSIC_PATH, loops=-1)
             except Exception:
                 pass
-            jogo()
+            if is_world(difficulty):
+                score = jogo_mundo(difficulty, autopilot=autopilot)
+            else:
+                score = jogo(autopilot=autopilot)
+            state = "game_over"
+        elif state == "game_over":
+            # score do autopilot não entra no placar
+            state = game_over(score, submit=not autopilot, auto_retry_ms=1500 if soak else None)
+            if state == "retry":
+                _round_requested_at = time.perf_counter()
+                state = "playing"
+
+def play_replay(path, headless=False):
+    """Reproduz um replay gravado na janela do jogo e retorna o score final."""
+    from replay import ReplayReader
+    reader = ReplayReader(path)
+    init_runtime(headless)
+    apply_difficulty((reader.difficulty, reader.grid_w, reader.grid_h, reader.start_delay))
+    return jogo(replay=reader)
+
+STARTUP_TIMES["import"] = (time.perf_counter() - _IMPORT_T0) * 1000
 
 if __name__ == '__main__':
     try:
-        main()
+        headless = '--headless' in sys.argv or os.environ.get('SNAKE_HEADLESS') == '1'
+        if '--world' in sys.argv:
+            CURRENT_DIFFICULTY = WORLD_PRESET
+        if '--lowres' in sys.argv:
+            # --lowres [CELL]: playfield com CELL pixels por célula (padrão LOWRES_CELL) e upscale
+            LOWRES = True
+            i = sys.argv.index('--lowres') + 1
+            if i < len(sys.argv) and sys.argv[i].isdigit():
+                LOWRES_CELL = int(sys.argv[i])
+        if '--tournament' in sys.argv:
+            # partidas sem janela em vários processos; o resto da linha vai para o tournament.py
+            import tournament
+            sys.exit(tournament.main(sys.argv[sys.argv.index('--tournament') + 1:]))
+        if '--versus' in sys.argv or '--connect' in sys.argv:
+            # --versus [BOTS]: servidor local com bots; --connect HOST[:PORTA]: servidor de outra máquina
+            if '--connect' in sys.argv:
+                alvo = sys.argv[sys.argv.index('--connect') + 1]
+                host, _, porta = alvo.partition(':')
+                score = play_versus(host, int(porta) if porta else None, headless=headless)
+            else:
+                i = sys.argv.index('--versus') + 1
+                bots = int(sys.argv[i]) if i < len(sys.argv) and sys.argv[i].isdigit() else 3
+                score = play_versus(bots=bots, headless=headless)
+            print(f"Score: {score}")
+        elif '--replay' in sys.argv:
+            print(f"Score: {play_replay(sys.argv[sys.argv.index('--replay') + 1], headless)}")
+        else:
+            main(headless=headless, timings='--timings' in sys.argv, autopilot='--autopilot' in sys.argv,
+                 profile='--profile' in sys.argv)
     except Exception:
         import traceback
         traceback.print_exc()
@@ -0,0 +1,212 @@
+"""Render da cobra: gradiente em tabela e blocos pré-renderizados.
+
+A cor do segmento i depende só de i e do tamanho da cobra, então o gradiente
+de cada tamanho é calculado uma vez (LUT) e cada cor vira um bloco PIXEL x
+PIXEL pronto. O gradiente é quantizado em no máximo BANDS faixas contadas a
+partir da cauda (band_gradient): a faixa de um segmento só depende da sua
+distância até a cauda, então quando a cobra come os segmentos de antes
+continuam com a mesma cor.
+
+Dois jeitos de desenhar o corpo:
+
+- update_base(): incremental, na base do Compositor. O corpo fica na tela
+  entre os frames e a cada passo só são desenhadas as células cujo bloco
+  mudou (célula nova atrás da cabeça, cauda que saiu e as bordas entre as
+  faixas de cor, que andam uma célula). O renderer guarda uma cópia do
+  corpo desenhado e, quando a cobra andou k passos, só olha essas células:
+  os índices que mudam para cada (tamanho antigo, tamanho novo, k) são
+  calculados uma vez. Custo por frame zero e por passo até ~BANDS + 2
+  blocos (2 blits cada, base e tela), não o tamanho da cobra: no
+  benchmark.py um passo custa 0.26-0.38 ms de 100 a 1799 segmentos, contra
+  0.68 ms de um draw_body() com 100 e 9.4 ms com 1799. Sem as faixas
+  (~60 cores) o passo custava ~1.5 ms.
+- draw_body(): tudo num único Surface.blits() (sem compositor); a lista de
+  blits é reaproveitada enquanto `tick` não muda.
+"""
+from collections import OrderedDict, deque
+
+import pygame
+
+from profiler import count_surface
+
+# com mais retângulos que isso, marca só a união (menos trabalho no display.update)
+MAX_RECTS = 32
+# passos entre duas chamadas de update_base acima disso redesenham o corpo todo
+MAX_SHIFT = 8
+# faixas de cor do corpo, no máximo (cada borda entre faixas custa um bloco por passo)
+BANDS = 24
+
+
+def gradient(length, head, start, end):
+    """Cores dos segmentos: cabeça `head`, corpo de lerp(start, end, 1) até lerp(start, end, 0.4)."""
+    cores = [head]
+    span = max(1, length - 1)
+    for i in range(1, length):
+        t = 1 - (i / span) * 0.6
+        cores.append((int(start[0] + (end[0] - start[0]) * t),
+                      int(start[1] + (end[1] - start[1]) * t),
+                      int(start[2] + (end[2] - start[2]) * t)))
+    return cores
+
+
+def band_gradient(length, head, start, end, bands=BANDS):
+    """gradient() em no máximo `bands` faixas de `width` segmentos, contadas a partir da cauda.
+
+    Até bands + 1 segmentos é igual ao gradient(). A largura e o número de
+    faixas só mudam a cada `width` segmentos de crescimento.
+    """
+    body = length - 1
+    if body <= 0:
+        return [head][:length]
+    width = -(-body // bands)
+    n = -(-body // width)
+    cores = gradient(n + 1, head, start, end)
+    # segmento i está a body - i da cauda; faixa 0 (a da cauda) é a cor mais escura
+    return [head] + [cores[n - (body - i) // width] for i in range(1, length)]
+
+
+class SnakeRenderer:
+    def __init__(self, pixel, head_color, start_color, end_color, max_luts=16, bands=BANDS):
+        self.pixel = pixel
+        self.bands = bands
+        self.head_color = head_color
+        self.start_color = start_color
+        self.end_color = end_color
+        self.max_luts = max_luts
+        self._luts = OrderedDict()
+        self._tiles = {}
+        self._seq_key = None
+        self._seq = None
+        self._rects = None
+        self._body = None
+        self._body_lut = None
+        self._shift_diffs = OrderedDict()
+        self._base_key = None
+        self._base_tick = None
+        self.last_changed = 0
+
+    def colors(self, length):
+        lut = self._luts.get(length)
+        if lut is None:
+            # LUT guarda o bloco pronto de cada segmento, não só a cor
+            cores = band_gradient(length, self.head_color, self.start_color, self.end_color, self.bands)
+            lut = [self.tile(c) for c in cores]
+            self._luts[length] = lut
+            if len(self._luts) > self.max_luts:
+                self._luts.popitem(last=False)
+        else:
+            self._luts.move_to_end(length)
+        return lut
+
+    def tile(self, color):
+        surf = self._tiles.get(color)
+        if surf is None:
+            surf = pygame.Surface((self.pixel, self.pixel)).convert()
+            count_surface()
+            surf.fill(color)
+            self._tiles[color] = surf
+        return surf
+
+    def draw_body(self, surf, cobra, tick=None):
+        """Segmentos 1.. (sem a cabeça) num blits(); retorna retângulos para o compositor."""
+        if tick is None or tick != self._seq_key:
+            p = self.pixel
+            tiles = self.colors(len(cobra))
+            it = iter(cobra)
+            next(it, None)
+            self._seq = [(tiles[i], (x * p, y * p)) for i, (x, y) in enumerate(it, 1)]
+            self._seq_key = tick
+            self._rects = None
+        if self._rects is not None:
+            surf.blits(self._seq, doreturn=0)
+            return self._rects
+        rects = surf.blits(self._seq)
+        self._rects = rects if len(rects) <= MAX_RECTS else [rects[0].unionall(rects)]
+        return self._rects
+
+    def update_base(self, comp, cobra, tick=None):
+        """Corpo (sem a cabeça) na base do compositor; chamar depois de comp.begin_frame()."""
+        key = (id(comp), comp.base_version)
+        if key != self._base_key:
+            # base nova (outra partida, level-up, invalidate): não tem cobra nenhuma
+            self._body = None
+            self._base_key = key
+        elif tick is not None and tick == self._base_tick:
+            return
+        self._base_tick = tick
+        tiles = self.colors(len(cobra))
+        changed = None
+        if self._body is not None:
+            changed = self._advance(comp, cobra, tiles)
+        if changed is None:
+            changed = self._redraw(comp, cobra, tiles)
+        self._body_lut = tiles
+        # células redesenhadas no último passo (para medir)
+        self.last_changed = changed
+
+    def _advance(self, comp, cobra, tiles):
+        """Anda o corpo desenhado até `cobra`; None se não for o mesmo corpo k passos depois."""
+        body = self._body
+        old_head = body[0]
+        for k in range(min(len(cobra), MAX_SHIFT + 1)):
+            if cobra[k] == old_head:
+                break
+        else:
+            return None
+        old_len, new_len = len(body), len(cobra)
+        freed = old_len + k - new_len
+        if freed < 0 or cobra[-1] != body[new_len - k - 1]:
+            return None
+        if k == 0:
+            return 0 if freed == 0 else None
+        if k + 1 < new_len and cobra[k + 1] != body[1]:
+            return None
+        p = self.pixel
+        changed = freed
+        # primeiro apaga a cauda: a cabeça pode ter entrado numa célula que saiu
+        for _ in range(freed):
+            x, y = body.pop()
+            comp.erase_on_base((x * p, y * p, p, p))
+        for i in range(k - 1, -1, -1):
+            body.appendleft(cobra[i])
+        for j in self._shift_diff(self._body_lut, tiles, k):
+            x, y = body[j]
+            comp.draw_on_base(tiles[j], (x * p, y * p))
+            changed += 1
+        return changed
+
+    def _shift_diff(self, old, new, k):
+        """Índices do corpo novo cujo bloco muda quando a cobra anda k passos (old -> new)."""
+        key = (len(old), len(new), k)
+        diff = self._shift_diffs.get(key)
+        if diff is None:
+            # 1..k: células novas atrás da cabeça; depois, onde o bloco do índice mudou
+            diff = list(range(1, min(k + 1, len(new))))
+            diff += [j for j in range(k + 1, len(new)) if new[j] is not old[j - k]]
+            self._shift_diffs[key] = diff
+            if len(self._shift_diffs) > self.max_luts:
+                self._shift_diffs.popitem(last=False)
+        else:
+            self._shift_diffs.move_to_end(key)
+        return diff
+
+    def _redraw(self, comp, cobra, tiles):
+        """Corpo inteiro de novo (base nova, ou a cobra não é a de antes: reset, seek)."""
+        p = self.pixel
+        changed = 0
+        if self._body is not None:
+            it = iter(self._body)
+            next(it, None)
+            for x, y in it:
+                comp.erase_on_base((x * p, y * p, p, p))
+                changed += 1
+        it = iter(cobra)
+        next(it, None)
+        for i, (x, y) in enumerate(it, 1):
+            comp.draw_on_base(tiles[i], (x * p, y * p))
+            changed += 1
+        self._body = deque(cobra)
+        return changed
+
+    def head_tile(self):
+        return self.tile(self.head_color)
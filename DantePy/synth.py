@@ -0,0 +1,172 @@
+"""Síntese de efeitos sonoros em memória (sem escrever WAV no disco).
+
+tone() monta o buffer inteiro de uma vez (numpy, ou array.array sem numpy)
+no formato do mixer e cria pygame.mixer.Sound(buffer=...). Os sons ficam em
+cache por (freq, duração, volume, samplerate, forma de onda, envelope).
+freq pode ser uma tupla de frequências para tocar um acorde.
+
+Formato -32 do mixer é ambíguo: o pygame informa -32 tanto para float32
+(mixer.init(size=32)) quanto para int32 (formato escolhido pelo
+dispositivo). Nesse caso o som vai como um WAV de 16 bits em memória e o
+SDL converte para o que o mixer usa de verdade.
+"""
+import io
+import math
+import wave
+from array import array
+
+import pygame
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+WAVEFORMS = ("sine", "square", "triangle", "saw")
+
+_sounds = {}
+hits = 0
+misses = 0
+
+
+def _wave_numpy(freqs, n, samplerate, waveform):
+    t = np.arange(n, dtype=np.float64) / samplerate
+    out = np.zeros(n, dtype=np.float64)
+    for f in freqs:
+        phase = (t * f) % 1.0
+        if waveform == "sine":
+            out += np.sin(2.0 * np.pi * phase)
+        elif waveform == "square":
+            out += np.where(phase < 0.5, 1.0, -1.0)
+        elif waveform == "triangle":
+            out += 4.0 * np.abs(phase - 0.5) - 1.0
+        else:
+            out += 2.0 * phase - 1.0
+    return out / len(freqs)
+
+
+def _wave_python(freqs, n, samplerate, waveform):
+    def one(phase):
+        if waveform == "sine":
+            return math.sin(2.0 * math.pi * phase)
+        if waveform == "square":
+            return 1.0 if phase < 0.5 else -1.0
+        if waveform == "triangle":
+            return 4.0 * abs(phase - 0.5) - 1.0
+        return 2.0 * phase - 1.0
+    k = 1.0 / len(freqs)
+    return [k * sum(one((i * f / samplerate) % 1.0) for f in freqs) for i in range(n)]
+
+
+def _envelope(n, samplerate, envelope):
+    # envelope = (attack_ms, release_ms): rampas lineares de entrada e saída
+    attack = min(n, int(samplerate * envelope[0] / 1000.0))
+    release = min(n - attack, int(samplerate * envelope[1] / 1000.0))
+    if np is not None:
+        env = np.ones(n)
+        if attack:
+            env[:attack] = np.linspace(0.0, 1.0, attack, endpoint=False)
+        if release:
+            env[n - release:] = np.linspace(1.0, 0.0, release)
+        return env
+    env = [1.0] * n
+    for i in range(attack):
+        env[i] = i / attack
+    for i in range(release):
+        env[n - release + i] = 1.0 - (i + 1) / release
+    return env
+
+
+def samples(freq=440, duration_ms=200, volume=0.5, samplerate=44100, waveform="sine", envelope=None):
+    """Amostras float em [-volume, volume] (array numpy ou lista)."""
+    if waveform not in WAVEFORMS:
+        raise ValueError(f"forma de onda desconhecida: {waveform}")
+    freqs = tuple(freq) if isinstance(freq, (tuple, list)) else (freq,)
+    n = int(samplerate * (duration_ms / 1000.0))
+    if np is not None:
+        out = _wave_numpy(freqs, n, samplerate, waveform) * volume
+        if envelope:
+            out *= _envelope(n, samplerate, envelope)
+        return out
+    out = _wave_python(freqs, n, samplerate, waveform)
+    env = _envelope(n, samplerate, envelope) if envelope else None
+    return [s * volume * (env[i] if env else 1.0) for i, s in enumerate(out)]
+
+
+def _pcm16(data):
+    if np is not None:
+        return (np.asarray(data) * 32767).astype('<i2')
+    return array('h', (int(s * 32767) for s in data))
+
+
+def _to_mixer_buffer(data, fmt, channels):
+    """Converte amostras float mono para o formato `fmt` (8, -8, 16, -16 ou 32 = float32) e canais."""
+    if fmt == -32:
+        raise ValueError("formato -32 é ambíguo (float32 ou int32): usar _wav_bytes")
+    bits = abs(fmt)
+    if np is not None:
+        data = np.asarray(data)
+        if fmt == 32:
+            pcm = data.astype(np.float32)
+        elif bits == 8:
+            pcm = (data * 127).astype(np.int8) if fmt < 0 else (data * 127 + 128).astype(np.uint8)
+        else:
+            pcm = (data * 32767).astype(np.int16)
+        if channels > 1:
+            pcm = np.repeat(pcm, channels)
+        return pcm.tobytes()
+    if fmt == 32:
+        pcm = array('f', data)
+    elif bits == 8:
+        pcm = array('b', (int(s * 127) for s in data)) if fmt < 0 else array('B', (int(s * 127 + 128) for s in data))
+    else:
+        pcm = _pcm16(data)
+    if channels > 1:
+        pcm = array(pcm.typecode, (s for s in pcm for _ in range(channels)))
+    return pcm.tobytes()
+
+
+def tone(freq=440, duration_ms=200, volume=0.5, samplerate=None, waveform="sine", envelope=None):
+    """pygame.mixer.Sound gerado em memória, com cache. Precisa do mixer iniciado."""
+    global hits, misses
+    if samplerate is None:
+        samplerate = pygame.mixer.get_init()[0]
+    key = (tuple(freq) if isinstance(freq, (tuple, list)) else freq,
+           duration_ms, volume, samplerate, waveform, envelope)
+    sound = _sounds.get(key)
+    if sound is not None:
+        hits += 1
+        return sound
+    misses += 1
+    data = samples(freq, duration_ms, volume, samplerate, waveform, envelope)
+    _, fmt, channels = pygame.mixer.get_init()
+    if fmt == -32:
+        sound = pygame.mixer.Sound(file=io.BytesIO(_wav_bytes(data, samplerate)))
+    else:
+        sound = pygame.mixer.Sound(buffer=_to_mixer_buffer(data, fmt, channels))
+    _sounds[key] = sound
+    return sound
+
+
+def _write_wav(f, data, samplerate):
+    # f: caminho ou arquivo aberto (o wave não fecha um arquivo que não abriu)
+    with wave.open(f, 'wb') as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(samplerate)
+        wf.writeframes(_pcm16(data).tobytes())
+
+
+def _wav_bytes(data, samplerate):
+    buf = io.BytesIO()
+    _write_wav(buf, data, samplerate)
+    return buf.getvalue()
+
+
+def write_wav(path, freq=440, duration_ms=200, volume=0.5, samplerate=44100, waveform="sine", envelope=None):
+    """Salva o tom num WAV mono 16 bits (uma chamada de writeframes)."""
+    _write_wav(path, samples(freq, duration_ms, volume, samplerate, waveform, envelope), samplerate)
+
+
+def cache_stats():
+    return {"hits": hits, "misses": misses, "size": len(_sounds)}
@@ -0,0 +1,51 @@
+"""Testes do piloto automático (rodar: python -m pytest)."""
+import pytest
+
+from autopilot import Autopilot, run
+from engine import SnakeEngine, DIFFICULTIES, FREE, RIGHT
+
+NORMAL = DIFFICULTIES[1]
+
+
+def test_food_on_head_does_not_crash():
+    engine = SnakeEngine(20, 14, seed=0)
+    # estado carregado com a comida embaixo da cabeça: o A* devolve caminho vazio
+    engine.load([(5, 5), (4, 5), (3, 5)], RIGHT, (5, 5))
+    pilot = Autopilot(20, 14)
+    cell = pilot._decide(engine)
+    assert cell is not None and engine.grid[cell] == FREE
+    assert pilot.decide(engine) is not None
+
+
+@pytest.mark.parametrize("seed", [277, 0, 1])
+def test_plays_normal_without_crashing(seed):
+    results, pilot = run(1, NORMAL, seed=seed, max_ticks=2000)
+    _, ticks, _ = results[0]
+    assert ticks > 0 and pilot.plans > 0
+
+
+def test_distance_cache_follows_obstacle_changes():
+    _, gw, gh, delay = NORMAL
+    pilot = Autopilot(gw, gh)
+    engine = SnakeEngine(gw, gh, delay, seed=3)
+    food = engine.comida[1] * gw + engine.comida[0]
+    before = pilot._distances(engine, food)[:]
+    # mesma comida, obstáculos novos numa lista nova: a tabela tem que ser refeita
+    fx, fy = engine.comida
+    wall = [((fx + 1) % gw, fy), ((fx - 1) % gw, fy), (fx, (fy + 1) % gh), (fx, (fy - 1) % gh)]
+    engine.load(engine.cobra, engine.direcao, engine.comida, wall)
+    after = pilot._distances(engine, food)
+    assert after != before
+    assert all(after[y * gw + x] == -1 for x, y in wall)
+
+
+def test_shared_pilot_across_games():
+    # o torneio usa um Autopilot por processo para várias partidas seguidas
+    _, gw, gh, delay = NORMAL
+    pilot = Autopilot(gw, gh)
+    for seed in range(3):
+        engine = SnakeEngine(gw, gh, delay, seed=seed)
+        pilot.reset()
+        while engine.alive and engine.ticks < 1500:
+            engine.step(pilot.decide(engine))
+        assert engine.score > 0, seed
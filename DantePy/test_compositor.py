@@ -0,0 +1,71 @@
+"""Testes do Compositor: retângulos sujos, mark_full e invalidate (rodar: python -m pytest)."""
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+
+def _compositor(screen):
+    from compositor import Compositor
+    comp = Compositor(screen, display=False)
+    comp.set_layer("background", 1, lambda surf: surf.fill((10, 20, 30)))
+    return comp
+
+
+def _frame(comp, *rects):
+    comp.begin_frame()
+    for r in rects:
+        comp.mark(r)
+    comp.end_frame()
+
+
+def test_dirty_rects_accumulate_previous_and_current(display):
+    comp = _compositor(display)
+    area = 64 * 64
+    _frame(comp)                      # primeiro frame: tela toda
+    assert (comp.full_frames, comp.pixels_updated) == (1, area)
+    _frame(comp, (0, 0, 4, 4), (10, 10, 2, 3))
+    assert comp.pixels_updated == area + 16 + 6
+    # o frame seguinte manda também os retângulos do anterior (para apagar o que saiu)
+    _frame(comp, (20, 20, 5, 5))
+    assert comp.pixels_updated == area + 22 + 22 + 25
+    assert comp.full_frames == 1
+
+
+def test_mark_full_updates_two_frames(display):
+    comp = _compositor(display)
+    _frame(comp)
+    comp.begin_frame()
+    comp.mark_full()
+    comp.end_frame()
+    _frame(comp)                      # restaura a tela inteira depois do overlay
+    _frame(comp, (0, 0, 1, 1))
+    assert comp.full_frames == 3
+    assert comp.stats()["frames"] == 4
+
+
+def test_invalidate_and_new_layer_force_full_frame(display):
+    comp = _compositor(display)
+    _frame(comp)
+    comp.invalidate()
+    _frame(comp, (0, 0, 1, 1))
+    assert comp.full_frames == 2
+    version = comp.base_version
+    comp.set_layer("background", 2, lambda surf: surf.fill((0, 0, 0)))
+    _frame(comp)
+    assert comp.full_frames == 3 and comp.base_version == version + 1
+    comp.set_layer("background", 2, lambda surf: surf.fill((0, 0, 0)))  # mesma chave: nada muda
+    _frame(comp)
+    assert comp.full_frames == 3
+
+
+def test_erase_on_base_restores_layers(display):
+    comp = _compositor(display)
+    comp.begin_frame()
+    tile = pygame.Surface((4, 4))
+    tile.fill((255, 0, 0))
+    comp.draw_on_base(tile, (8, 8))
+    assert comp.base.get_at((9, 9))[:3] == (255, 0, 0)
+    comp.erase_on_base((8, 8, 4, 4))
+    assert comp.base.get_at((9, 9))[:3] == (10, 20, 30)
+    assert display.get_at((9, 9))[:3] == (10, 20, 30)
+    comp.end_frame()
@@ -0,0 +1,105 @@
+"""Testes do SnakeEngine e do BatchEngine (rodar: python -m pytest)."""
+import random
+
+import pytest
+
+from engine import SnakeEngine, BatchEngine, DIRECTIONS, FREE, SNAKE, LEFT, clamp_dir
+
+
+def greedy(engine):
+    """Direção que aproxima da comida sem bater (ou a atual, se nenhuma serve)."""
+    w, h = engine.grid_w, engine.grid_h
+    hx, hy = engine.cobra[0]
+    fx, fy = engine.comida
+    best = None
+    for d in DIRECTIONS:
+        if clamp_dir(d, engine.direcao) != d:
+            continue
+        nx, ny = (hx + d[0]) % w, (hy + d[1]) % h
+        if engine.cell(nx, ny) != FREE:
+            continue
+        dist = min((nx - fx) % w, (fx - nx) % w) + min((ny - fy) % h, (fy - ny) % h)
+        if best is None or dist < best[0]:
+            best = (dist, d)
+    return engine.direcao if best is None else best[1]
+
+
+def snake_path(w, h):
+    """Zigue-zague pelas linhas: células vizinhas em sequência cobrindo o grid."""
+    path = []
+    for y in range(h):
+        xs = range(w) if y % 2 == 0 else range(w - 1, -1, -1)
+        path.extend((x, y) for x in xs)
+    return path
+
+
+def test_initial_food_never_on_snake():
+    engine = SnakeEngine(40, 28)
+    for seed in range(500):
+        engine.reset(seed)
+        assert engine.cell(*engine.comida) == FREE, seed
+
+
+def test_free_cells_match_grid():
+    engine = SnakeEngine(30, 20, seed=3)
+    for _ in range(3000):
+        if engine.step(greedy(engine)) in ("dead", "full"):
+            break
+    livres = {i for i, v in enumerate(engine.grid) if v == FREE}
+    assert set(engine.free.cells) == livres
+    assert all(engine.free.cells[engine.free.pos[c]] == c for c in livres)
+
+
+def test_full_board_ends_round():
+    engine = SnakeEngine(6, 6, seed=0)
+    path = snake_path(6, 6)
+    # cobra em todas as células menos a última, com a cabeça do lado da comida
+    engine.load(path[-2::-1], LEFT, path[-1])
+    assert engine.step(LEFT) == "full"
+    assert not engine.alive
+    assert engine.comida is None
+
+
+def _copy_into_batch(engine, batch, b=0):
+    import numpy as np
+    w = engine.grid_w
+    batch.occ[b] = np.frombuffer(bytes(engine.grid), dtype=np.uint8)
+    cells = [y * w + x for x, y in reversed(engine.cobra)]  # cauda ... cabeça
+    batch.body[b, :len(cells)] = cells
+    batch.head_ptr[b] = len(cells) - 1
+    batch.length[b] = len(cells)
+    batch.food[b] = engine.comida[1] * w + engine.comida[0]
+    batch.dir[b] = DIRECTIONS.index(engine.direcao)
+    batch.score[b] = engine.score
+    batch.level[b] = engine.level
+    batch.move_delay[b] = engine.move_delay
+    batch.n_obstacles[b] = len(engine.obstacles)
+    batch._rebuild_free(np.array([b]))
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3, 4])
+def test_batch_engine_matches_snake_engine(seed):
+    pytest.importorskip("numpy")
+    engine = SnakeEngine(20, 14, start_delay=140, seed=seed)
+    batch = BatchEngine(1, 20, 14, start_delay=140, seed=seed, autoreset=False)
+    initial = batch.snake_cells(0)
+    assert (batch.occ[0] == SNAKE).sum() == 3
+    assert batch.food[0] not in [y * 20 + x for x, y in initial]
+    _copy_into_batch(engine, batch)
+    rng = random.Random(seed)
+    for _ in range(2000):
+        # de vez em quando uma direção qualquer, para também testar as mortes
+        d = rng.choice(DIRECTIONS) if rng.random() < 0.05 else greedy(engine)
+        evento = engine.step(d)
+        ate, died = batch.step([DIRECTIONS.index(d)])
+        assert bool(died[0]) == (evento in ("dead", "full"))
+        if died[0]:
+            break
+        assert bool(ate[0]) == (evento in ("eat", "level"))
+        assert batch.snake_cells(0) == list(engine.cobra)
+        assert (int(batch.score[0]), int(batch.level[0]), int(batch.move_delay[0])) == \
+            (engine.score, engine.level, engine.move_delay)
+        if ate[0]:
+            # comida e obstáculos novos vêm de RNGs diferentes: volta a alinhar
+            _copy_into_batch(engine, batch)
+    assert engine.ticks > 10
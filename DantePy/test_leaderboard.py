@@ -0,0 +1,58 @@
+"""Testes do Leaderboard (rodar: python -m pytest)."""
+import json
+
+from leaderboard import Leaderboard
+
+
+def _write(path, text):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write(text)
+
+
+def test_records_survive_reload(tmp_path):
+    path = str(tmp_path / "leaderboard.log")
+    board = Leaderboard(path, top_n=3)
+    for score in (5, 9, 1, 7):
+        board.submit("Normal", score)
+    board.flush()
+    assert [s for s, _ in Leaderboard(path, top_n=3).top("Normal")] == [9, 7, 5]
+
+
+def test_torn_last_line_does_not_swallow_next_record(tmp_path):
+    path = str(tmp_path / "leaderboard.log")
+    ok = json.dumps({"d": "Normal", "s": 4, "t": 1.0})
+    _write(path, ok + "\n" + '{"d": "Normal", "s": 1')
+    board = Leaderboard(path)
+    assert [s for s, _ in board.top("Normal")] == [4]
+    board.submit("Normal", 12)
+    board.flush()
+    reloaded = Leaderboard(path)
+    assert [s for s, _ in reloaded.top("Normal")] == [12, 4]
+    with open(path, encoding='utf-8') as f:
+        assert all(json.loads(line) for line in f)
+
+
+def test_complete_last_line_without_newline_is_kept(tmp_path):
+    path = str(tmp_path / "leaderboard.log")
+    _write(path, json.dumps({"d": "Normal", "s": 6, "t": 1.0}))
+    board = Leaderboard(path)
+    board.submit("Normal", 3)
+    board.flush()
+    assert [s for s, _ in Leaderboard(path).top("Normal")] == [6, 3]
+
+
+def test_migrates_legacy_highscore(tmp_path):
+    legacy = tmp_path / "highscore.txt"
+    legacy.write_text("42")
+    board = Leaderboard(str(tmp_path / "leaderboard.log"), legacy_path=str(legacy))
+    assert board.best("Normal") == 42
+
+
+def test_submit_before_load_finishes_keeps_old_records(tmp_path):
+    path = str(tmp_path / "leaderboard.log")
+    _write(path, "".join(json.dumps({"d": "Normal", "s": s, "t": 1.0}) + "\n" for s in (8, 2)))
+    board = Leaderboard(path, top_n=3)
+    board.submit("Normal", 5)  # a leitura roda na thread; o envio não espera
+    board.flush()
+    assert [s for s, _ in board.top("Normal")] == [8, 5, 2]
+    assert [s for s, _ in Leaderboard(path, top_n=3).top("Normal")] == [8, 5, 2]
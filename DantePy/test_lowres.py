@@ -0,0 +1,53 @@
+"""Testes do layout do LowResScreen (rodar: python -m pytest)."""
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+BG = (9, 9, 9)
+COR = (200, 40, 40)
+
+
+@pytest.fixture
+def screen(display):
+    from lowres import LowResScreen
+    screen = LowResScreen(10, 5, cell=2, bg=BG)  # superfície lógica 20x10
+    screen.surface.fill(COR)
+    return screen
+
+
+def test_integer_scale_centered_with_letterbox(screen):
+    target = screen.layout()
+    # janela 64x64: escala 3 (limitada pela largura), centralizado
+    assert screen.scale == 3
+    assert screen.native_cell == 6
+    assert screen.view == pygame.Rect(2, 17, 60, 30)
+    assert target.get_size() == (60, 30)
+    screen.upscale()
+    window = pygame.display.get_surface()
+    assert window.get_at((0, 0))[:3] == BG
+    assert window.get_at((1, 32))[:3] == BG
+    assert window.get_at((2, 17))[:3] == COR
+    assert window.get_at((61, 46))[:3] == COR
+    assert window.get_at((32, 47))[:3] == BG
+
+
+def test_layout_follows_a_resized_window(screen):
+    screen.layout()
+    assert screen.layout() is screen.target  # mesmo tamanho: nada refeito
+    pygame.display.set_mode((100, 40))
+    target = screen.layout()
+    assert screen.scale == 4
+    assert screen.view == pygame.Rect(10, 0, 80, 40)
+    assert target.get_parent() is pygame.display.get_surface()
+
+
+def test_window_smaller_than_the_playfield(screen):
+    pygame.display.set_mode((15, 8))
+    target = screen.layout()
+    assert screen.scale == 1
+    assert screen.view == pygame.Rect(-3, -1, 20, 10)
+    # não cabe numa subsurface: upscale numa superfície à parte, recortada no flip
+    assert target.get_parent() is None and target.get_size() == (20, 10)
+    screen.upscale()
+    screen.flip()
+    assert pygame.display.get_surface().get_at((0, 0))[:3] == COR
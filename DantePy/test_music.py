@@ -0,0 +1,27 @@
+"""Testes do MusicManager (rodar: python -m pytest)."""
+import time
+
+import pytest
+
+pytest.importorskip("pygame")
+
+from music import MusicManager  # noqa: E402
+
+
+def test_missing_tracks_are_reported_once(tmp_path):
+    faixa = tmp_path / "menu.ogg"
+    faixa.write_bytes(b"ogg")
+    falta = str(tmp_path / "nada.ogg")
+    music = MusicManager([str(faixa), falta]).start()
+    try:
+        fim = time.monotonic() + 2.0
+        while music.warm_ms is None and time.monotonic() < fim:
+            time.sleep(0.01)
+        stats = music.stats()
+        assert (stats["tracks"], stats["missing"]) == (1, [falta])
+        assert music.ready(str(faixa))
+        assert music.pop_missing() == [falta]
+        assert music.pop_missing() == []
+        assert music.stats()["missing"] == [falta]
+    finally:
+        music.close()
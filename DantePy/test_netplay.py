@@ -0,0 +1,65 @@
+"""Testes do servidor versus com mensagens malformadas (rodar: python -m pytest)."""
+import asyncio
+
+import pytest
+
+from engine import DIRECTIONS
+from netplay import (VersusServer, VersusClient, NetThread, FrameError, MSG_INPUT, MSG_DELTA,
+                     encode_input, frame, read_frame)
+
+
+async def _send_bad(raw):
+    """Conecta, manda `raw` e devolve (o servidor fechou a conexão?, servidor)."""
+    server = await VersusServer(20, 14, tick_ms=20, seed=1, host="127.0.0.1", port=0).start()
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        await read_frame(reader)  # WELCOME
+        writer.write(raw)
+        closed = False
+        try:
+            while True:
+                await asyncio.wait_for(read_frame(reader), 2.0)
+        except asyncio.IncompleteReadError:
+            closed = True
+        writer.close()
+        # um cliente bom continua jogando normalmente
+        client = await VersusClient("127.0.0.1", server.port).connect()
+        client.send_input(DIRECTIONS[0])
+        while await client.recv() != MSG_DELTA:
+            pass
+        client.close()
+        return closed, server
+    finally:
+        await server.stop()
+
+
+@pytest.mark.parametrize("raw", [
+    b"\x00",                                  # corpo vazio
+    frame(bytes([MSG_INPUT])),                # INPUT sem a direção
+    frame(bytes([MSG_INPUT, 9])),             # direção fora de DIRECTIONS
+    frame(bytes([42, 0])),                    # tipo desconhecido
+    b"\xff\xff\xff\xff\x0f",                  # tamanho de 4 GB
+], ids=["empty", "short", "direction", "type", "huge"])
+def test_bad_frame_drops_only_that_client(raw):
+    closed, server = asyncio.run(_send_bad(raw))
+    assert closed
+    assert server.rejected == 1
+    assert not server.clients
+
+
+def test_read_frame_limit():
+    async def read(raw, limit):
+        reader = asyncio.StreamReader()
+        reader.feed_data(raw)
+        reader.feed_eof()
+        return await read_frame(reader, limit)
+    assert asyncio.run(read(encode_input(DIRECTIONS[1]), 2)) == bytes([MSG_INPUT, 1])
+    with pytest.raises(FrameError):
+        asyncio.run(read(frame(b"x" * 100), 64))
+
+
+def test_net_thread_stop_is_idempotent():
+    net = NetThread(local_bots=1, tick_ms=20, grid=(20, 14)).start()
+    net.stop()
+    assert not net._thread.is_alive()
+    net.stop()
@@ -0,0 +1,72 @@
+"""Testes da geração de obstáculos (rodar: python -m pytest)."""
+import random
+
+from obstacles import LayoutCache, generate_obstacles, neighbours, obstacle_count
+
+
+def regions(grid, grid_w, grid_h):
+    """Quantas regiões de células livres (com wrap) o grid tem."""
+    seen = bytearray(len(grid))
+    total = 0
+    for start in range(len(grid)):
+        if grid[start] or seen[start]:
+            continue
+        total += 1
+        seen[start] = 1
+        pilha = [start]
+        while pilha:
+            for n in neighbours(pilha.pop(), grid_w, grid_h):
+                if not grid[n] and not seen[n]:
+                    seen[n] = 1
+                    pilha.append(n)
+    return total
+
+
+def test_layout_does_not_seal_against_the_body():
+    w = h = 6
+    grid = bytearray(w * h)
+    # duas colunas de cobra; a célula (2, 3) é a única passagem entre as regiões
+    for y in range(h):
+        if y != 3:
+            grid[y * w + 2] = 1
+        grid[y * w + 4] = 1
+    assert regions(grid, w, h) == 1
+    cells = generate_obstacles(random.Random(0), w, h, 1, occupied=grid, start=[3 * w + 2])
+    assert (2, 3) not in cells
+    for x, y in cells:
+        grid[y * w + x] = 2
+    assert regions(grid, w, h) == 1
+
+
+def test_cached_layouts_keep_free_space_connected_with_snake():
+    cache = LayoutCache(seed=1, pool=4)
+    w, h = 20, 14
+    for seed in range(60):
+        rng = random.Random(seed)
+        grid = bytearray(w * h)
+        # cobra aleatória andando sem se cruzar
+        x, y = rng.randrange(w), rng.randrange(h)
+        for _ in range(rng.randrange(20, 120)):
+            grid[y * w + x] = 1
+            dx, dy = rng.choice(((0, 1), (0, -1), (1, 0), (-1, 0)))
+            nx, ny = (x + dx) % w, (y + dy) % h
+            if not grid[ny * w + nx]:
+                x, y = nx, ny
+        before = regions(grid, w, h)
+        cells = cache.get(rng, w, h, rng.randrange(1, 15), occupied=grid)
+        for cx, cy in cells:
+            assert not grid[cy * w + cx]
+            grid[cy * w + cx] = 2
+        assert regions(grid, w, h) <= before, seed
+
+
+def test_pool_size_is_configurable():
+    cache = LayoutCache(seed=2, pool=3)
+    assert len(cache.layouts(20, 14, 5)) == 3
+
+
+def test_cached_layouts_have_the_full_count():
+    cache = LayoutCache(seed=3, pool=2)
+    for level in (1, 7, 14, 15, 20):
+        count = obstacle_count(level)
+        assert all(len(cells) == count for cells in cache.layouts(40, 28, count)), level
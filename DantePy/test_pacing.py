@@ -0,0 +1,51 @@
+"""Testes do FramePacer dos menus (rodar: python -m pytest)."""
+import time
+
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+
+@pytest.fixture
+def pacer(display):
+    from pacing import FramePacer
+    pygame.event.clear()
+    return FramePacer(active_fps=60, idle_fps=8, idle_after_ms=5000)
+
+
+def test_due_only_when_the_key_changes(pacer):
+    assert pacer.due(("menu", 0))
+    assert not pacer.due(("menu", 0))
+    assert pacer.due(("menu", 1))
+    pacer.invalidate()
+    assert pacer.due(("menu", 1))
+    assert not pacer.due(("menu", 1))
+    assert pacer.frames["active"] == 3
+
+
+def test_idle_then_input_switches_back_to_active(pacer):
+    from pacing import ACTIVE, IDLE, STATIC
+    pacer.events(timeout_ms=0)
+    assert pacer.mode == ACTIVE
+    assert pacer.frame_time(1.3) == pytest.approx(78 / 60)
+
+    # sem input há mais que idle_after_ms: cai para idle_fps
+    pacer._last_input = time.perf_counter() - 6
+    pacer.events(timeout_ms=0)
+    assert pacer.mode == IDLE
+    assert pacer.frame_time(1.3) == 1.25
+    pacer.due(1)
+    assert pacer.frames["idle"] == 1
+
+    # uma tecla volta para o ritmo cheio no mesmo frame
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_UP))
+    eventos = pacer.events(timeout_ms=0)
+    assert any(ev.type == pygame.KEYDOWN for ev in eventos)
+    assert pacer.mode == ACTIVE
+    assert pacer._next_frame == 0.0
+
+    pacer.events(animated=False, timeout_ms=0)
+    assert pacer.mode == STATIC
+    report = pacer.report()
+    assert set(report) == {ACTIVE, IDLE, STATIC}
+    assert report[IDLE]["wall_s"] > 0
@@ -0,0 +1,59 @@
+"""Testes do ParticlePool contra o ParticleList (rodar: python -m pytest)."""
+import random
+
+import pytest
+
+pygame = pytest.importorskip("pygame")
+np = pytest.importorskip("numpy")
+
+from particles import ParticleList, ParticlePool  # noqa: E402
+
+
+def _twins(n=18, seed=1):
+    """Pool e lista com as mesmas partículas (posição, velocidade e vida copiadas da lista)."""
+    random.seed(seed)
+    lista = ParticleList()
+    lista.emit((100, 50), (255, 200, 0), n)
+    pool = ParticlePool(seed=seed)
+    pool.emit((100, 50), (255, 200, 0), n)
+    for i, p in enumerate(lista.items):
+        pool.vx[i], pool.vy[i], pool.life[i] = p.vx, p.vy, p.life
+    return pool, lista
+
+
+def _alive(pool, lista):
+    got = sorted(zip(np.round(pool.x[:pool.count], 2).tolist(), np.round(pool.y[:pool.count], 2).tolist()))
+    want = sorted((round(p.x, 2), round(p.y, 2)) for p in lista.items)
+    return got, want
+
+
+def test_update_and_expiry_match_particle_list():
+    pool, lista = _twins()
+    assert len(pool) == len(lista) == 18
+    for dt in (16, 100, 250, 150, 200):
+        pool.update(dt)
+        lista.update(dt)
+        assert len(pool) == len(lista)
+        got, want = _alive(pool, lista)
+        assert [v for xy in got for v in xy] == pytest.approx([v for xy in want for v in xy], abs=0.05)
+    pool.update(1000)
+    lista.update(1000)
+    assert len(pool) == len(lista) == 0
+
+
+def test_emit_respects_capacity_and_clear():
+    pool = ParticlePool(capacity=10, seed=0)
+    lista = ParticleList(capacity=10)
+    for p in (pool, lista):
+        p.emit((0, 0), (255, 0, 0), 8)
+        p.emit((0, 0), (0, 255, 0), 8)
+        assert len(p) == 10
+        p.clear()
+        assert len(p) == 0
+
+
+def test_draw_returns_one_rect_per_particle():
+    pool, lista = _twins(n=5)
+    surf = pygame.Surface((200, 100), pygame.SRCALPHA)
+    assert len(pool.draw(surf)) == len(lista.draw(surf)) == 5
+    assert ParticlePool(seed=0).draw(surf) == []
@@ -0,0 +1,38 @@
+"""Testes da contagem de superfícies do FrameProfiler (rodar: python -m pytest)."""
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+
+def test_counts_surfaces_created_at_call_sites(display):
+    from compositor import Compositor
+    from profiler import FrameProfiler
+    from snakerender import SnakeRenderer
+    from textcache import TextCache
+    cache = TextCache()
+    renderer = SnakeRenderer(4, (255, 0, 0), (0, 255, 0), (0, 80, 0))
+    prof = FrameProfiler()
+    prof.enable()
+    prof.begin_frame()
+    Compositor(display, display=False)          # base
+    cache.render("a", size=12)                  # texto
+    cache.render("a", size=12)                  # hit: nada novo
+    cache.render("b", size=12, scale=2)         # texto + escala
+    renderer.tile((1, 2, 3))
+    renderer.tile((1, 2, 3))                    # bloco já existe
+    prof.end_frame()
+    prof.disable()
+    assert prof.surfaces[0] == 5
+    assert prof.summary()["surfaces"] == (5, 5)
+
+
+def test_enable_does_not_touch_pygame(display):
+    from profiler import FrameProfiler
+    surface, scale = pygame.Surface, pygame.transform.scale
+    prof = FrameProfiler()
+    prof.enable()
+    assert (pygame.Surface, pygame.transform.scale) == (surface, scale)
+    prof.begin_frame()
+    pygame.Surface((4, 4))  # fora dos pontos contados
+    prof.end_frame()
+    assert prof.surfaces[0] == 0
@@ -0,0 +1,75 @@
+"""Testes de gravação e seek de replays (rodar: python -m pytest)."""
+import random
+
+import pytest
+
+from engine import SnakeEngine, DIRECTIONS, DIFFICULTIES, FREE, clamp_dir
+from replay import ReplayReader, ReplayWriter, VERSION
+
+NORMAL = DIFFICULTIES[1]
+
+
+def controller(engine, rng):
+    """Vai atrás da comida evitando bater; às vezes vira para um lado qualquer."""
+    if rng.random() < 0.1:
+        return rng.choice(DIRECTIONS)
+    w, h = engine.grid_w, engine.grid_h
+    hx, hy = engine.cobra[0]
+    fx, fy = engine.comida
+    best = None
+    for d in DIRECTIONS:
+        nx, ny = (hx + d[0]) % w, (hy + d[1]) % h
+        if clamp_dir(d, engine.direcao) != d or engine.cell(nx, ny) != FREE:
+            continue
+        dist = min((nx - fx) % w, (fx - nx) % w) + min((ny - fy) % h, (fy - ny) % h)
+        if best is None or dist < best[0]:
+            best = (dist, d)
+    return None if best is None else best[1]
+
+
+def state(engine):
+    return (engine.ticks, tuple(engine.cobra), engine.comida, engine.score, engine.level,
+            tuple(engine.obstacles), engine.rng.getstate())
+
+
+def record(path, seed, keyframe_every):
+    """Joga uma partida gravando; devolve o estado do motor no começo de cada tick."""
+    _, gw, gh, delay = NORMAL
+    engine = SnakeEngine(gw, gh, start_delay=delay, seed=seed)
+    writer = ReplayWriter(path, engine, NORMAL[0], keyframe_every=keyframe_every)
+    rng = random.Random(seed)
+    live = {}
+    while engine.alive and engine.ticks < 3000:
+        live[engine.ticks] = state(engine)
+        d = controller(engine, rng)
+        if d is not None:
+            writer.record_input(engine.ticks, d)
+        writer.after_step(engine, engine.step(d))
+    writer.close()
+    return live
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2, 3, 4])
+def test_seek_matches_live_game(tmp_path, seed):
+    path = str(tmp_path / "partida.snkr")
+    live = record(path, seed, keyframe_every=50)
+    reader = ReplayReader(path)
+    assert reader.version == VERSION
+    assert reader.verify()
+    ticks = sorted(live)
+    # ticks logo depois de keyframes e no meio do intervalo entre eles
+    for t in ticks[::37] + [k + 1 for k, _ in reader.keyframes if k + 1 in live]:
+        assert state(reader.seek(t)) == live[t], t
+
+
+def test_interrupted_recording_is_readable(tmp_path):
+    path = str(tmp_path / "cortado.snkr")
+    _, gw, gh, delay = NORMAL
+    engine = SnakeEngine(gw, gh, start_delay=delay, seed=7)
+    writer = ReplayWriter(path, engine, NORMAL[0])
+    writer.record_input(0, DIRECTIONS[1])
+    engine.step(DIRECTIONS[1])
+    writer.flush()
+    reader = ReplayReader(path)
+    assert reader.end_tick is None
+    assert reader.inputs == {0: DIRECTIONS[1]}
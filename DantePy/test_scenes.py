@@ -0,0 +1,53 @@
+"""Testes das tabelas de animação das cenas (rodar: python -m pytest)."""
+import math
+
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+import scenes  # noqa: E402
+from scenes import SCENES, DecoLayer, TABLE_FPS  # noqa: E402
+
+
+def _direct(layer, t, width, height):
+    """A fórmula do docstring da DecoLayer, com math.sin a cada elemento."""
+    corner = 0 if layer.shape == "ellipse" else layer.size
+    out = []
+    for i in range(layer.count):
+        s = math.sin(layer.freq * t + i * layer.phase_step)
+        s = abs(s) if layer.abs_wobble else s
+        wobble = int(s * layer.amp) if layer.trunc else s * layer.amp
+        y = layer.y_start + i * layer.y_step + wobble
+        y = height - y if layer.from_bottom else y % height
+        out.append(((i * layer.x_step + int(t * layer.speed)) % width - corner, y - corner))
+    return out
+
+
+@pytest.mark.parametrize("scene", SCENES, ids=[s.name for s in SCENES])
+def test_tables_follow_the_formula(display, scene):
+    for layer in scene.layers:
+        for frame in (0, 7, 61, 600):
+            t = frame / TABLE_FPS
+            got = layer.positions(t, 800, 560)
+            for (gx, gy), (x, y) in zip(got, _direct(layer, t, 800, 560)):
+                assert gx == x
+                # a fase vira deslocamento inteiro na tabela: erro de até meio passo
+                assert abs(gy - y) <= layer.amp * layer.freq / TABLE_FPS + 1.5
+
+
+def test_numpy_and_python_paths_agree(display, monkeypatch):
+    pytest.importorskip("numpy")
+    kw = dict(x_step=47, speed=30, y_step=71, amp=20, freq=0.3, phase_step=0.3, trunc=True)
+    dense = DecoLayer(scenes.NUMPY_MIN * 2, "circle", 1, ((255, 255, 255),), **kw)
+    monkeypatch.setattr(scenes, "np", None)
+    plain = DecoLayer(scenes.NUMPY_MIN * 2, "circle", 1, ((255, 255, 255),), **kw)
+    python = [plain.positions(f / 10, 800, 560) for f in range(20)]
+    monkeypatch.undo()
+    assert [dense.positions(f / 10, 800, 560) for f in range(20)] == python
+    assert "np" in dense.prepare(800, 560)
+
+
+def test_draw_blits_every_element(display):
+    scene = SCENES[0]
+    rects = scene.draw(display, 1.0)
+    assert len(rects) == sum(layer.count for layer in scene.layers)
@@ -0,0 +1,81 @@
+"""Testes da máquina de estados da sessão em snake.main (rodar: python -m pytest)."""
+import pytest
+
+import snake
+from world import WORLD_PRESET
+
+
+class Done(Exception):
+    pass
+
+
+@pytest.fixture
+def session(monkeypatch):
+    """Troca menu, partida e game over por roteiros; devolve a lista de chamadas."""
+    calls = []
+
+    def script(name, results):
+        results = iter(results)
+
+        def fake(*args, **kwargs):
+            calls.append((name, kwargs))
+            try:
+                return next(results)
+            except StopIteration:
+                raise Done
+        monkeypatch.setattr(snake, name, fake)
+
+    monkeypatch.setattr(snake, "init_runtime", lambda headless=False: None)
+    monkeypatch.setattr(snake, "apply_difficulty", lambda difficulty: None)
+    monkeypatch.setattr(snake, "play_music_file", lambda path, loops=-1: True)
+    return calls, script
+
+
+def test_menu_retry_and_back_to_menu(session):
+    calls, script = session
+    script("menu_principal", ["start", "autopilot"])
+    script("jogo", [7, 3, 11])
+    script("game_over", ["retry", "menu", "menu"])
+    with pytest.raises(Done):
+        snake.main(headless=True)
+    assert [name for name, _ in calls] == [
+        "menu_principal", "jogo", "game_over", "jogo", "game_over",
+        "menu_principal", "jogo", "game_over", "menu_principal"]
+    overs = [kw for name, kw in calls if name == "game_over"]
+    # partidas do autopilot não vão para o placar
+    assert [kw["submit"] for kw in overs] == [True, True, False]
+    assert all(kw["auto_retry_ms"] is None for kw in overs)
+    assert [kw["autopilot"] for name, kw in calls if name == "jogo"] == [False, False, True]
+
+
+def test_game_over_gets_the_round_score(session, monkeypatch):
+    calls, script = session
+    scores = []
+    script("menu_principal", ["start"])
+    script("jogo", [42])
+    monkeypatch.setattr(snake, "game_over", lambda score, **kw: scores.append(score) or "menu")
+    with pytest.raises(Done):
+        snake.main(headless=True)
+    assert scores == [42]
+
+
+def test_soak_starts_playing_and_retries_alone(session):
+    calls, script = session
+    script("menu_principal", [])
+    script("jogo", [1, 2])
+    script("game_over", ["retry", "retry"])
+    with pytest.raises(Done):
+        snake.main(headless=True, autopilot=True)
+    assert [name for name, _ in calls] == ["jogo", "game_over", "jogo", "game_over", "jogo"]
+    assert all(kw["auto_retry_ms"] == 1500 and not kw["submit"] for name, kw in calls if name == "game_over")
+
+
+def test_world_difficulty_plays_the_world(session, monkeypatch):
+    calls, script = session
+    monkeypatch.setattr(snake, "CURRENT_DIFFICULTY", WORLD_PRESET, raising=False)
+    script("menu_principal", ["start"])
+    script("jogo_mundo", [5])
+    script("game_over", [])
+    with pytest.raises(Done):
+        snake.main(headless=True)
+    assert [name for name, _ in calls] == ["menu_principal", "jogo_mundo", "game_over"]
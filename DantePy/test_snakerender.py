@@ -0,0 +1,95 @@
+"""Testes do desenho incremental do corpo no SnakeRenderer (rodar: python -m pytest)."""
+import os
+import random
+
+import pytest
+
+from engine import SnakeEngine
+from test_engine import greedy
+
+pygame = pytest.importorskip("pygame")
+
+
+class FakeCompositor:
+    """Só o que o update_base usa: a base vira um dict posição -> bloco."""
+
+    def __init__(self):
+        self.base_version = 0
+        self.base = {}
+
+    def draw_on_base(self, surf, pos):
+        self.base[pos] = surf
+
+    def erase_on_base(self, rect):
+        self.base.pop((rect[0], rect[1]), None)
+
+
+@pytest.fixture
+def renderer():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    pygame.display.set_mode((32, 32))
+    from snakerender import SnakeRenderer
+    yield SnakeRenderer(4, (255, 0, 0), (0, 255, 0), (0, 80, 0))
+    pygame.display.quit()
+
+
+class NoIter(list):
+    """Corpo que não pode ser percorrido inteiro (o passo incremental só indexa)."""
+
+    def __iter__(self):
+        raise AssertionError("update_base percorreu o corpo todo")
+
+
+def expected(renderer, cobra):
+    p = renderer.pixel
+    tiles = renderer.colors(len(cobra))
+    return {(x * p, y * p): tiles[i] for i, (x, y) in enumerate(cobra) if i}
+
+
+def test_incremental_base_matches_full_draw(renderer):
+    comp = FakeCompositor()
+    rng = random.Random(5)
+    engine = SnakeEngine(24, 16, seed=5)
+    maior = 0
+    for rodada in range(3):
+        engine.reset(rodada)  # mesma base, cobra nova: tem que apagar a anterior
+        while engine.alive and engine.ticks < 1500:
+            # às vezes vários passos entre dois frames (e um salto grande de vez em quando)
+            for _ in range(rng.choice((1, 1, 1, 2, 3, 12))):
+                engine.step(greedy(engine))
+                if not engine.alive:
+                    break
+            renderer.update_base(comp, engine.cobra, (rodada, engine.ticks))
+            assert comp.base == expected(renderer, engine.cobra), engine.ticks
+            maior = max(maior, len(engine.cobra))
+    assert maior > 10
+
+
+def test_step_cost_does_not_grow_with_length(renderer):
+    comp = FakeCompositor()
+    w = 60
+    cobra = [(x, y) for y in range(0, 30, 2) for x in (range(w) if y % 4 == 0 else range(w - 1, -1, -1))]
+    renderer.update_base(comp, cobra, 0)
+    for tick in range(1, 20):
+        cobra = NoIter([(tick, 31)] + cobra[:-1])
+        renderer.update_base(comp, cobra, tick)
+        # bordas entre as faixas de cor + célula nova + cauda, não o tamanho (900)
+        assert renderer.last_changed <= len(set(renderer.colors(len(cobra)))) + 2
+    assert comp.base == expected(renderer, cobra[:])
+
+
+def test_eating_keeps_the_old_colors(renderer):
+    from snakerender import BANDS
+    comp = FakeCompositor()
+    cobra = [(x, y) for y in range(0, 30, 2) for x in (range(60) if y % 4 == 0 else range(59, -1, -1))]
+    renderer.update_base(comp, cobra, 0)
+    assert len(set(renderer.colors(len(cobra)))) <= BANDS + 1
+    mudou = []
+    for tick in range(1, 40):
+        cobra = [(tick, 31)] + cobra  # come: a cauda fica
+        renderer.update_base(comp, cobra, tick)
+        mudou.append(renderer.last_changed)
+    # só a célula nova, menos quando a largura ou o número de faixas muda
+    assert mudou.count(1) >= len(mudou) - 2
+    assert comp.base == expected(renderer, cobra)
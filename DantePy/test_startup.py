@@ -0,0 +1,33 @@
+"""Testes da inicialização preguiçosa do snake.py (rodar: python -m pytest)."""
+import os
+import subprocess
+import sys
+
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def _run(code):
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    out = subprocess.run([sys.executable, "-c", code], cwd=HERE, env=env,
+                         capture_output=True, text=True, timeout=60)
+    assert out.returncode == 0, out.stderr
+    return out.stdout.split()
+
+
+def test_import_has_no_side_effects():
+    # sem pygame, janela nem mixer até o init_runtime()
+    assert _run("import sys, snake; print('pygame' in sys.modules, snake.tela, snake.MUSIC)") == \
+        ["False", "None", "None"]
+
+
+def test_headless_init_runtime(tmp_path):
+    pytest.importorskip("pygame")
+    # o placar é criado no init_runtime: fora da pasta do jogo
+    log, legacy = str(tmp_path / "leaderboard.log"), str(tmp_path / "highscore.txt")
+    fases = _run(f"import snake; snake.LEADERBOARD_FILE, snake.HIGHSCORE_FILE = {log!r}, {legacy!r}; "
+                 "snake.init_runtime(headless=True); snake.init_runtime(); "
+                 "print(snake.tela.get_size() == (snake.LARGURA, snake.ALTURA), *snake.STARTUP_TIMES)")
+    assert fases[0] == "True"
+    assert {"import", "import_pygame", "pygame_init", "display", "mixer", "leaderboard", "sounds"} <= set(fases[1:])
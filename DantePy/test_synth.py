@@ -0,0 +1,64 @@
+"""Testes da síntese de sons em memória (rodar: python -m pytest)."""
+import os
+
+import pytest
+
+pygame = pytest.importorskip("pygame")
+np = pytest.importorskip("numpy")
+
+import synth  # noqa: E402
+
+
+@pytest.fixture
+def mixer():
+    def init(size):
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        pygame.mixer.init(22050, size, 1)
+        return pygame.mixer.get_init()[1]
+    yield init
+    pygame.mixer.quit()
+    synth._sounds.clear()
+
+
+def test_samples_waveforms():
+    assert len(synth.samples(440, 100, samplerate=8000)) == 800
+    for waveform in synth.WAVEFORMS:
+        data = synth.samples(100, 50, volume=0.5, samplerate=8000, waveform=waveform)
+        assert max(abs(s) for s in data) == pytest.approx(0.5, abs=0.01)
+    with pytest.raises(ValueError):
+        synth.samples(waveform="noise")
+    env = synth.samples(100, 100, samplerate=8000, waveform="square", envelope=(10, 10))
+    assert abs(env[0]) == 0.0 and abs(env[-1]) == 0.0
+
+
+def test_buffer_formats():
+    data = np.array([0.0, 0.5, -1.0])
+    assert np.frombuffer(synth._to_mixer_buffer(data, 32, 1), np.float32).tolist() == [0.0, 0.5, -1.0]
+    assert np.frombuffer(synth._to_mixer_buffer(data, -16, 2), np.int16).tolist() == [0, 0, 16383, 16383, -32767, -32767]
+    assert np.frombuffer(synth._to_mixer_buffer(data, 8, 1), np.uint8).tolist() == [128, 191, 1]
+    with pytest.raises(ValueError):
+        synth._to_mixer_buffer(data, -32, 1)
+
+
+@pytest.mark.parametrize("size", [-16, 32])
+def test_tone_matches_samples(mixer, size):
+    fmt = mixer(size)
+    data = synth.samples(440, 50, volume=0.5, samplerate=22050)
+    raw = synth.tone(440, 50, volume=0.5).get_raw()
+    if abs(fmt) == 32:
+        # o pygame informa -32 para o mixer float32 que ele mesmo cria
+        got = np.frombuffer(raw, np.float32)
+    else:
+        got = np.frombuffer(raw, np.int16) / 32767.0
+    assert len(got) == len(data)
+    assert np.abs(got - data).max() < 0.001
+
+
+def test_tone_cache(mixer):
+    mixer(-16)
+    before = synth.cache_stats()
+    a = synth.tone(440, 20)
+    assert synth.tone(440, 20) is a
+    assert synth.tone((440, 660), 20) is not a
+    after = synth.cache_stats()
+    assert (after["hits"] - before["hits"], after["misses"] - before["misses"]) == (1, 2)
@@ -0,0 +1,29 @@
+"""Testes do cache de texto (rodar: python -m pytest)."""
+import pytest
+
+pytest.importorskip("pygame")
+
+
+def test_lru_evicts_the_least_recently_used(display):
+    from textcache import TextCache
+    cache = TextCache(maxsize=2)
+    a = cache.render("a", size=12)
+    cache.render("b", size=12)
+    assert cache.render("a", size=12) is a  # hit: "a" passa a ser o mais recente
+    cache.render("c", size=12)              # cheio: sai "b"
+    assert cache.stats()["size"] == 2
+    assert (cache.hits, cache.misses) == (1, 3)
+    assert cache.render("a", size=12) is a
+    cache.render("b", size=12)
+    assert (cache.hits, cache.misses) == (2, 4)
+
+
+def test_key_includes_color_and_scale(display):
+    from textcache import TextCache
+    cache = TextCache()
+    um = cache.render("x", size=12)
+    assert cache.render("x", size=12, color=(255, 0, 0)) is not um
+    grande = cache.render("x", size=12, scale=2)
+    assert grande.get_width() == 2 * um.get_width()
+    cache.clear()
+    assert cache.stats()["size"] == 0 and cache.hits == 0
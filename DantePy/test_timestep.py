@@ -0,0 +1,53 @@
+"""Testes do passo fixo e da fila de input (rodar: python -m pytest)."""
+from engine import UP, DOWN, LEFT, RIGHT, clamp_dir
+from timestep import FixedTimestep, InputQueue, LatencyStats
+
+
+def test_consume_keeps_the_remainder():
+    ts = FixedTimestep()
+    ts.add(250)
+    passos = 0
+    while ts.consume(100):
+        passos += 1
+    assert passos == 2 and ts.acc == 50
+    assert ts.alpha(100) == 0.5
+    ts.add(60)
+    assert ts.consume(100) and ts.acc == 10
+
+
+def test_consume_caps_steps_per_frame():
+    ts = FixedTimestep(max_steps=3)
+    ts.add(1050)
+    passos = 0
+    while ts.consume(100):
+        passos += 1
+    assert passos == 3
+    assert ts.dropped == 7 and ts.acc == 50
+    assert ts.alpha(100) == 0.5
+    ts.add(1000)
+    assert ts.alpha(100) == 1.0
+
+
+def test_input_queue_rejects_reversal_and_repeats():
+    q = InputQueue(clamp_dir, maxlen=3)
+    assert not q.push(LEFT, RIGHT)      # meia-volta em relação à direção atual
+    assert not q.push(RIGHT, RIGHT)     # repetição não vira passo
+    assert q.push(UP, RIGHT)
+    assert not q.push(DOWN, RIGHT)      # meia-volta em relação à última enfileirada
+    assert q.push(LEFT, RIGHT)
+    assert q.push(DOWN, RIGHT)
+    assert not q.push(RIGHT, RIGHT)     # cheia
+    assert [q.pop(), q.pop(), q.pop(), q.pop()] == [UP, LEFT, DOWN, None]
+
+
+def test_input_latency_uses_push_and_pop_times():
+    relogio = [1000.0]
+    stats = LatencyStats()
+    q = InputQueue(clamp_dir, latency=stats, clock=lambda: relogio[0])
+    q.push(UP, RIGHT)
+    relogio[0] += 7.5
+    q.push(LEFT, UP)
+    relogio[0] += 30
+    q.pop()
+    q.pop()
+    assert sorted(stats.samples) == [30, 37.5]
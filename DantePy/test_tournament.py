@@ -0,0 +1,42 @@
+"""Testes do torneio retomável (rodar: python -m pytest)."""
+from engine import DEFAULT_DIFFICULTY
+from tournament import run
+
+# o que depende do relógio ou do que foi retomado fica de fora da comparação
+VOLATILE = ("wall_s", "games_per_s", "steps_per_s", "efficiency", "resumed")
+
+
+def _run(out):
+    summary = run(DEFAULT_DIFFICULTY, "greedy", games=6, seed=3, workers=1, batch=2, max_ticks=500, out=out)
+    return {k: v for k, v in summary.items() if k not in VOLATILE}, summary["resumed"]
+
+
+def test_resumed_run_reproduces_the_summary(tmp_path):
+    out = str(tmp_path / "t.csv")
+    fresh, resumed = _run(out)
+    assert (fresh["games"], resumed) == (6, 0)
+    with open(out, encoding="utf-8") as f:
+        original = f.read()
+    assert original.count("#done ") == 3
+
+    again, resumed = _run(out)
+    assert (again, resumed) == (fresh, 6)
+    with open(out, encoding="utf-8") as f:
+        assert f.read() == original
+
+
+def test_batch_without_done_is_played_again(tmp_path):
+    out = str(tmp_path / "t.csv")
+    fresh, _ = _run(out)
+    with open(out, encoding="utf-8") as f:
+        lines = f.readlines()
+    # interrompe no meio do último lote: sem "#done" e com a última linha cortada
+    assert lines[-1].startswith("#done ")
+    with open(out, "w", encoding="utf-8") as f:
+        f.writelines(lines[:-2])
+        f.write(lines[-2][:3])
+
+    again, resumed = _run(out)
+    assert (again, resumed) == (fresh, 4)
+    with open(out, encoding="utf-8") as f:
+        assert sorted(f.readlines()) == sorted(lines)
@@ -0,0 +1,42 @@
+"""Testes da comida do mundo gigante (rodar: python -m pytest)."""
+import world
+from engine import FREE, RIGHT
+from world import WorldEngine
+
+
+def test_fallback_stays_near_the_head(monkeypatch):
+    engine = WorldEngine(1000, 1000, density=0, seed=1)
+    antes = len(engine.grid)
+    # sem sorteios: cai direto na busca por anéis de chunks
+    monkeypatch.setattr(world, "FOOD_TRIES", 0)
+    x, y = engine._sample_food()
+    hx, hy = engine.cobra[0]
+    s = engine.chunk_size
+    assert (x // s, y // s) == (hx // s, hy // s)
+    assert engine.cell(x, y) == FREE
+    assert len(engine.grid) == antes
+
+
+def test_fallback_skips_full_chunks(monkeypatch):
+    engine = WorldEngine(320, 320, density=0, seed=2)
+    s = engine.chunk_size
+    hx, hy = engine.cobra[0]
+    hcx, hcy = hx // s, hy // s
+    # enche os 3x3 chunks em volta da cabeça
+    for cy in range(hcy - 1, hcy + 2):
+        for cx in range(hcx - 1, hcx + 2):
+            ch = engine.grid.chunk(cx, cy)
+            ch.cells[:] = bytes([world.OBSTACLE]) * len(ch.cells)
+    monkeypatch.setattr(world, "FOOD_TRIES", 0)
+    x, y = engine._sample_food()
+    assert engine.cell(x, y) == FREE
+    assert max(abs(x // s - hcx), abs(y // s - hcy)) == 2
+    assert len(engine.grid) < (320 // s) ** 2
+
+
+def test_last_free_cell_is_found():
+    engine = WorldEngine(40, 40, density=0, seed=3, chunk=16)
+    cobra = [(x if y % 2 == 0 else 39 - x, y) for y in range(40) for x in range(40)]
+    livre = cobra.pop()
+    engine.load(cobra[::-1], RIGHT, None)
+    assert engine._sample_food() == livre
@@ -0,0 +1,68 @@
+"""Cache de fontes e de superfícies de texto já renderizadas.
+
+As superfícies devolvidas são compartilhadas: quem precisar alterar uma deve
+fazer .copy() antes.
+"""
+from collections import OrderedDict
+
+import pygame
+
+from profiler import count_surface
+
+_fonts = {}
+
+
+def get_font(name, size):
+    """pygame.font.SysFont com cache por (nome, tamanho)."""
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = _fonts[key] = pygame.font.SysFont(name, size)
+    return font
+
+
+class TextCache:
+    """LRU limitado de textos renderizados, chave (texto, fonte, tamanho, escala, cor)."""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text, font_name="arial", size=24, scale=1, color=(255, 255, 255)):
+        key = (text, font_name, size, scale, tuple(color))
+        surf = self._surfaces.get(key)
+        if surf is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surf
+        self.misses += 1
+        surf = get_font(font_name, size).render(text, True, color)
+        count_surface()
+        if scale != 1:
+            w, h = surf.get_size()
+            surf = pygame.transform.scale(surf, (w*scale, h*scale))
+            count_surface()
+        self._surfaces[key] = surf
+        if len(self._surfaces) > self.maxsize:
+            self._surfaces.popitem(last=False)
+        return surf
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self._surfaces),
+            "fonts": len(_fonts),
+        }
+
+    def clear(self):
+        self._surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+TEXT_CACHE = TextCache()
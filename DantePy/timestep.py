@@ -0,0 +1,105 @@
+"""Passo fixo da lógica com acumulador e fila de input com medição de latência."""
+import time
+from collections import deque
+
+
+def _clock_ms():
+    return time.perf_counter() * 1000
+
+
+class FixedTimestep:
+    """Acumula o tempo de frame e libera passos lógicos de `step_ms` em `step_ms`.
+
+    A sobra de um passo fica para o próximo (nada de zerar o timer). Se o jogo
+    atrasar muito, roda até max_steps passos no mesmo frame e descarta o resto.
+    """
+
+    def __init__(self, max_steps=5):
+        self.max_steps = max_steps
+        self.acc = 0.0
+        self._steps = 0
+        self.dropped = 0
+
+    def add(self, dt):
+        self.acc += dt
+        self._steps = 0
+
+    def consume(self, step_ms):
+        if self.acc < step_ms:
+            return False
+        if self._steps >= self.max_steps:
+            self.dropped += int(self.acc // step_ms)
+            self.acc %= step_ms
+            return False
+        self.acc -= step_ms
+        self._steps += 1
+        return True
+
+    def alpha(self, step_ms):
+        """Fração (0..1) do caminho até o próximo passo, para interpolar o render."""
+        return min(1.0, self.acc / step_ms)
+
+
+class LatencyStats:
+    """Latências recentes (ms) entre a tecla e o passo que a aplicou."""
+
+    def __init__(self, size=256):
+        self.samples = deque(maxlen=size)
+
+    def add(self, ms):
+        self.samples.append(ms)
+
+    def summary(self):
+        if not self.samples:
+            return {"count": 0, "p50": 0, "p99": 0, "max": 0}
+        ordered = sorted(self.samples)
+        n = len(ordered)
+        return {
+            "count": n,
+            "p50": ordered[n // 2],
+            "p99": ordered[min(n - 1, int(n * 0.99))],
+            "max": ordered[-1],
+        }
+
+
+class InputQueue:
+    """FIFO limitado de direções; cada uma é validada com clamp_dir contra a anterior.
+
+    Assim "cima e esquerda" apertados entre dois passos viram dois passos, em
+    vez de o segundo sobrescrever o primeiro.
+
+    A latência vai do push() (a tecla saindo do event.get) até o pop() do
+    passo que a aplica, os dois lidos no relógio `clock` (ms, perf_counter por
+    padrão) na hora da chamada, não no horário do frame. O pygame não dá o
+    horário do evento, então a espera na fila do SDL até o event.get fica de
+    fora.
+    """
+
+    def __init__(self, clamp_dir, maxlen=3, latency=None, clock=_clock_ms):
+        self.clamp_dir = clamp_dir
+        self.maxlen = maxlen
+        self.latency = latency
+        self.clock = clock
+        self._items = deque()
+
+    def __len__(self):
+        return len(self._items)
+
+    def push(self, direcao, atual, now=None):
+        """Enfileira direcao (atual = direção da cobra agora); ignora reversão e repetição."""
+        last = self._items[-1][0] if self._items else atual
+        if len(self._items) >= self.maxlen or self.clamp_dir(direcao, last) != direcao or direcao == last:
+            return False
+        self._items.append((direcao, self.clock() if now is None else now))
+        return True
+
+    def pop(self, now=None):
+        if not self._items:
+            return None
+        direcao, t = self._items.popleft()
+        if self.latency is not None:
+            self.latency.add((self.clock() if now is None else now) - t)
+        return direcao
+
+    def clear(self):
+        self._items.clear()
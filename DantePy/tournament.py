@@ -0,0 +1,410 @@
+"""Torneio / soak: muitas partidas sem janela em todos os núcleos.
+
+Cada partida é um motor (SnakeEngine, ou WorldEngine no mundo gigante) com
+semente fixa jogado por um controlador até morrer, encher o tabuleiro ou
+passar de --max-ticks. As sementes seed .. seed+games-1 são divididas em
+lotes de --batch partidas; cada lote roda num processo do
+ProcessPoolExecutor e volta inteiro (uma mensagem por lote, não por partida).
+
+Os resultados vão sendo gravados em --out conforme os lotes terminam: uma
+linha por partida (seed,score,length,level,ticks,cause) e uma linha
+"#done LOTE" no fim de cada lote. Rodando de novo com o mesmo --out e os
+mesmos parâmetros, os lotes já concluídos são pulados (lote sem "#done",
+de uma execução interrompida, é descartado e jogado de novo).
+
+Controladores: autopilot, greedy, random, straight, ou "modulo:funcao" com
+funcao(difficulty, seed) -> decide(engine) devolvendo a direção (ou None).
+
+    python tournament.py --games 100000 --difficulty Normal --controller greedy
+    python tournament.py --games 2000 --controller autopilot --workers 4 --out ap.csv
+"""
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from engine import SnakeEngine, DIFFICULTIES, DEFAULT_DIFFICULTY, DIRECTIONS, SNAKE, clamp_dir
+from world import WORLD_PRESET, WorldEngine, is_world, greedy_direction
+
+PRESETS = DIFFICULTIES + [WORLD_PRESET]
+FIELDS = ("seed", "score", "length", "level", "ticks", "cause")
+
+
+# --- controladores ---
+
+_pilots = {}
+
+
+def _autopilot(difficulty, seed):
+    from autopilot import Autopilot
+    if is_world(difficulty):
+        raise ValueError("autopilot não joga no mundo gigante (use greedy)")
+    # um Autopilot por processo e tamanho de grid (as tabelas dele custam ms para montar)
+    pilot = _pilots.get(difficulty[1:3])
+    if pilot is None:
+        pilot = _pilots[difficulty[1:3]] = Autopilot(difficulty[1], difficulty[2])
+
+    def decide(engine):
+        if engine.ticks == 0:
+            pilot.reset()
+        return pilot.decide(engine)
+    return decide
+
+
+def _greedy(difficulty, seed):
+    return greedy_direction
+
+
+def _random(difficulty, seed):
+    rng = random.Random(seed)
+
+    def decide(engine):
+        # vira de vez em quando, nunca para trás
+        if rng.random() < 0.2:
+            return clamp_dir(rng.choice(DIRECTIONS), engine.direcao)
+        return None
+    return decide
+
+
+def _straight(difficulty, seed):
+    return lambda engine: None
+
+
+CONTROLLERS = {
+    "autopilot": _autopilot,
+    "greedy": _greedy,
+    "random": _random,
+    "straight": _straight,
+}
+
+
+def load_controller(name):
+    """Fábrica do controlador pelo nome ou "modulo:funcao"."""
+    if name in CONTROLLERS:
+        return CONTROLLERS[name]
+    if ":" in name:
+        import importlib
+        mod, func = name.split(":", 1)
+        return getattr(importlib.import_module(mod), func)
+    raise ValueError(f"controlador desconhecido: {name}")
+
+
+# --- partidas (rodam nos processos do pool) ---
+
+def new_engine(difficulty, seed):
+    nome, gw, gh, start_delay = difficulty
+    if is_world(difficulty):
+        return WorldEngine(gw, gh, start_delay, seed=seed)
+    return SnakeEngine(gw, gh, start_delay, seed=seed)
+
+
+def _cause(engine, evento):
+    if evento == "full":
+        return "full"
+    if engine.alive:
+        return "timeout"
+    # a cabeça não andou: a célula à frente é o que matou
+    hx, hy = engine.cobra[0]
+    x = (hx + engine.direcao[0]) % engine.grid_w
+    y = (hy + engine.direcao[1]) % engine.grid_h
+    return "self" if engine.cell(x, y) == SNAKE else "obstacle"
+
+
+def play(difficulty, decide, seed, max_ticks):
+    """Uma partida; retorna a linha de resultado (ver FIELDS)."""
+    engine = new_engine(difficulty, seed)
+    step = engine.step
+    evento = None
+    while engine.alive and engine.ticks < max_ticks:
+        evento = step(decide(engine))
+    return (seed, engine.score, len(engine.cobra), engine.level, engine.ticks, _cause(engine, evento))
+
+
+# controladores já montados neste processo (o Autopilot monta tabelas por tamanho de grid)
+_factories = {}
+
+
+def play_batch(batch, seeds, difficulty, controller, max_ticks):
+    """Roda um lote no processo do pool; retorna (lote, linhas, segundos, pid)."""
+    t = time.perf_counter()
+    factory = _factories.get(controller)
+    if factory is None:
+        factory = _factories[controller] = load_controller(controller)
+    rows = []
+    for seed in seeds:
+        rows.append(play(difficulty, factory(difficulty, seed), seed, max_ticks))
+    return batch, rows, time.perf_counter() - t, os.getpid()
+
+
+# --- agregação ---
+
+class Stats:
+    """Acumula os resultados: contagens por valor (histogramas exatos) e totais."""
+
+    def __init__(self):
+        self.games = 0
+        self.ticks = 0
+        self.score = Counter()
+        self.level = Counter()
+        self.length = Counter()
+        self.cause = Counter()
+        self.max_ticks = 0
+        self.worker_s = 0.0
+        self.workers = Counter()
+        # o que veio do arquivo (execução anterior) não entra na vazão
+        self.resumed_games = 0
+        self.resumed_ticks = 0
+
+    def add(self, row):
+        seed, score, length, level, ticks, cause = row
+        self.games += 1
+        self.ticks += ticks
+        self.score[score] += 1
+        self.level[level] += 1
+        self.length[length] += 1
+        self.cause[cause] += 1
+        self.max_ticks = max(self.max_ticks, ticks)
+
+    @staticmethod
+    def percentile(counts, q):
+        total = sum(counts.values())
+        if not total:
+            return 0
+        alvo = q * (total - 1)
+        acc = 0
+        for value in sorted(counts):
+            acc += counts[value]
+            if acc > alvo:
+                return value
+        return max(counts)
+
+    @staticmethod
+    def histogram(counts, bins=10):
+        """[(de, até, partidas)] em `bins` faixas iguais entre o menor e o maior valor."""
+        if not counts:
+            return []
+        lo, hi = min(counts), max(counts)
+        width = max(1, -(-(hi - lo + 1) // bins))
+        out = []
+        for start in range(lo, hi + 1, width):
+            out.append((start, start + width - 1, sum(n for v, n in counts.items() if start <= v < start + width)))
+        return out
+
+    def summary(self, wall_s, workers):
+        score = self.score
+        mean = sum(v * n for v, n in score.items()) / self.games if self.games else 0.0
+        games = self.games - self.resumed_games
+        ticks = self.ticks - self.resumed_ticks
+        return {
+            "games": self.games,
+            "resumed": self.resumed_games,
+            "ticks": self.ticks,
+            "wall_s": wall_s,
+            "games_per_s": games / wall_s if wall_s else 0.0,
+            "steps_per_s": ticks / wall_s if wall_s else 0.0,
+            "workers": workers,
+            # tempo somado dos lotes / (tempo de parede * processos): 1.0 = escala linear
+            "efficiency": self.worker_s / (wall_s * workers) if wall_s and workers else 0.0,
+            "score": {"mean": mean, "p50": self.percentile(score, 0.5), "p90": self.percentile(score, 0.9),
+                      "max": max(score) if score else 0},
+            "score_hist": self.histogram(score),
+            "level_hist": sorted(self.level.items()),
+            "length_hist": self.histogram(self.length),
+            "causes": dict(self.cause),
+            "max_ticks": self.max_ticks,
+        }
+
+
+# --- arquivo de resultados (retomável) ---
+
+def _header(spec):
+    return "# " + json.dumps(spec, sort_keys=True) + "\n"
+
+
+def load_results(path, spec, stats):
+    """Lê os lotes concluídos de `path` para stats e reescreve o arquivo sem os incompletos.
+
+    Retorna o conjunto de lotes prontos. Arquivo de outra configuração é erro.
+    """
+    done = set()
+    if not os.path.exists(path):
+        return done
+    keep = []
+    pending = []
+    with open(path, "r", encoding="utf-8") as f:
+        first = f.readline()
+        if first != _header(spec):
+            raise ValueError(f"{path} é de outra configuração (apague ou use outro --out)")
+        for line in f:
+            if line.startswith("#done "):
+                done.add(int(line[6:]))
+                keep.extend(pending)
+                keep.append(line)
+                for row in pending:
+                    stats.add(_parse(row))
+                pending = []
+            elif line.endswith("\n"):
+                pending.append(line)
+            # sem \n no fim: escrita cortada no meio, descarta
+    # o que sobrou em `pending` é de um lote interrompido
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(first)
+        f.writelines(keep)
+    os.replace(tmp, path)
+    return done
+
+
+def _parse(line):
+    seed, score, length, level, ticks, cause = line.rstrip("\n").split(",")
+    return int(seed), int(score), int(length), int(level), int(ticks), cause
+
+
+def _format(rows, batch):
+    return "".join(",".join(map(str, r)) + "\n" for r in rows) + f"#done {batch}\n"
+
+
+# --- execução ---
+
+def run(difficulty=DEFAULT_DIFFICULTY, controller="greedy", games=1000, seed=0, workers=None,
+        batch=100, max_ticks=20000, out=None, progress=None):
+    """Roda o torneio e retorna o resumo (ver Stats.summary).
+
+    progress(stats, wall_s) é chamado a cada lote que chega.
+    """
+    workers = workers or os.cpu_count() or 1
+    load_controller(controller)  # nome errado falha aqui, não dentro do pool
+    spec = {"difficulty": list(difficulty), "controller": controller, "games": games, "seed": seed,
+            "batch": batch, "max_ticks": max_ticks}
+    stats = Stats()
+    done = load_results(out, spec, stats) if out else set()
+    stats.resumed_games, stats.resumed_ticks = stats.games, stats.ticks
+    n_batches = -(-games // batch)
+    todo = [b for b in range(n_batches) if b not in done]
+
+    f = None
+    if out:
+        fresh = not os.path.exists(out)
+        f = open(out, "a", encoding="utf-8")
+        if fresh:
+            f.write(_header(spec))
+            f.flush()
+
+    t0 = time.perf_counter()
+    pending = iter(todo)
+    running = set()
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            try:
+                while True:
+                    # poucos lotes na fila por processo: memória constante com milhões de partidas
+                    while len(running) < workers * 2:
+                        b = next(pending, None)
+                        if b is None:
+                            break
+                        seeds = range(seed + b * batch, seed + min(games, (b + 1) * batch))
+                        running.add(pool.submit(play_batch, b, seeds, difficulty, controller, max_ticks))
+                    if not running:
+                        break
+                    finished, running = wait(running, return_when=FIRST_COMPLETED)
+                    for fut in finished:
+                        b, rows, secs, pid = fut.result()
+                        for row in rows:
+                            stats.add(row)
+                        stats.worker_s += secs
+                        stats.workers[pid] += len(rows)
+                        if f is not None:
+                            f.write(_format(rows, b))
+                            f.flush()
+                        if progress is not None:
+                            progress(stats, time.perf_counter() - t0)
+            except KeyboardInterrupt:
+                # não espera os lotes na fila: eles são jogados de novo ao retomar
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+    finally:
+        if f is not None:
+            f.close()
+    return stats.summary(time.perf_counter() - t0, workers)
+
+
+def _bars(hist, width=40):
+    top = max((n for *_, n in hist), default=0) or 1
+    linhas = []
+    for row in hist:
+        label = f"{row[0]}" if len(row) == 2 else f"{row[0]}-{row[1]}"
+        n = row[-1]
+        linhas.append(f"  {label:>13s} {n:9d} {'#' * round(n / top * width)}")
+    return "\n".join(linhas)
+
+
+def report(summary):
+    s = summary
+    sc = s["score"]
+    linhas = [
+        f"{s['games']} partidas ({s['resumed']} retomadas) em {s['wall_s']:.1f} s com {s['workers']} processos: "
+        f"{s['games_per_s']:,.0f} partidas/s, {s['steps_per_s']:,.0f} passos/s, "
+        f"eficiência {s['efficiency']:.0%}",
+        f"score: média {sc['mean']:.1f}  p50 {sc['p50']}  p90 {sc['p90']}  max {sc['max']}",
+        "fim: " + "  ".join(f"{k} {v}" for k, v in sorted(s["causes"].items())),
+        "score:", _bars(s["score_hist"]),
+        "level:", _bars(s["level_hist"]),
+        "tamanho:", _bars(s["length_hist"]),
+    ]
+    return "\n".join(linhas)
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Torneio de partidas sem janela em vários processos")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--difficulty", default=DEFAULT_DIFFICULTY[0],
+                        help="preset: " + ", ".join(d[0] for d in PRESETS))
+    parser.add_argument("--controller", default="greedy",
+                        help=", ".join(CONTROLLERS) + " ou modulo:funcao")
+    parser.add_argument("--workers", type=int, default=None, help="processos (padrão: todos os núcleos)")
+    parser.add_argument("--batch", type=int, default=100, help="partidas por lote")
+    parser.add_argument("--seed", type=int, default=0, help="primeira semente")
+    parser.add_argument("--max-ticks", type=int, default=20000, help="passos máximos por partida")
+    parser.add_argument("--out", help="CSV de resultados (retoma se já existir)")
+    parser.add_argument("--json", help="salva o resumo neste arquivo")
+    args = parser.parse_args(argv)
+
+    difficulty = next((d for d in PRESETS if d[0] == args.difficulty), None)
+    if difficulty is None:
+        parser.error(f"dificuldade desconhecida: {args.difficulty}")
+    try:
+        load_controller(args.controller)
+    except (ValueError, ImportError, AttributeError) as e:
+        parser.error(str(e))
+
+    last = [0.0]
+
+    def progress(stats, wall):
+        if wall - last[0] >= 2:
+            last[0] = wall
+            # as partidas retomadas do --out não foram jogadas agora: fora da vazão
+            rate = (stats.games - stats.resumed_games) / wall
+            print(f"  {stats.games}/{args.games} partidas, {rate:,.0f}/s", flush=True)
+
+    try:
+        summary = run(difficulty, args.controller, args.games, args.seed, args.workers, args.batch,
+                      args.max_ticks, args.out, progress)
+    except KeyboardInterrupt:
+        print("interrompido; rode de novo com o mesmo --out para continuar")
+        return 130
+    except ValueError as e:
+        parser.error(str(e))
+    print(report(summary))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        print(f"resumo em {args.json}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
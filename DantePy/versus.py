@@ -0,0 +1,235 @@
+"""Regras do modo versus: várias cobras no mesmo tabuleiro (sem pygame, sem rede).
+
+Mesmas regras do SnakeEngine: bordas dão a volta, bater em cobra (cauda
+inclusa) ou obstáculo mata, a comida sai do FreeCells e os obstáculos de cada
+nível vêm do LayoutCache. Diferenças: cada jogador tem o seu corpo; duas
+cabeças na mesma célula morrem as duas; quem morre some do tabuleiro e volta
+depois de `respawn_ticks`; há uma comida para cada dois jogadores e o nível
+sobe a cada POINTS_PER_LEVEL comidas de todos somadas.
+
+Todo o estado só muda dentro de step() (entrar e sair também esperam o
+próximo passo), e step() devolve a lista de mudanças do passo, que é
+exatamente o que o servidor manda para os clientes:
+
+    ("spawn", pid, dir, cells)   jogador (re)aparece; cells com a cabeça primeiro
+    ("head", pid, cell)          cabeça nova
+    ("tail", pid)                cauda saiu
+    ("die", pid)                 corpo inteiro saiu
+    ("leave", pid)               jogador saiu da partida
+    ("score", pid, score)
+    ("food+", cell) / ("food-", cell)
+    ("obstacles", cells)         lista nova inteira (level-up)
+
+Células são índices lineares y*grid_w + x.
+"""
+import random
+from collections import deque
+
+from engine import DIRECTIONS, RIGHT, FREE, SNAKE, OBSTACLE, POINTS_PER_LEVEL, FreeCells, clamp_dir
+from obstacles import LAYOUTS
+
+RESPAWN_TICKS = 20
+SPAWN_TRIES = 200
+
+
+class Player:
+    __slots__ = ("pid", "cobra", "direcao", "alive", "score", "respawn_at", "pending")
+
+    def __init__(self, pid, respawn_at):
+        self.pid = pid
+        self.cobra = deque()
+        self.direcao = RIGHT
+        self.alive = False
+        self.score = 0
+        self.respawn_at = respawn_at
+        self.pending = None
+
+
+class VersusEngine:
+    def __init__(self, grid_w=40, grid_h=28, seed=None, respawn_ticks=RESPAWN_TICKS, layouts=None):
+        self.grid_w = grid_w
+        self.grid_h = grid_h
+        self.respawn_ticks = respawn_ticks
+        self.layouts = LAYOUTS if layouts is None else layouts
+        self.layouts.prewarm(grid_w, grid_h)
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(63)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.grid = bytearray(grid_w * grid_h)
+        self.free = FreeCells(grid_w * grid_h)
+        self.players = {}
+        self.foods = set()
+        self.obstacles = []
+        self.level = 1
+        self.eaten = 0
+        self.ticks = 0
+        self._leaving = []
+        self._events = []
+
+    # --- entrar / sair / input (aplicados no próximo step) ---
+
+    def add_player(self, pid):
+        self.players[pid] = Player(pid, self.ticks + 1)
+
+    def remove_player(self, pid):
+        if pid in self.players:
+            self._leaving.append(pid)
+
+    def set_input(self, pid, direcao):
+        p = self.players.get(pid)
+        if p is not None:
+            p.pending = direcao
+
+    # --- passo ---
+
+    def step(self):
+        self.ticks += 1
+        ev = self._events = []
+        w, h = self.grid_w, self.grid_h
+        grid = self.grid
+
+        for pid in self._leaving:
+            p = self.players.pop(pid, None)
+            if p is not None:
+                self._clear(p)
+                ev.append(("leave", pid))
+        self._leaving = []
+
+        for p in self.players.values():
+            if not p.alive and p.respawn_at is not None and p.respawn_at <= self.ticks:
+                self._spawn(p)
+
+        # alvo de cada cobra viva, checado contra o tabuleiro antes de qualquer cauda sair
+        moves = []
+        claimed = {}
+        for p in self.players.values():
+            if not p.alive:
+                continue
+            if p.pending is not None:
+                p.direcao = clamp_dir(p.pending, p.direcao)
+                p.pending = None
+            hx, hy = p.cobra[0] % w, p.cobra[0] // w
+            c = (hy + p.direcao[1]) % h * w + (hx + p.direcao[0]) % w
+            moves.append((p, c))
+            claimed[c] = claimed.get(c, 0) + 1
+
+        survivors = []
+        dead = []
+        for p, c in moves:
+            if grid[c] == FREE and claimed[c] == 1:
+                survivors.append((p, c))
+            else:
+                dead.append(p)
+        # só limpa depois de decidir todo mundo: a ordem dos jogadores não muda nada
+        for p in dead:
+            self._clear(p)
+            p.alive = False
+            p.respawn_at = self.ticks + self.respawn_ticks
+            ev.append(("die", p.pid))
+
+        for p, c in survivors:
+            p.cobra.appendleft(c)
+            grid[c] = SNAKE
+            self.free.remove(c)
+            ev.append(("head", p.pid, c))
+            if c in self.foods:
+                self.foods.discard(c)
+                ev.append(("food-", c))
+                p.score += 1
+                ev.append(("score", p.pid, p.score))
+                self.eaten += 1
+                if self.eaten % POINTS_PER_LEVEL == 0:
+                    self.level += 1
+                    self._regenerate_obstacles()
+            else:
+                t = p.cobra.pop()
+                grid[t] = FREE
+                self.free.add(t)
+                ev.append(("tail", p.pid))
+
+        self._refill_food()
+        return ev
+
+    # --- auxiliares ---
+
+    def _clear(self, p):
+        for c in p.cobra:
+            self.grid[c] = FREE
+            self.free.add(c)
+        p.cobra.clear()
+
+    def _spawn(self, p):
+        """Três células livres na horizontal com espaço à frente; sem lugar tenta no próximo passo."""
+        w, h = self.grid_w, self.grid_h
+        grid = self.grid
+        for _ in range(SPAWN_TRIES):
+            c = self.free.sample(self.rng)
+            if c is None:
+                return
+            x, y = c % w, c // w
+            cells = [y * w + (x - i) % w for i in range(-2, 3)]
+            # duas à frente da cabeça, cabeça, corpo, cauda
+            if any(grid[k] != FREE or k in self.foods for k in cells):
+                continue
+            body = cells[2:]
+            for k in body:
+                grid[k] = SNAKE
+                self.free.remove(k)
+            p.cobra.extend(body)
+            p.direcao = RIGHT
+            p.alive = True
+            p.pending = None
+            p.respawn_at = None
+            self._events.append(("spawn", p.pid, RIGHT, list(body)))
+            return
+
+    def _refill_food(self):
+        alvo = max(1, (len(self.players) + 1) // 2)
+        for _ in range(SPAWN_TRIES):
+            if len(self.foods) >= alvo:
+                return
+            c = self.free.sample(self.rng)
+            if c is None:
+                return
+            if c not in self.foods:
+                self.foods.add(c)
+                self._events.append(("food+", c))
+
+    def _regenerate_obstacles(self):
+        grid = self.grid
+        w, h = self.grid_w, self.grid_h
+        for x, y in self.obstacles:
+            grid[y * w + x] = FREE
+            self.free.add(y * w + x)
+        # nada em cima da comida nem colado em nenhuma cabeça
+        avoid = [(c % w, c // w) for c in self.foods]
+        for p in self.players.values():
+            if p.alive:
+                hx, hy = p.cobra[0] % w, p.cobra[0] // w
+                avoid.extend(((hx + dx) % w, (hy + dy) % h) for dx, dy in DIRECTIONS)
+        self.obstacles = self.layouts.get(self.rng, w, h, self.level, avoid, occupied=grid)
+        for x, y in self.obstacles:
+            grid[y * w + x] = OBSTACLE
+            self.free.remove(y * w + x)
+        self._events.append(("obstacles", [y * w + x for x, y in self.obstacles]))
+
+    # --- estado inteiro ---
+
+    def snapshot(self):
+        """Estado completo (o que um cliente novo recebe antes dos deltas)."""
+        w = self.grid_w
+        return {
+            "tick": self.ticks,
+            "level": self.level,
+            "players": {p.pid: (list(p.cobra), p.direcao, p.alive, p.score) for p in self.players.values()},
+            "foods": sorted(self.foods),
+            "obstacles": [y * w + x for x, y in self.obstacles],
+        }
+
+    def digest(self):
+        """Resumo comparável com ClientState.digest() (para checar se o cliente está em dia)."""
+        players = tuple(sorted((p.pid, tuple(p.cobra), p.score) for p in self.players.values()))
+        w = self.grid_w
+        return (self.ticks, players, tuple(sorted(self.foods)),
+                tuple(sorted(y * w + x for x, y in self.obstacles)))
@@ -0,0 +1,334 @@
+"""Mundo gigante (ex.: 1000x1000 células) guardado em chunks, com câmera.
+
+O SnakeEngine guarda o tabuleiro inteiro num bytearray e as células livres
+num FreeCells; com um milhão de células isso é dezenas de MB e gerar/validar
+obstáculos passa por todas elas. Aqui o mundo é dividido em chunks de
+CHUNK x CHUNK células criados só quando alguém encosta neles (a região
+em volta da cabeça, a célula sorteada para a comida). Cada chunk tem:
+
+- `cells`: bytearray com FREE/SNAKE/OBSTACLE (mesmos valores do engine);
+- `stamp`: o tick em que a cabeça entrou em cada célula. O segmento numa
+  célula de cobra é o de índice ticks - stamp, então o render acha a cor do
+  gradiente olhando só as células visíveis, sem percorrer o corpo.
+
+Os obstáculos de um chunk são sorteados quando ele é criado (semente do
+mundo + índice do chunk), longe das bordas do chunk e nunca encostados uns
+nos outros (nem na diagonal), então nunca fecham uma região. Eles são fixos:
+o level-up só acelera a cobra (regerar o mundo inteiro a cada nível não
+escala).
+
+Memória e trabalho por frame crescem com a área vista/visitada, não com o
+mundo; um passo continua O(1) qualquer que seja o tamanho da cobra.
+"""
+import random
+from array import array
+from collections import deque
+
+from engine import FREE, SNAKE, OBSTACLE, RIGHT, clamp_dir, next_move_delay, POINTS_PER_LEVEL
+
+CHUNK = 32
+# preset do menu de dificuldade: (nome, grid_w, grid_h, move_delay_start)
+WORLD_PRESET = ("Mundo Gigante", 1000, 1000, 110)
+# área vista na janela (células); o mundo é maior que isso
+VIEW_W = 40
+VIEW_H = 28
+# chunks criados em volta do chunk da cabeça (cobre a câmera com folga)
+MATERIALIZE_RADIUS = 2
+OBSTACLE_DENSITY = 0.012
+# a comida nasce a até FOOD_RADIUS células da cabeça (no mundo todo ficaria
+# centenas de células longe); FOOD_TRIES sorteios antes de procurar chunk a
+# chunk em anéis em volta da cabeça
+FOOD_RADIUS = 30
+FOOD_TRIES = 64
+
+
+def is_world(difficulty):
+    """O preset é grande demais para caber na janela (joga com câmera)?"""
+    return difficulty[1] > VIEW_W or difficulty[2] > VIEW_H
+
+
+class Chunk:
+    __slots__ = ("cells", "stamp", "obstacles")
+
+    def __init__(self, size):
+        self.cells = bytearray(size * size)
+        self.stamp = array('q', bytes(8 * size * size))
+        self.obstacles = 0
+
+
+class ChunkedGrid:
+    """Grid de ocupação grid_w x grid_h em chunks criados sob demanda.
+
+    `fill(chunk, cx, cy)` é chamado uma vez quando o chunk é criado (para
+    sortear os obstáculos dele). O último chunk de cada linha/coluna pode
+    ficar parcialmente fora do mundo; essas células nunca são usadas.
+    """
+
+    def __init__(self, grid_w, grid_h, chunk=CHUNK, fill=None):
+        self.grid_w = grid_w
+        self.grid_h = grid_h
+        self.size = chunk
+        self.chunks_x = -(-grid_w // chunk)
+        self.chunks_y = -(-grid_h // chunk)
+        self.fill = fill
+        self.chunks = {}
+
+    def __len__(self):
+        return len(self.chunks)
+
+    def memory(self):
+        """Bytes nos arrays dos chunks criados."""
+        per = self.size * self.size * 9
+        return per * len(self.chunks)
+
+    def peek(self, cx, cy):
+        """Chunk (cx, cy) se já existe, sem criar."""
+        return self.chunks.get(cy * self.chunks_x + cx)
+
+    def chunk(self, cx, cy, generate=True):
+        cx %= self.chunks_x
+        cy %= self.chunks_y
+        key = cy * self.chunks_x + cx
+        ch = self.chunks.get(key)
+        if ch is None:
+            ch = self.chunks[key] = Chunk(self.size)
+            if generate and self.fill is not None:
+                self.fill(ch, cx, cy)
+        return ch
+
+    def get(self, x, y):
+        s = self.size
+        return self.chunk(x // s, y // s).cells[(y % s) * s + x % s]
+
+    def set(self, x, y, value, stamp=0):
+        s = self.size
+        ch = self.chunk(x // s, y // s)
+        i = (y % s) * s + x % s
+        ch.cells[i] = value
+        ch.stamp[i] = stamp
+
+
+class WorldEngine:
+    """Partida no mundo gigante; mesma interface de jogo do SnakeEngine.
+
+    reset(seed), step(action) -> "move"/"eat"/"level"/"dead"/"full", e os
+    atributos cobra (deque, cabeça primeiro), direcao, comida, score, level,
+    move_delay, ticks e alive. A ocupação fica em `grid` (ChunkedGrid).
+    """
+
+    def __init__(self, grid_w=1000, grid_h=1000, start_delay=110, seed=None,
+                 density=OBSTACLE_DENSITY, chunk=CHUNK):
+        self.grid_w = grid_w
+        self.grid_h = grid_h
+        self.start_delay = start_delay
+        self.density = density
+        self.chunk_size = chunk
+        self.rng = random.Random()
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(63)
+        self.seed = seed
+        self.rng.seed(seed)
+        cx, cy = self.grid_w // 2, self.grid_h // 2
+        self.load([(cx, cy), (cx - 1, cy), (cx - 2, cy)], RIGHT, None)
+        self.comida = self._sample_food()
+        return self
+
+    def load(self, cobra, direcao, comida, score=0, level=1, move_delay=None, ticks=0):
+        """Estado arbitrário (cabeça em cobra[0]); os chunks do corpo ficam sem obstáculos."""
+        self.grid = ChunkedGrid(self.grid_w, self.grid_h, self.chunk_size, fill=self._fill_chunk)
+        self.cobra = deque(cobra)
+        self.direcao = direcao
+        self.score = score
+        self.level = level
+        self.move_delay = self.start_delay if move_delay is None else move_delay
+        self.ticks = ticks
+        self.alive = True
+        grid = self.grid
+        s = self.chunk_size
+        for x, y in self.cobra:
+            grid.chunk(x // s, y // s, generate=False)
+        # segmento i entrou na célula i passos atrás
+        for i, (x, y) in enumerate(self.cobra):
+            grid.set(x, y, SNAKE, ticks - i)
+        self.comida = comida
+        if comida is not None:
+            grid.chunk(comida[0] // s, comida[1] // s)
+        self._head_chunk = None
+        self._materialize_around(self.cobra[0])
+        return self
+
+    def cell(self, x, y):
+        """FREE/SNAKE/OBSTACLE na célula (x, y) (cria o chunk se preciso)."""
+        return self.grid.get(x, y)
+
+    # --- chunks ---
+
+    def _fill_chunk(self, ch, cx, cy):
+        """Obstáculos do chunk: isolados, longe da borda do chunk, da cabeça e da comida."""
+        s = self.chunk_size
+        rng = random.Random(self.seed * 1000003 + cy * self.grid.chunks_x + cx)
+        cells = ch.cells
+        hx, hy = self.cobra[0] if self.cobra else (-99, -99)
+        comida = getattr(self, "comida", None)
+        x0, y0 = cx * s, cy * s
+        for _ in range(int(self.density * s * s)):
+            lx = rng.randrange(1, s - 1)
+            ly = rng.randrange(1, s - 1)
+            x, y = x0 + lx, y0 + ly
+            if x >= self.grid_w or y >= self.grid_h or (x, y) == comida:
+                continue
+            if abs(x - hx) <= 2 and abs(y - hy) <= 2:
+                continue
+            i = ly * s + lx
+            # 3x3 em volta livre: dois obstáculos nunca se encostam
+            if any(cells[i + d] for d in (-s - 1, -s, -s + 1, -1, 0, 1, s - 1, s, s + 1)):
+                continue
+            cells[i] = OBSTACLE
+            ch.obstacles += 1
+
+    def _materialize_around(self, head):
+        s = self.chunk_size
+        hc = (head[0] // s, head[1] // s)
+        if hc == self._head_chunk:
+            return
+        self._head_chunk = hc
+        r = MATERIALIZE_RADIUS
+        for dy in range(-r, r + 1):
+            for dx in range(-r, r + 1):
+                self.grid.chunk(hc[0] + dx, hc[1] + dy)
+
+    def _sample_food(self):
+        grid = self.grid
+        rng = self.rng
+        w, h = self.grid_w, self.grid_h
+        hx, hy = self.cobra[0]
+        r = FOOD_RADIUS
+        for _ in range(FOOD_TRIES):
+            x = (hx + rng.randint(-r, r)) % w
+            y = (hy + rng.randint(-r, r)) % h
+            if grid.get(x, y) == FREE:
+                return (x, y)
+        return self._nearest_free_chunk_cell()
+
+    def _nearest_free_chunk_cell(self):
+        """Célula livre sorteada no anel de chunks mais próximo da cabeça que tem alguma.
+
+        Anel 0 é o chunk da cabeça, anel r os chunks a distância r (com wrap).
+        Um chunk novo é quase todo livre, então no máximo um anel de chunks é
+        criado; o mundo inteiro só é visto quando está mesmo cheio.
+        """
+        grid = self.grid
+        s = self.chunk_size
+        w, h = self.grid_w, self.grid_h
+        hx, hy = self.cobra[0]
+        hcx, hcy = hx // s, hy // s
+        seen = set()
+        for r in range(max(grid.chunks_x, grid.chunks_y) // 2 + 1):
+            livres = []
+            for dy in range(-r, r + 1):
+                step = 1 if abs(dy) == r else 2 * r
+                for dx in range(-r, r + 1, step):
+                    cx, cy = (hcx + dx) % grid.chunks_x, (hcy + dy) % grid.chunks_y
+                    key = cy * grid.chunks_x + cx
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    cells = grid.chunk(cx, cy).cells
+                    if FREE not in cells:
+                        continue
+                    x0, y0 = cx * s, cy * s
+                    livres.extend((x0 + i % s, y0 + i // s) for i, v in enumerate(cells)
+                                  if v == FREE and x0 + i % s < w and y0 + i // s < h)
+            if livres:
+                return self.rng.choice(livres)
+        return None
+
+    # --- passo ---
+
+    def step(self, action=None):
+        if not self.alive:
+            return "dead"
+        if action is not None:
+            self.direcao = clamp_dir(action, self.direcao)
+        self.ticks += 1
+
+        cobra = self.cobra
+        grid = self.grid
+        hx, hy = cobra[0]
+        nova_cabeca = ((hx + self.direcao[0]) % self.grid_w, (hy + self.direcao[1]) % self.grid_h)
+        # a cabeça anda no máximo uma célula: os chunks em volta já existem
+        self._materialize_around(nova_cabeca)
+
+        if grid.get(*nova_cabeca) != FREE:
+            self.alive = False
+            return "dead"
+
+        cobra.appendleft(nova_cabeca)
+        grid.set(nova_cabeca[0], nova_cabeca[1], SNAKE, self.ticks)
+        if nova_cabeca != self.comida:
+            tx, ty = cobra.pop()
+            grid.set(tx, ty, FREE)
+            return "move"
+
+        self.score += 1
+        self.comida = self._sample_food()
+        if self.comida is None:
+            self.alive = False
+            return "full"
+        if self.score % POINTS_PER_LEVEL == 0:
+            self.move_delay = next_move_delay(self.move_delay)
+            self.level += 1
+            return "level"
+        return "eat"
+
+
+class Camera:
+    """Janela view_w x view_h células sobre o mundo, centrada na cabeça (com wrap)."""
+
+    def __init__(self, world_w, world_h, view_w=VIEW_W, view_h=VIEW_H):
+        self.world_w = world_w
+        self.world_h = world_h
+        self.view_w = min(view_w, world_w)
+        self.view_h = min(view_h, world_h)
+        self.x = 0
+        self.y = 0
+
+    def follow(self, head):
+        self.x = (head[0] - self.view_w // 2) % self.world_w
+        self.y = (head[1] - self.view_h // 2) % self.world_h
+
+    def to_view(self, cell):
+        """Célula do mundo -> célula na tela, ou None fora da câmera."""
+        vx = (cell[0] - self.x) % self.world_w
+        vy = (cell[1] - self.y) % self.world_h
+        if vx < self.view_w and vy < self.view_h:
+            return vx, vy
+        return None
+
+
+def greedy_direction(engine):
+    """Piloto simples para o mundo gigante: vai na direção da comida pelo lado
+    mais curto (com wrap), desviando para qualquer vizinho livre. O Autopilot
+    monta tabelas do tamanho do tabuleiro e não serve para um milhão de células.
+    Só usa engine.cell(), então também joga no SnakeEngine.
+    """
+    w, h = engine.grid_w, engine.grid_h
+    hx, hy = engine.cobra[0]
+    options = []
+    if engine.comida is not None:
+        dx = (engine.comida[0] - hx) % w
+        dy = (engine.comida[1] - hy) % h
+        if dx:
+            options.append((1, 0) if dx <= w // 2 else (-1, 0))
+        if dy:
+            options.append((0, 1) if dy <= h // 2 else (0, -1))
+    options += [engine.direcao, (0, -1), (0, 1), (-1, 0), (1, 0)]
+    for d in options:
+        if d != clamp_dir(d, engine.direcao):
+            continue
+        if engine.cell((hx + d[0]) % w, (hy + d[1]) % h) == FREE:
+            return d
+    return None
@@ -0,0 +1,93 @@
+"""Render do mundo gigante: só as células dentro da câmera.
+
+Em vez de percorrer o corpo da cobra (dezenas de milhares de segmentos) ou a
+lista de obstáculos do mundo, view() varre as linhas visíveis dos chunks que
+a câmera cobre; linhas vazias são puladas inteiras (bytearray.count em C).
+A cor de cada segmento vem do stamp da célula (índice = ticks - stamp),
+quantizada em `bands` faixas do mesmo gradiente do SnakeRenderer, com um
+bloco pré-renderizado por faixa.
+
+O quadro do mundo (fundo, obstáculos, corpo) só muda quando a cobra anda ou
+a câmera mexe, então fica cacheado numa superfície do tamanho da janela e
+entre um passo e outro cada frame é um blit só.
+"""
+import pygame
+
+from engine import SNAKE, OBSTACLE
+from profiler import count_surface
+from snakerender import gradient
+
+
+class WorldView:
+    def __init__(self, pixel, head_color, start_color, end_color, bg,
+                 obstacle_color=(60, 60, 70), obstacle_edge=(100, 100, 110), bands=64):
+        self.pixel = pixel
+        self.bg = bg
+        cores = gradient(bands + 1, head_color, start_color, end_color)[1:]
+        self.band_tiles = [self._tile(c) for c in cores]
+        self.head_tile = self._tile(head_color)
+        # mesmo desenho do draw_obstacles
+        self.obstacle_tile = self._tile(obstacle_color)
+        pygame.draw.rect(self.obstacle_tile, obstacle_edge, (2, 2, pixel - 4, pixel - 4), 1)
+        self._frame = None
+        self._frame_key = None
+        self.last_blits = 0
+
+    def _tile(self, color):
+        surf = pygame.Surface((self.pixel, self.pixel)).convert()
+        count_surface()
+        surf.fill(color)
+        return surf
+
+    def view(self, engine, camera):
+        """(bloco, posição) de cada célula ocupada dentro da câmera."""
+        grid = engine.grid
+        s = grid.size
+        w, h = engine.grid_w, engine.grid_h
+        p = self.pixel
+        length = max(1, len(engine.cobra))
+        ticks = engine.ticks
+        bands = self.band_tiles
+        nb = len(bands)
+        obst = self.obstacle_tile
+        seq = []
+        for vy in range(camera.view_h):
+            y = (camera.y + vy) % h
+            cy, ly = divmod(y, s)
+            py = vy * p
+            vx = 0
+            while vx < camera.view_w:
+                x = (camera.x + vx) % w
+                cx, lx = divmod(x, s)
+                # trecho da linha dentro deste chunk (e do mundo)
+                n = min(s - lx, camera.view_w - vx, w - x)
+                ch = grid.peek(cx, cy)
+                if ch is not None:
+                    off = ly * s + lx
+                    row = ch.cells[off:off + n]
+                    if row.count(0) != n:
+                        stamp = ch.stamp
+                        for k, v in enumerate(row):
+                            if v == SNAKE:
+                                i = ticks - stamp[off + k]
+                                seq.append((bands[min(nb - 1, i * nb // length)], ((vx + k) * p, py)))
+                            elif v == OBSTACLE:
+                                seq.append((obst, ((vx + k) * p, py)))
+                vx += n
+        return seq
+
+    def frame(self, engine, camera, size):
+        """Superfície com fundo, obstáculos e corpo (refeita só quando algo andou)."""
+        key = (id(engine), engine.ticks, camera.x, camera.y, size)
+        if key == self._frame_key:
+            return self._frame
+        if self._frame is None or self._frame.get_size() != size:
+            self._frame = pygame.Surface(size).convert()
+            count_surface()
+        surf = self._frame
+        surf.fill(self.bg)
+        seq = self.view(engine, camera)
+        surf.blits(seq, doreturn=0)
+        self.last_blits = len(seq)
+        self._frame_key = key
+        return surf